@@ -9,32 +9,95 @@ except PackageNotFoundError:
     __version__ = "unknown"
 
 from .api import TNSEApi, async_check_version, async_get_regions
+from .archive import TNSEArchive
 from .auth import AbstractTNSEAuth, SimpleTNSEAuth
+from .backfill import (
+    AbstractBackfillSink,
+    BackfillCheckpoint,
+    BackfillSummary,
+    BackfillTask,
+    JSONLinesBackfillSink,
+    SQLiteBackfillSink,
+    TNSEBackfill,
+)
+from .breaker import CircuitState, TNSECircuitBreaker
+from .cache import TNSEResponseCache
 from .exceptions import (
     InvalidAccountNumber,
     RegionNotFound,
     RequiredApiParamNotFound,
     TNSEApiError,
     TNSEAuthError,
+    TNSECircuitOpenError,
     TNSETokenExpiredError,
     TNSETokenRefreshError,
 )
+from .fleet import FleetResult, TNSECredentials, TNSEFleet
 from .helpers import get_base_url, is_valid_account
+from .metrics import LatencyHistogram, RequestEvent, TNSEMetrics
+from .models import (
+    Account,
+    AccountSnapshot,
+    Balance,
+    Counter,
+    CounterReading,
+    HistoryItem,
+    Indication,
+    ReadingRecord,
+)
+from .retry import RetryBudget, RetryPolicy
+from .session import async_warm_up, create_session
+from .throttle import TNSERateLimiter
+from .token_store import AbstractTokenStore, JSONFileTokenStore, SQLiteTokenStore
 
 __all__ = [
+    "AbstractBackfillSink",
     "AbstractTNSEAuth",
+    "AbstractTokenStore",
+    "Account",
+    "AccountSnapshot",
+    "BackfillCheckpoint",
+    "BackfillSummary",
+    "BackfillTask",
+    "Balance",
+    "CircuitState",
+    "Counter",
+    "CounterReading",
+    "FleetResult",
+    "HistoryItem",
+    "Indication",
     "InvalidAccountNumber",
+    "JSONFileTokenStore",
+    "JSONLinesBackfillSink",
+    "LatencyHistogram",
+    "ReadingRecord",
     "RegionNotFound",
+    "RequestEvent",
     "RequiredApiParamNotFound",
+    "RetryBudget",
+    "RetryPolicy",
+    "SQLiteBackfillSink",
+    "SQLiteTokenStore",
     "SimpleTNSEAuth",
     "TNSEApi",
     "TNSEApiError",
+    "TNSEArchive",
     "TNSEAuthError",
+    "TNSEBackfill",
+    "TNSECircuitBreaker",
+    "TNSECircuitOpenError",
+    "TNSECredentials",
+    "TNSEFleet",
+    "TNSEMetrics",
+    "TNSERateLimiter",
+    "TNSEResponseCache",
     "TNSETokenExpiredError",
     "TNSETokenRefreshError",
     "__version__",
     "async_check_version",
     "async_get_regions",
+    "async_warm_up",
+    "create_session",
     "get_base_url",
     "is_valid_account",
 ]
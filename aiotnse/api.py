@@ -1,21 +1,47 @@
 """TNS-Energo API wrapper."""
 from __future__ import annotations
 
-from typing import Any
+import asyncio
+import logging
+import os
+from collections.abc import Awaitable, Callable, Hashable
+from typing import IO, Any
 
-from aiohttp import ClientSession
+from aiohttp import ClientError, ClientSession
 
+from .archive import TNSEArchive
 from .auth import AbstractTNSEAuth
+from .breaker import TNSECircuitBreaker
+from .cache import TNSEResponseCache
 from .const import (
     DEFAULT_API_PATH,
     DEFAULT_APP_VERSION,
     DEFAULT_PLATFORM,
     DEFAULT_REGION,
+    DEFAULT_SNAPSHOT_CONCURRENCY,
     DEVICE_ID,
     LOGGER,
+    READINGS_DEPENDENT_ENDPOINTS,
+    USER_READINGS_DEPENDENT_ENDPOINTS,
 )
-from .exceptions import RequiredApiParamNotFound
-from .helpers import build_request_headers, get_base_url, parse_api_response
+from .exceptions import RequiredApiParamNotFound, TNSEApiError
+from .helpers import (
+    LogBody,
+    async_open_request,
+    get_base_url,
+    get_request_headers,
+    parse_api_response,
+)
+from .models import AccountSnapshot
+from .streaming import (
+    AsyncWriter,
+    async_check_stream_response,
+    async_open_writer,
+    async_read_base64_field,
+)
+from .throttle import TNSERateLimiter
+
+_MISSING = object()
 
 
 async def _async_public_get(
@@ -23,53 +49,177 @@ async def _async_public_get(
     path: str,
     region: str = DEFAULT_REGION,
     params: dict[str, Any] | None = None,
+    *,
+    rate_limiter: TNSERateLimiter | None = None,
+    circuit_breaker: TNSECircuitBreaker | None = None,
+    base_url: str | None = None,
 ) -> Any:
     """Make a GET request to a public API endpoint (no auth required)."""
-    base_url = get_base_url(region)
+    base_url = base_url or get_base_url(region)
     url = f"{base_url}/{DEFAULT_API_PATH}/{path}"
-    headers = build_request_headers(region, DEVICE_ID)
-    if params:
-        LOGGER.debug("API request: GET /%s params=%s", path, params)
-    else:
-        LOGGER.debug("API request: GET /%s", path)
-    async with session.get(url, headers=headers, params=params) as resp:
+    headers = get_request_headers(region, DEVICE_ID)
+    debug = LOGGER.isEnabledFor(logging.DEBUG)
+    if debug:
+        if params:
+            LOGGER.debug("API request: GET /%s params=%s", path, params)
+        else:
+            LOGGER.debug("API request: GET /%s", path)
+    async with async_open_request(
+        session,
+        "GET",
+        url,
+        region=region,
+        base_url=base_url,
+        rate_limiter=rate_limiter,
+        circuit_breaker=circuit_breaker,
+        headers=headers,
+        params=params,
+    ) as resp:
         data = await parse_api_response(resp)
-        LOGGER.debug("API response: GET /%s -> %d: %s", path, resp.status, data)
+        if debug:
+            LOGGER.debug(
+                "API response: GET /%s -> %d: %s", path, resp.status, LogBody(data)
+            )
         return data
 
 
-async def async_get_regions(session: ClientSession) -> Any:
+async def async_get_regions(
+    session: ClientSession,
+    *,
+    rate_limiter: TNSERateLimiter | None = None,
+    circuit_breaker: TNSECircuitBreaker | None = None,
+    base_url: str | None = None,
+) -> Any:
     """Get available regions.
 
     Standalone function that does not require authentication.
-    Uses the default region endpoint as a bootstrap host.
+    Uses the default region endpoint as a bootstrap host, or ``base_url``
+    when given.
     """
-    return await _async_public_get(session, "contacts/regions")
+    return await _async_public_get(
+        session,
+        "contacts/regions",
+        rate_limiter=rate_limiter,
+        circuit_breaker=circuit_breaker,
+        base_url=base_url,
+    )
 
 
 async def async_check_version(
-    session: ClientSession, region: str = DEFAULT_REGION
+    session: ClientSession,
+    region: str = DEFAULT_REGION,
+    *,
+    rate_limiter: TNSERateLimiter | None = None,
+    circuit_breaker: TNSECircuitBreaker | None = None,
+    base_url: str | None = None,
 ) -> Any:
     """Check app version compatibility.
 
-    Standalone function that does not require authentication.
+    Standalone function that does not require authentication. ``base_url``
+    overrides the regional host.
     """
     return await _async_public_get(
-        session, "app/version", region=region, params={"version": DEFAULT_APP_VERSION}
+        session,
+        "app/version",
+        region=region,
+        params={"version": DEFAULT_APP_VERSION},
+        rate_limiter=rate_limiter,
+        circuit_breaker=circuit_breaker,
+        base_url=base_url,
     )
 
 
 class TNSEApi:
     """TNS-Energo API client."""
 
-    def __init__(self, auth: AbstractTNSEAuth) -> None:
+    def __init__(
+        self,
+        auth: AbstractTNSEAuth,
+        *,
+        cache: TNSEResponseCache | None = None,
+        archive: TNSEArchive | None = None,
+        coalesce: bool = False,
+    ) -> None:
+        """Initialize the API client.
+
+        Pass a TNSEResponseCache to serve repeated read calls from memory,
+        and a TNSEArchive to keep closed-period history and invoices on disk.
+        With ``coalesce`` identical concurrent read calls share one request.
+        """
         self._auth = auth
+        self._cache = cache
+        self._archive = archive
+        self._coalesce = coalesce
+        self._in_flight: dict[Hashable, asyncio.Task[Any]] = {}
+
+    @property
+    def cache(self) -> TNSEResponseCache | None:
+        """Return response cache, if enabled."""
+        return self._cache
 
     async def _async_get(
         self, path: str, params: dict[str, Any] | None = None
     ) -> Any:
         """Make GET request to API endpoint."""
-        return await self._auth.request("GET", path, params=params)
+        region = self._auth.region
+        if self._cache is not None:
+            data = self._cache.get(region, path, params, _MISSING, scope=self._auth)
+            if data is not _MISSING:
+                LOGGER.debug("API cache hit: GET /%s params=%s", path, params)
+                return data
+
+        if not self._coalesce:
+            return await self._async_fetch(region, path, params)
+
+        key = ("GET", region, path, tuple(sorted(params.items())) if params else ())
+        if (task := self._in_flight.get(key)) is None:
+            task = self._in_flight[key] = asyncio.create_task(
+                self._async_fetch(region, path, params)
+            )
+            task.add_done_callback(lambda done: self._forget_in_flight(key, done))
+        else:
+            LOGGER.debug("API request coalesced: GET /%s params=%s", path, params)
+        # Shield the shared request so a cancelled caller does not cancel
+        # it for the others.
+        return await asyncio.shield(task)
+
+    async def _async_fetch(
+        self, region: str, path: str, params: dict[str, Any] | None
+    ) -> Any:
+        """Send GET request and store the result in the cache."""
+        if self._cache is None:
+            return await self._auth.request("GET", path, params=params)
+
+        # Taken before the request: data fetched while the account was
+        # invalidated (readings sent) must not be cached.
+        generation = self._cache.generation(params.get("account") if params else None)
+        data = await self._auth.request("GET", path, params=params)
+        self._cache.set(
+            region, path, params, data, generation=generation, scope=self._auth
+        )
+        return data
+
+    def _forget_in_flight(self, key: Hashable, task: asyncio.Task[Any]) -> None:
+        """Remove a completed shared request."""
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            # Mark the error retrieved even if every caller was cancelled
+            task.exception()
+
+    async def _async_get_archived(
+        self, path: str, params: dict[str, Any]
+    ) -> Any:
+        """Make GET request for a closed period, using the archive if set."""
+        if self._archive is None:
+            return await self._async_get(path, params)
+
+        region = self._auth.region
+        data = await self._archive.async_get(region, path, params, _MISSING)
+        if data is _MISSING:
+            data = await self._async_get(path, params)
+            await self._archive.async_put(region, path, params, data)
+        return data
 
     async def _async_post(
         self, path: str, json_data: dict[str, Any] | None = None
@@ -119,7 +269,7 @@ class TNSEApi:
         """Send meter readings."""
         if not readings:
             raise RequiredApiParamNotFound("Required API 'readings' parameter not found")
-        return await self._async_post(
+        data = await self._async_post(
             "counters/send-readings",
             {
                 "account": account,
@@ -128,6 +278,15 @@ class TNSEApi:
                 "platform": DEFAULT_PLATFORM,
             },
         )
+        if self._cache is not None:
+            self._cache.invalidate(
+                account=account, endpoints=READINGS_DEPENDENT_ENDPOINTS
+            )
+            self._cache.invalidate(endpoints=USER_READINGS_DEPENDENT_ENDPOINTS)
+        # Read calls started before the readings were sent may return stale
+        # data: let them finish, but do not share them with new callers.
+        self._in_flight.clear()
+        return data
 
     async def async_get_invoice_settings(self, account: str) -> Any:
         """Get invoice email settings for an account."""
@@ -135,20 +294,111 @@ class TNSEApi:
 
     async def async_get_invoices(self, account: str, year: int) -> Any:
         """Get list of invoices for an account and year."""
-        return await self._async_get(
-            "invoices", {"account": account, "year": year}
-        )
+        params = {"account": account, "year": year}
+        if self._archive and self._archive.is_closed_period(year, 12):
+            return await self._async_get_archived("invoices", params)
+        return await self._async_get("invoices", params)
 
     async def async_get_invoice_file(self, account: str, date: str) -> Any:
         """Get invoice file as base64 PDF."""
-        return await self._async_get(
-            "invoices/get-file", {"account": account, "date": date}
-        )
+        params = {"account": account, "date": date}
+        if self._archive and self._archive.is_closed_date(date):
+            return await self._async_get_archived("invoices/get-file", params)
+        return await self._async_get("invoices/get-file", params)
+
+    async def async_download_invoice_file(
+        self,
+        account: str,
+        date: str,
+        file: str | os.PathLike[str] | IO[bytes] | AsyncWriter,
+    ) -> int:
+        """Download invoice PDF to a file, decoding base64 while streaming.
+
+        ``file`` is a path, a binary file object or an object with an async
+        ``write()``. Memory use does not depend on the PDF size. The archive
+        is not used. A path is replaced only after a successful download.
+        Return the number of bytes written.
+        """
+        params = {"account": account, "date": date}
+        async with self._auth.stream_request(
+            "GET", "invoices/get-file", params=params
+        ) as resp:
+            # Fail before a path target is touched
+            await async_check_stream_response(resp)
+            async with async_open_writer(file) as write:
+                size = await async_read_base64_field(resp, "file", write)
+        LOGGER.debug("API response: GET /invoices/get-file -> %d bytes", size)
+        return size
 
     async def async_get_history(
         self, account: str, year: int, month: int
     ) -> Any:
         """Get account history (payments, readings, invoices)."""
-        return await self._async_get(
-            "history", {"account": account, "year": year, "month": month}
-        )
+        params = {"account": account, "year": year, "month": month}
+        if self._archive and self._archive.is_closed_period(year, month):
+            return await self._async_get_archived("history", params)
+        return await self._async_get("history", params)
+
+    async def async_get_account_snapshot(
+        self,
+        account: str,
+        *,
+        max_concurrency: int = DEFAULT_SNAPSHOT_CONCURRENCY,
+        timeout: float | None = None,
+    ) -> AccountSnapshot:
+        """Get information, balance, counters and readings for an account.
+
+        Independent calls run concurrently and readings are fetched for all
+        counters as soon as the counter list arrives, with at most
+        ``max_concurrency`` requests in flight. A failed or timed out part
+        (``timeout`` seconds per call) is reported in ``snapshot.errors``
+        instead of failing the whole snapshot.
+        """
+        snapshot = AccountSnapshot(account)
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def fetch(part: str, call: Callable[[], Awaitable[Any]]) -> Any:
+            async with semaphore:
+                try:
+                    async with asyncio.timeout(timeout):
+                        return await call()
+                except (TNSEApiError, ClientError, TimeoutError) as err:
+                    LOGGER.debug("Snapshot %s: %s failed: %r", account, part, err)
+                    snapshot.errors[part] = err
+                    return None
+
+        async def fetch_information() -> None:
+            snapshot.information = await fetch(
+                "information", lambda: self.async_get_information(account)
+            )
+
+        async def fetch_balance() -> None:
+            snapshot.balance = await fetch(
+                "balance", lambda: self.async_get_balance(account)
+            )
+
+        async def fetch_readings(counter_id: str) -> None:
+            readings = await fetch(
+                f"readings/{counter_id}",
+                lambda: self.async_get_counter_readings(counter_id, account),
+            )
+            if f"readings/{counter_id}" not in snapshot.errors:
+                snapshot.readings[counter_id] = readings
+
+        async def fetch_counters() -> None:
+            snapshot.counters = await fetch(
+                "counters", lambda: self.async_get_counters(account)
+            )
+            counter_ids = []
+            for index, counter in enumerate(snapshot.counters or ()):
+                if (counter_id := counter.get("counterId")) is None:
+                    LOGGER.debug("Snapshot %s: counter %d has no id", account, index)
+                    snapshot.errors[f"counters/{index}"] = RequiredApiParamNotFound(
+                        "Required API 'counterId' parameter not found"
+                    )
+                    continue
+                counter_ids.append(str(counter_id))
+            await asyncio.gather(*map(fetch_readings, counter_ids))
+
+        await asyncio.gather(fetch_information(), fetch_balance(), fetch_counters())
+        return snapshot
@@ -0,0 +1,125 @@
+"""Persistent archive for closed-period TNS-Energo API responses."""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+from collections.abc import Mapping
+from datetime import date, datetime
+from typing import Any
+
+from .const import DEFAULT_ARCHIVE_LAG_MONTHS, LOGGER
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    stored_at TEXT NOT NULL
+)
+"""
+
+
+class TNSEArchive:
+    """SQLite-backed store for responses of closed billing periods.
+
+    History, invoices and invoice files of a closed period never change, so
+    they are kept forever and served without network calls. A period is
+    closed once more than ``lag_months`` full months have passed since it
+    (with the default of 1 the current and the previous month are always
+    fetched from the API, since the previous month still receives invoices
+    and late payments at the start of the current one).
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        *,
+        lag_months: int = DEFAULT_ARCHIVE_LAG_MONTHS,
+    ) -> None:
+        self._lag_months = lag_months
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(_SCHEMA)
+
+    def __enter__(self) -> TNSEArchive:
+        """Enter the archive context."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close the archive on context exit."""
+        self.close()
+
+    def close(self) -> None:
+        """Close the underlying database."""
+        with self._lock:
+            self._conn.close()
+
+    def is_closed_period(
+        self, year: int, month: int, today: date | None = None
+    ) -> bool:
+        """Return True if the given month is closed and can be archived."""
+        today = today or date.today()
+        age = (today.year - year) * 12 + today.month - month
+        return age > self._lag_months
+
+    def is_closed_date(self, value: str, today: date | None = None) -> bool:
+        """Return True if an API date (``dd.mm.yyyy``) is in a closed period."""
+        try:
+            parsed = datetime.strptime(value, "%d.%m.%Y")
+        except ValueError:
+            return False
+        return self.is_closed_period(parsed.year, parsed.month, today)
+
+    @staticmethod
+    def _make_key(region: str, path: str, params: Mapping[str, Any]) -> str:
+        """Build storage key for a request."""
+        query = "&".join(f"{key}={value}" for key, value in sorted(params.items()))
+        return f"{region}/{path}?{query}"
+
+    def _read(self, key: str) -> str | None:
+        """Read stored JSON by key."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def _write(self, key: str, value: str) -> None:
+        """Store JSON by key."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, stored_at) "
+                "VALUES (?, ?, ?)",
+                (key, value, datetime.now().isoformat()),
+            )
+
+    async def async_get(
+        self,
+        region: str,
+        path: str,
+        params: Mapping[str, Any],
+        default: Any = None,
+    ) -> Any:
+        """Return archived payload for a request, or default if missing."""
+        key = self._make_key(region, path, params)
+        value = await asyncio.to_thread(self._read, key)
+        if value is None:
+            return default
+        LOGGER.debug("API archive hit: %s", key)
+        return json.loads(value)
+
+    async def async_put(
+        self,
+        region: str,
+        path: str,
+        params: Mapping[str, Any],
+        value: Any,
+    ) -> None:
+        """Archive payload for a request."""
+        key = self._make_key(region, path, params)
+        await asyncio.to_thread(
+            self._write, key, json.dumps(value, ensure_ascii=False)
+        )
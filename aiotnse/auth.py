@@ -2,30 +2,86 @@
 from __future__ import annotations
 
 import asyncio
+import inspect
+import logging
+import math
+import random
+import time
 from abc import ABC, abstractmethod
-from collections.abc import Callable
-from datetime import datetime
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Mapping
+from concurrent.futures import Executor
+from contextlib import AbstractAsyncContextManager, asynccontextmanager, suppress
+from datetime import datetime, tzinfo
 from typing import Any
 
-from aiohttp import ClientSession
+from aiohttp import ClientError, ClientResponse, ClientSession, hdrs
 
+from .breaker import TNSECircuitBreaker
 from .const import (
     BEARER_HEADER,
     DEFAULT_API_PATH,
     DEFAULT_PLATFORM,
+    DEFAULT_TOKEN_EXPIRY_MARGIN,
+    DEFAULT_TOKEN_REFRESH_JITTER,
+    DEFAULT_TOKEN_REFRESH_MARGIN,
+    DEFAULT_TOKEN_REFRESH_RETRY_INTERVAL,
     DEVICE_ID,
     LOGGER,
 )
-from .exceptions import TNSEAuthError, TNSETokenRefreshError
-from .helpers import build_request_headers, get_base_url, parse_api_response
+from .exceptions import TNSEApiError, TNSEAuthError, TNSETokenRefreshError
+from .helpers import (
+    JSONLoads,
+    LogBody,
+    async_open_request,
+    get_base_url,
+    get_request_headers,
+    is_auth_failure,
+    jwt_expiry,
+    parse_api_response,
+    parse_http_date,
+    path_template,
+)
+from .metrics import RequestEvent, RequestHook
+from .retry import RetryPolicy
+from .throttle import TNSERateLimiter
+from .token_store import AbstractTokenStore
+from .tracing import start_span
+
+TokenUpdateCallback = Callable[[dict[str, Any]], Awaitable[None] | None]
 
 
 class AbstractTNSEAuth(ABC):
     """Abstract class to make authenticated requests."""
 
-    def __init__(self, session: ClientSession, *, region: str) -> None:
+    def __init__(
+        self,
+        session: ClientSession,
+        *,
+        region: str,
+        base_url: str | None = None,
+        rate_limiter: TNSERateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+        circuit_breaker: TNSECircuitBreaker | None = None,
+        json_loads: JSONLoads | None = None,
+        request_hooks: Iterable[RequestHook] = (),
+    ) -> None:
+        """Initialize the auth.
+
+        ``base_url`` overrides the regional host, e.g. for a local test
+        server. ``json_loads`` replaces the JSON decoder (bytes in, object
+        out, ValueError on invalid input); by default orjson or msgspec is
+        used when installed. ``request_hooks`` are called with a
+        RequestEvent after every HTTP request.
+        """
         self._session = session
         self._region = region
+        self._base_url = base_url
+        self._headers = get_request_headers(region, DEVICE_ID)
+        self._rate_limiter = rate_limiter
+        self._retry_policy = retry_policy
+        self._circuit_breaker = circuit_breaker
+        self._json_loads = json_loads
+        self._request_hooks = list(request_hooks)
 
     @property
     def region(self) -> str:
@@ -36,49 +92,247 @@ class AbstractTNSEAuth(ABC):
     def region(self, value: str) -> None:
         """Set current region."""
         self._region = value
+        self._headers = get_request_headers(value, DEVICE_ID)
 
     @property
     def base_url(self) -> str:
         """Return base URL for the current region."""
-        return get_base_url(self._region)
+        return self._base_url or get_base_url(self._region)
 
     def _build_url(self, path: str) -> str:
         """Build full API URL for the given path."""
         return f"{self.base_url}/{DEFAULT_API_PATH}/{path}"
 
-    def _build_headers(self) -> dict[str, str]:
-        """Build common request headers."""
-        return build_request_headers(self._region, DEVICE_ID)
+    def _build_headers(self) -> Mapping[str, str]:
+        """Return common request headers for the current region."""
+        return self._headers
+
+    def add_request_hook(self, hook: RequestHook) -> Callable[[], None]:
+        """Register a request hook, return a function removing it."""
+        self._request_hooks.append(hook)
+        return lambda: self._request_hooks.remove(hook)
+
+    def _notify_request(
+        self,
+        kind: str,
+        method: str,
+        path: str,
+        started: float,
+        resp: ClientResponse | None,
+        *,
+        attempt: int = 0,
+        error: Exception | None = None,
+    ) -> None:
+        """Pass the outcome of a request to the request hooks."""
+        event = RequestEvent(
+            kind=kind,
+            method=method,
+            endpoint=path_template(path),
+            region=self._region,
+            status=resp.status if resp is not None else None,
+            duration=time.monotonic() - started,
+            response_size=resp.content_length if resp is not None else None,
+            attempt=attempt,
+            error=error,
+        )
+        for hook in self._request_hooks:
+            try:
+                hook(event)
+            except Exception:
+                LOGGER.exception("Error in request hook %s", hook)
 
     @abstractmethod
     async def async_get_access_token(self) -> str | None:
         """Return a valid access token."""
 
-    async def request(self, method: str, path: str, **kwargs: Any) -> Any:
-        """Make a request with proper authorization headers."""
-        headers = {**kwargs.pop("headers", {}), **self._build_headers()}
+    def _async_open(
+        self, method: str, url: str, **kwargs: Any
+    ) -> AbstractAsyncContextManager[ClientResponse]:
+        """Send a request to the regional host within client-side limits."""
+        return async_open_request(
+            self._session,
+            method,
+            url,
+            region=self._region,
+            base_url=self.base_url,
+            rate_limiter=self._rate_limiter,
+            circuit_breaker=self._circuit_breaker,
+            **kwargs,
+        )
 
-        access_token = await self.async_get_access_token()
-        if access_token:
-            headers[BEARER_HEADER] = f"Bearer {access_token}"
+    async def async_handle_auth_failure(self, access_token: str) -> bool:
+        """Handle a request rejected by the server despite a valid-looking token.
+
+        Return True when a new access token is available and the rejected
+        request should be replayed. The default implementation cannot renew
+        tokens and returns False.
+        """
+        return False
 
+    async def _async_send(self, method: str, path: str, **kwargs: Any) -> Any:
+        """Send a request and parse the response, retrying transient failures."""
         url = self._build_url(path)
+        endpoint = path_template(path)
+        debug = LOGGER.isEnabledFor(logging.DEBUG)
+        policy = self._retry_policy
+        if policy is not None:
+            policy.budget.record_request()
+
+        attempt = 0
+        while True:
+            started = time.monotonic()
+            resp: ClientResponse | None = None
+            try:
+                with start_span(
+                    "tnse.http",
+                    region=self._region,
+                    endpoint=endpoint,
+                    client=True,
+                    method=method,
+                    attempt=attempt,
+                ) as span:
+                    async with self._async_open(method, url, **kwargs) as resp:
+                        span.set_attribute("http.response.status_code", resp.status)
+                        data = await parse_api_response(
+                            resp, loads=self._json_loads
+                        )
+                        if debug:
+                            LOGGER.debug(
+                                "API response: %s /%s -> %d: %s",
+                                method,
+                                path,
+                                resp.status,
+                                LogBody(data),
+                            )
+                if self._request_hooks:
+                    self._notify_request(
+                        "api", method, path, started, resp, attempt=attempt
+                    )
+                return data
+            except (TNSEApiError, ClientError, TimeoutError) as err:
+                if self._request_hooks:
+                    self._notify_request(
+                        "api", method, path, started, resp, attempt=attempt, error=err
+                    )
+                if policy is None or not policy.should_retry(method, err, attempt):
+                    raise
+                delay = policy.backoff(attempt)
+                attempt += 1
+                if debug:
+                    LOGGER.debug(
+                        "API request: %s /%s failed (%r), retry %d in %.2fs",
+                        method,
+                        path,
+                        err,
+                        attempt,
+                        delay,
+                    )
+            await asyncio.sleep(delay)
+
+    @asynccontextmanager
+    async def stream_request(
+        self, method: str, path: str, **kwargs: Any
+    ) -> AsyncIterator[ClientResponse]:
+        """Open a request with authorization headers, yielding the raw response.
+
+        The body is left unread for streaming. The request is not retried,
+        but like request() it is replayed once if rejected with HTTP 401 or
+        a JSON 403 and the token could be renewed. Request hooks get the
+        event when the block exits, its duration includes reading the body.
+        """
+        headers = {**kwargs.pop("headers", {}), **self._headers}
+        url = self._build_url(path)
+        LOGGER.debug("API request: %s /%s (stream)", method, path)
+
+        for replay in (False, True):
+            if access_token := await self.async_get_access_token():
+                headers[BEARER_HEADER] = f"Bearer {access_token}"
+            started = time.monotonic()
+            resp: ClientResponse | None = None
+            reported = False
+            try:
+                async with self._async_open(
+                    method, url, **kwargs, headers=headers
+                ) as resp:
+                    if (
+                        not replay
+                        and access_token
+                        and is_auth_failure(resp.status, resp.content_type)
+                    ):
+                        if self._request_hooks:
+                            error = TNSEApiError(
+                                f"API request rejected ({method} /{path} -> "
+                                f"{resp.status})",
+                                status=resp.status,
+                                content_type=resp.content_type,
+                            )
+                            self._notify_request(
+                                "api", method, path, started, resp, error=error
+                            )
+                        reported = True
+                        if await self.async_handle_auth_failure(access_token):
+                            continue
+                    yield resp
+                    if self._request_hooks and not reported:
+                        self._notify_request("api", method, path, started, resp)
+                    return
+            except Exception as err:
+                if self._request_hooks and not reported:
+                    self._notify_request("api", method, path, started, resp, error=err)
+                raise
 
-        if params := kwargs.get("params"):
-            LOGGER.debug("API request: %s /%s params=%s", method, path, params)
-        elif json_body := kwargs.get("json"):
-            LOGGER.debug("API request: %s /%s json=%s", method, path, json_body)
-        else:
-            LOGGER.debug("API request: %s /%s", method, path)
+    async def request(self, method: str, path: str, **kwargs: Any) -> Any:
+        """Make a request with proper authorization headers.
+
+        Transient failures are retried according to the retry policy. A
+        request rejected with HTTP 401 or a JSON 403 is replayed once after
+        the token has been renewed via async_handle_auth_failure(). An HTML
+        403 is server throttling and is raised as is.
+        """
+        with start_span(
+            "tnse.request",
+            region=self._region,
+            endpoint=path_template(path),
+            method=method,
+        ):
+            return await self._async_request(method, path, **kwargs)
+
+    async def _async_request(self, method: str, path: str, **kwargs: Any) -> Any:
+        """Authorize and send a request, replaying it after token renewal."""
+        headers = {**kwargs.pop("headers", {}), **self._headers}
+
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            if params := kwargs.get("params"):
+                LOGGER.debug(
+                    "API request: %s /%s params=%s", method, path, LogBody(params)
+                )
+            elif json_body := kwargs.get("json"):
+                LOGGER.debug(
+                    "API request: %s /%s json=%s", method, path, LogBody(json_body)
+                )
+            else:
+                LOGGER.debug("API request: %s /%s", method, path)
 
-        async with self._session.request(
-            method, url, **kwargs, headers=headers
-        ) as resp:
-            data = await parse_api_response(resp)
+        access_token = await self.async_get_access_token()
+        if access_token:
+            headers[BEARER_HEADER] = f"Bearer {access_token}"
+        try:
+            return await self._async_send(method, path, **kwargs, headers=headers)
+        except TNSEApiError as err:
+            if not access_token or not is_auth_failure(err.status, err.content_type):
+                raise
             LOGGER.debug(
-                "API response: %s /%s -> %d: %s", method, path, resp.status, data
+                "API request: %s /%s rejected with %d, renewing token",
+                method,
+                path,
+                err.status,
             )
-            return data
+            if not await self.async_handle_auth_failure(access_token):
+                raise
+
+        if access_token := await self.async_get_access_token():
+            headers[BEARER_HEADER] = f"Bearer {access_token}"
+        return await self._async_send(method, path, **kwargs, headers=headers)
 
 
 class SimpleTNSEAuth(AbstractTNSEAuth):
@@ -95,23 +349,82 @@ class SimpleTNSEAuth(AbstractTNSEAuth):
         refresh_token: str | None = None,
         access_token_expires: datetime | None = None,
         refresh_token_expires: datetime | None = None,
-        token_update_callback: Callable[[dict[str, Any]], None] | None = None,
+        token_update_callback: TokenUpdateCallback | None = None,
+        token_update_executor: Executor | None = None,
+        expiry_margin: float = DEFAULT_TOKEN_EXPIRY_MARGIN,
+        server_timezone: tzinfo | None = None,
+        base_url: str | None = None,
+        rate_limiter: TNSERateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+        circuit_breaker: TNSECircuitBreaker | None = None,
+        json_loads: JSONLoads | None = None,
+        request_hooks: Iterable[RequestHook] = (),
+        token_store: AbstractTokenStore | None = None,
+        token_store_key: str | None = None,
     ) -> None:
         """Initialize the auth.
 
         Two modes:
         1. Login: provide email + password, then call async_login().
         2. Session restore: provide access_token + refresh_token.
+
+        ``token_update_callback`` receives new tokens. A sync callback is
+        called in place, unless ``token_update_executor`` is given to run it
+        in that executor. Async and executor callbacks run in a background
+        task outside the token lock; updates arriving while one is running
+        are coalesced into a single call with the latest tokens. A sync
+        callback returning an awaitable is awaited there too.
+
+        With a ``token_store`` shared by several processes, tokens are
+        saved under ``token_store_key`` (``region/email`` by default) and
+        only one process renews them, the others reuse its tokens. Don't
+        call async_login() then: the first request loads stored tokens or
+        logs in.
+
+        Tokens are renewed ``expiry_margin`` seconds before they expire.
+        Expiry is taken from the JWT ``exp`` claim if present, otherwise
+        from the expiry times given, corrected by the server clock offset
+        from the ``Date`` header of auth responses, and tracked in
+        monotonic time. Naive expiry times are read in ``server_timezone``,
+        in the local timezone if it is not given.
         """
-        super().__init__(session, region=region)
+        super().__init__(
+            session,
+            region=region,
+            base_url=base_url,
+            rate_limiter=rate_limiter,
+            retry_policy=retry_policy,
+            circuit_breaker=circuit_breaker,
+            json_loads=json_loads,
+            request_hooks=request_hooks,
+        )
         self._email = email
         self._password = password
-        self._access_token = access_token
-        self._refresh_token = refresh_token
-        self._access_token_expires = access_token_expires
-        self._refresh_token_expires = refresh_token_expires
+        self._expiry_margin = expiry_margin
+        self._server_timezone = server_timezone
+        # Server clock minus local clock, in seconds
+        self._clock_offset = 0.0
+        self._access_token: str | None = None
+        self._access_token_expires: datetime | None = None
+        self._access_token_deadline = -math.inf
+        self._refresh_token: str | None = None
+        self._refresh_token_expires: datetime | None = None
+        self._refresh_token_deadline = -math.inf
+        self._set_access_token(access_token, access_token_expires)
+        self._set_refresh_token(refresh_token, refresh_token_expires)
         self._token_update_callback = token_update_callback
+        self._token_update_executor = token_update_executor
+        # Set once the sync callback turned out to return awaitables
+        self._token_update_awaitable = False
+        self._pending_token_data: dict[str, Any] | None = None
+        self._token_update_task: asyncio.Task[None] | None = None
+        if token_store is not None and token_store_key is None and email is None:
+            raise ValueError("token_store_key is required without email")
+        self._token_store = token_store
+        self._token_store_key = token_store_key or f"{region}/{email}"
         self._token_lock = asyncio.Lock()
+        self._token_updated = asyncio.Event()
+        self._refresh_task: asyncio.Task[None] | None = None
 
     @property
     def access_token(self) -> str | None:
@@ -135,49 +448,223 @@ class SimpleTNSEAuth(AbstractTNSEAuth):
 
     async def async_get_access_token(self) -> str | None:
         """Return a valid access token, refreshing if needed."""
-        if self._access_token and (
-            not self._access_token_expires
-            or datetime.now() < self._access_token_expires
-        ):
+        if self._access_token and time.monotonic() < self._access_token_deadline:
             return self._access_token
 
-        async with self._token_lock:
-            # Re-check after acquiring lock — another coroutine may have refreshed
-            if self._access_token and (
-                not self._access_token_expires
-                or datetime.now() < self._access_token_expires
-            ):
-                return self._access_token
+        with start_span("tnse.get_access_token", region=self._region):
+            async with self._async_token_lock():
+                # Re-check after acquiring lock — another coroutine may have
+                # refreshed
+                if (
+                    self._access_token
+                    and time.monotonic() < self._access_token_deadline
+                ):
+                    return self._access_token
+
+                await self._async_renew_tokens()
+
+        return self._access_token
+
+    @asynccontextmanager
+    async def _async_token_lock(self) -> AsyncIterator[None]:
+        """Hold the token lock, tracing the time spent waiting for it."""
+        with start_span("tnse.token_lock_wait", region=self._region):
+            await self._token_lock.acquire()
+        try:
+            yield
+        finally:
+            self._token_lock.release()
+
+    async def async_handle_auth_failure(self, access_token: str) -> bool:
+        """Renew tokens once for all requests rejected with the same token."""
+        async with self._async_token_lock():
+            if self._access_token != access_token:
+                # Another coroutine has already renewed the rejected token
+                return self._access_token is not None
+
+            LOGGER.debug("Access token rejected by server, renewing")
+            await self._async_renew_tokens()
+            return self._access_token not in (None, access_token)
+
+    async def _async_renew_tokens(self) -> None:
+        """Obtain a new access token from the token store, or renew it.
+
+        Must be called with the token lock held.
+        """
+        if self._token_store is None:
+            await self._async_renew_own_tokens()
+            return
+
+        async with self._token_store.lock(self._token_store_key):
+            # Another process may have renewed the tokens while we waited
+            if not await self._async_load_stored_tokens():
+                await self._async_renew_own_tokens()
+
+    async def _async_load_stored_tokens(self) -> bool:
+        """Adopt valid tokens saved by another process.
 
-            # Access token expired or missing — try refresh
-            if self._refresh_token and (
-                not self._refresh_token_expires
-                or datetime.now() < self._refresh_token_expires
+        Return False if the store has no valid access token other than ours;
+        a valid stored refresh token is adopted anyway, so the caller renews
+        with it instead of logging in again.
+        """
+        assert self._token_store is not None
+        data = await self._token_store.async_load(self._token_store_key)
+        if not data:
+            return False
+        refresh_token = data.get("refresh_token")
+        if refresh_token and refresh_token != self._refresh_token:
+            refresh_token_expires = (
+                datetime.fromisoformat(data["refresh_token_expires"])
+                if data.get("refresh_token_expires")
+                else None
+            )
+            if time.monotonic() < self._token_deadline(
+                refresh_token, refresh_token_expires
             ):
-                LOGGER.debug("Access token expired, refreshing via refresh token")
-                try:
-                    await self.async_refresh_token()
-                    return self._access_token
-                except TNSETokenRefreshError:
-                    # The refresh token looked valid locally, but the server
-                    # rejected it (e.g. revoked server-side, or a 403/HTML
-                    # response). Fall back to a full login when we have
-                    # credentials instead of failing authentication.
-                    if not (self._email and self._password):
-                        raise
-                    LOGGER.debug(
-                        "Refresh token rejected by server, re-authenticating"
-                    )
+                self._set_refresh_token(refresh_token, refresh_token_expires)
+
+        if data.get("access_token") in (None, self._access_token):
+            return False
+        access_token_expires = (
+            datetime.fromisoformat(data["access_token_expires"])
+            if data.get("access_token_expires")
+            else None
+        )
+        deadline = self._token_deadline(data["access_token"], access_token_expires)
+        if time.monotonic() >= deadline:
+            return False
 
-            # Refresh token expired or rejected — try login
-            if self._email and self._password:
-                LOGGER.debug("Re-authenticating with email/password")
-                await self.async_login()
-                return self._access_token
+        LOGGER.debug("Using access token renewed by another process")
+        self._access_token = data["access_token"]
+        self._access_token_expires = access_token_expires
+        self._access_token_deadline = deadline
+        self._notify_token_update()
+        return True
 
-            LOGGER.debug("No valid token and no recovery path available")
+    async def _async_save_tokens(self) -> None:
+        """Save current tokens to the token store."""
+        if self._token_store is not None:
+            await self._token_store.async_save(
+                self._token_store_key, self._token_data()
+            )
 
-        return self._access_token
+    async def _async_renew_own_tokens(self) -> None:
+        """Obtain a new access token via refresh token or login."""
+        # Access token expired or missing — try refresh
+        if self._refresh_token and time.monotonic() < self._refresh_token_deadline:
+            LOGGER.debug("Access token expired, refreshing via refresh token")
+            try:
+                await self.async_refresh_token()
+                return
+            except TNSETokenRefreshError:
+                # The refresh token looked valid locally, but the server
+                # rejected it (e.g. revoked server-side, or a 403/HTML
+                # response). Fall back to a full login when we have
+                # credentials instead of failing authentication.
+                if not (self._email and self._password):
+                    raise
+                LOGGER.debug("Refresh token rejected by server, re-authenticating")
+
+        # Refresh token expired or rejected — try login
+        if self._email and self._password:
+            LOGGER.debug("Re-authenticating with email/password")
+            await self.async_login()
+            return
+
+        LOGGER.debug("No valid token and no recovery path available")
+
+    def start_token_refresh(
+        self,
+        *,
+        margin: float = DEFAULT_TOKEN_REFRESH_MARGIN,
+        jitter: float = DEFAULT_TOKEN_REFRESH_JITTER,
+    ) -> None:
+        """Start refreshing the access token in the background.
+
+        The token is renewed ``margin`` seconds (plus up to ``jitter``
+        random seconds) before it expires, so regular requests never have to
+        wait for a refresh. The task stops on async_stop_token_refresh(),
+        on logout or when leaving the ``async with`` block; stop it before
+        closing the session, a closed session is only noticed when the task
+        wakes up to refresh.
+        """
+        if self._refresh_task and not self._refresh_task.done():
+            return
+        self._refresh_task = asyncio.create_task(
+            self._async_token_refresh_loop(margin, jitter),
+            name="aiotnse-token-refresh",
+        )
+
+    async def async_stop_token_refresh(self) -> None:
+        """Stop the background token refresh task."""
+        task, self._refresh_task = self._refresh_task, None
+        if task is None or task is asyncio.current_task():
+            return
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+
+    async def __aenter__(self) -> SimpleTNSEAuth:
+        """Enter the auth context."""
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Exit the auth context and stop background tasks."""
+        await self.async_stop_token_refresh()
+        await self.async_flush_token_updates()
+
+    def _token_refresh_delay(self, margin: float) -> float | None:
+        """Return seconds until the access token should be refreshed."""
+        if not self._access_token:
+            return 0
+        if self._access_token_deadline == math.inf:
+            return None
+        return self._access_token_deadline - time.monotonic() - margin
+
+    async def _async_wait_token_update(self, delay: float | None) -> bool:
+        """Wait up to delay seconds, return True if tokens changed meanwhile."""
+        if delay is not None and delay <= 0:
+            return False
+        try:
+            async with asyncio.timeout(delay):
+                await self._token_updated.wait()
+        except TimeoutError:
+            return False
+        return True
+
+    async def _async_token_refresh_loop(self, margin: float, jitter: float) -> None:
+        """Refresh the access token ahead of its expiration."""
+        LOGGER.debug("Background token refresh started (margin=%ss)", margin)
+        attempted = False
+        while not self._session.closed:
+            self._token_updated.clear()
+            # Drawn once per cycle and checked again under the lock
+            lead = margin + random.uniform(0, jitter)
+            delay = self._token_refresh_delay(lead)
+            if attempted and delay is not None:
+                # Don't hammer the server when the refresh failed or the
+                # server returned an already expiring token.
+                delay = max(delay, DEFAULT_TOKEN_REFRESH_RETRY_INTERVAL)
+            attempted = False
+            if await self._async_wait_token_update(delay):
+                continue
+            if self._session.closed:
+                break
+
+            attempted = True
+            try:
+                async with self._async_token_lock():
+                    delay = self._token_refresh_delay(lead)
+                    if delay is not None and delay <= 0:
+                        LOGGER.debug("Refreshing access token ahead of expiry")
+                        await self._async_renew_tokens()
+            except (TNSEApiError, ClientError, TimeoutError) as err:
+                LOGGER.warning("Background token refresh failed: %s", err)
+            except Exception:
+                # Unexpected payload or callback error: keep refreshing
+                # instead of ending the loop until the next stop/exit.
+                LOGGER.exception("Unexpected error in background token refresh")
+        LOGGER.debug("Background token refresh stopped")
 
     async def _async_auth_request(
         self,
@@ -188,52 +675,79 @@ class SimpleTNSEAuth(AbstractTNSEAuth):
     ) -> Any:
         """Make an auth POST request without Bearer token."""
         url = self._build_url(path)
-        LOGGER.debug(
-            "Auth request: POST /%s keys=%s", path, list(json_data.keys())
-        )
-        async with self._session.request(
-            "POST",
-            url,
-            json=json_data,
-            headers=self._build_headers(),
-        ) as resp:
-            data = await parse_api_response(
-                resp,
-                error_class=error_class,
-                default_error=default_error,
-            )
+        debug = LOGGER.isEnabledFor(logging.DEBUG)
+        if debug:
             LOGGER.debug(
-                "Auth response: POST /%s -> %d: %s", path, resp.status, data
+                "Auth request: POST /%s keys=%s", path, list(json_data.keys())
             )
-            return data
+        started = time.monotonic()
+        resp: ClientResponse | None = None
+        try:
+            with start_span(
+                "tnse.http",
+                region=self._region,
+                endpoint=path,
+                client=True,
+                method="POST",
+            ) as span:
+                async with self._async_open(
+                    "POST",
+                    url,
+                    json=json_data,
+                    headers=self._headers,
+                ) as resp:
+                    span.set_attribute("http.response.status_code", resp.status)
+                    data = await parse_api_response(
+                        resp,
+                        error_class=error_class,
+                        default_error=default_error,
+                        loads=self._json_loads,
+                    )
+                    server_time = parse_http_date(resp.headers.get(hdrs.DATE))
+                    if server_time is not None:
+                        self._clock_offset = server_time - time.time()
+                    if debug:
+                        LOGGER.debug(
+                            "Auth response: POST /%s -> %d: %s",
+                            path,
+                            resp.status,
+                            LogBody(data),
+                        )
+        except (TNSEApiError, ClientError, TimeoutError) as err:
+            if self._request_hooks:
+                self._notify_request("auth", "POST", path, started, resp, error=err)
+            raise
+        if self._request_hooks:
+            self._notify_request("auth", "POST", path, started, resp)
+        return data
 
     async def async_login(self) -> Any:
         """Authenticate with email and password."""
         if not self._email or not self._password:
             raise TNSEAuthError("Email and password are required for login")
 
-        data = await self._async_auth_request(
-            "user/auth",
-            {
-                "login": self._email,
-                "authType": "email",
-                "password": self._password,
-                "region": self._region,
-                "platform": DEFAULT_PLATFORM,
-            },
-            TNSEAuthError,
-            "Authentication failed",
-        )
+        with start_span("tnse.login", region=self._region):
+            data = await self._async_auth_request(
+                "user/auth",
+                {
+                    "login": self._email,
+                    "authType": "email",
+                    "password": self._password,
+                    "region": self._region,
+                    "platform": DEFAULT_PLATFORM,
+                },
+                TNSEAuthError,
+                "Authentication failed",
+            )
 
-        self._access_token = data["accessToken"]
-        self._refresh_token = data["refreshToken"]
-        self._access_token_expires = datetime.fromisoformat(
-            data["accessTokenExpires"]
+        self._set_access_token(
+            data["accessToken"], datetime.fromisoformat(data["accessTokenExpires"])
         )
-        self._refresh_token_expires = datetime.fromisoformat(
-            data["refreshTokenExpires"]
+        self._set_refresh_token(
+            data["refreshToken"], datetime.fromisoformat(data["refreshTokenExpires"])
         )
         self._notify_token_update()
+        await self._async_save_tokens()
 
         LOGGER.debug("Login successful")
         return data
@@ -243,48 +757,140 @@ class SimpleTNSEAuth(AbstractTNSEAuth):
         if not self._refresh_token:
             raise TNSETokenRefreshError("No refresh token available")
 
-        data = await self._async_auth_request(
-            "user/refresh-token",
-            {"refreshToken": self._refresh_token},
-            TNSETokenRefreshError,
-            "Token refresh failed",
-        )
+        with start_span("tnse.refresh_token", region=self._region):
+            data = await self._async_auth_request(
+                "user/refresh-token",
+                {"refreshToken": self._refresh_token},
+                TNSETokenRefreshError,
+                "Token refresh failed",
+            )
 
-        self._access_token = data["accessToken"]
-        self._access_token_expires = datetime.fromisoformat(
-            data["accessTokenExpires"]
+        self._set_access_token(
+            data["accessToken"], datetime.fromisoformat(data["accessTokenExpires"])
         )
         self._notify_token_update()
+        await self._async_save_tokens()
 
         LOGGER.debug("Token refresh successful")
         return data
 
     async def async_logout(self) -> Any:
         """Logout and invalidate tokens."""
+        await self.async_stop_token_refresh()
         data = await self.request("POST", "user/logout")
 
-        self._access_token = None
-        self._refresh_token = None
-        self._access_token_expires = None
-        self._refresh_token_expires = None
+        self._set_access_token(None, None)
+        self._set_refresh_token(None, None)
+        if self._token_store is not None:
+            await self._token_store.async_delete(self._token_store_key)
 
         LOGGER.debug("Logout successful")
         return data
 
+    def _token_deadline(self, token: str | None, expires: datetime | None) -> float:
+        """Return the monotonic time after which a token must be renewed."""
+        if not token:
+            return -math.inf
+        if (expires_at := jwt_expiry(token)) is None:
+            if expires is None:
+                return math.inf
+            if expires.tzinfo is None and self._server_timezone is not None:
+                expires = expires.replace(tzinfo=self._server_timezone)
+            expires_at = expires.timestamp()
+        remaining = expires_at - self._clock_offset - time.time()
+        return time.monotonic() + remaining - self._expiry_margin
+
+    def _set_access_token(self, token: str | None, expires: datetime | None) -> None:
+        """Set the access token and its expiry."""
+        self._access_token = token
+        self._access_token_expires = expires
+        self._access_token_deadline = self._token_deadline(token, expires)
+
+    def _set_refresh_token(self, token: str | None, expires: datetime | None) -> None:
+        """Set the refresh token and its expiry."""
+        self._refresh_token = token
+        self._refresh_token_expires = expires
+        self._refresh_token_deadline = self._token_deadline(token, expires)
+
+    def _token_data(self) -> dict[str, Any]:
+        """Return current tokens as passed to the token update callback."""
+        return {
+            "access_token": self._access_token,
+            "refresh_token": self._refresh_token,
+            "access_token_expires": (
+                self._access_token_expires.isoformat()
+                if self._access_token_expires
+                else None
+            ),
+            "refresh_token_expires": (
+                self._refresh_token_expires.isoformat()
+                if self._refresh_token_expires
+                else None
+            ),
+        }
+
     def _notify_token_update(self) -> None:
         """Notify callback about token changes."""
-        if self._token_update_callback:
-            self._token_update_callback({
-                "access_token": self._access_token,
-                "refresh_token": self._refresh_token,
-                "access_token_expires": (
-                    self._access_token_expires.isoformat()
-                    if self._access_token_expires
-                    else None
-                ),
-                "refresh_token_expires": (
-                    self._refresh_token_expires.isoformat()
-                    if self._refresh_token_expires
-                    else None
-                ),
-            })
+        self._token_updated.set()
+        callback = self._token_update_callback
+        if callback is None:
+            return
+        result: Awaitable[None] | None = None
+        if not (
+            self._token_update_executor is not None
+            or self._token_update_awaitable
+            or _is_async_callable(callback)
+        ):
+            result = callback(self._token_data())
+            if not inspect.isawaitable(result):
+                return
+            # A plain function returning an awaitable: await this result and
+            # deliver the next updates like an async callback
+            self._token_update_awaitable = True
+        else:
+            self._pending_token_data = self._token_data()
+
+        if self._token_update_task is None or self._token_update_task.done():
+            self._token_update_task = asyncio.create_task(
+                self._async_deliver_token_updates(result), name="aiotnse-token-update"
+            )
+
+    async def _async_deliver_token_updates(
+        self, result: Awaitable[None] | None = None
+    ) -> None:
+        """Pass pending token updates to the callback until none are left."""
+        callback = self._token_update_callback
+        assert callback is not None
+        while True:
+            try:
+                if result is not None:
+                    await result
+            except Exception:
+                LOGGER.exception("Error in token update callback")
+            if (data := self._pending_token_data) is None:
+                return
+            self._pending_token_data = None
+            try:
+                if self._token_update_executor is None:
+                    result = callback(data)
+                else:
+                    result = await asyncio.get_running_loop().run_in_executor(
+                        self._token_update_executor, callback, data
+                    )
+                if not inspect.isawaitable(result):
+                    result = None
+            except Exception:
+                LOGGER.exception("Error in token update callback")
+                result = None
+
+    async def async_flush_token_updates(self) -> None:
+        """Wait until pending token updates are passed to the callback."""
+        if (task := self._token_update_task) is not None:
+            await task
+
+
+def _is_async_callable(func: Callable[..., Any]) -> bool:
+    """Return True if calling func returns a coroutine."""
+    return inspect.iscoroutinefunction(func) or inspect.iscoroutinefunction(
+        getattr(func, "__call__", None)
+    )
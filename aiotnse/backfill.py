@@ -0,0 +1,277 @@
+"""Bulk backfill of TNS-Energo history and invoices."""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any
+
+from aiohttp import ClientError
+
+from .api import TNSEApi
+from .const import DEFAULT_BACKFILL_CONCURRENCY, LOGGER
+from .exceptions import TNSEApiError
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS backfill (
+    key TEXT PRIMARY KEY,
+    account TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    month INTEGER,
+    data TEXT NOT NULL
+)
+"""
+
+
+@dataclass(slots=True, frozen=True)
+class BackfillTask:
+    """Single backfill request: monthly history or yearly invoices."""
+
+    account: str
+    kind: str
+    year: int
+    month: int | None = None
+
+    @property
+    def key(self) -> str:
+        """Return unique key used by checkpoints and sinks."""
+        if self.month is None:
+            return f"{self.kind}/{self.account}/{self.year}"
+        return f"{self.kind}/{self.account}/{self.year}/{self.month:02d}"
+
+
+@dataclass(slots=True)
+class BackfillSummary:
+    """Outcome of a backfill run."""
+
+    completed: int = 0
+    skipped: int = 0
+    failed: dict[str, Exception] = field(default_factory=dict)
+
+    @property
+    def complete(self) -> bool:
+        """Return True if no task failed."""
+        return not self.failed
+
+
+class AbstractBackfillSink(ABC):
+    """Destination for backfilled responses."""
+
+    @abstractmethod
+    async def async_write(self, task: BackfillTask, data: Any) -> None:
+        """Store the response of a task."""
+
+    async def async_close(self) -> None:
+        """Flush and close the sink."""
+
+
+class JSONLinesBackfillSink(AbstractBackfillSink):
+    """Append every response as a JSON line to a file.
+
+    A task interrupted between writing and checkpointing is written again
+    on resume, so consumers should deduplicate lines by ``key``.
+    """
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = asyncio.Lock()
+
+    def _write(self, line: str) -> None:
+        """Append a line and flush it to disk."""
+        self._file.write(line)
+        self._file.flush()
+
+    async def async_write(self, task: BackfillTask, data: Any) -> None:
+        """Append the response of a task."""
+        line = json.dumps(
+            {
+                "key": task.key,
+                "account": task.account,
+                "kind": task.kind,
+                "year": task.year,
+                "month": task.month,
+                "data": data,
+            },
+            ensure_ascii=False,
+        )
+        async with self._lock:
+            await asyncio.to_thread(self._write, line + "\n")
+
+    async def async_close(self) -> None:
+        """Close the file."""
+        async with self._lock:
+            self._file.close()
+
+
+class SQLiteBackfillSink(AbstractBackfillSink):
+    """Store responses in an SQLite table keyed by task."""
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(_SCHEMA)
+
+    def _write(self, task: BackfillTask, value: str) -> None:
+        """Store JSON of a task."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO backfill "
+                "(key, account, kind, year, month, data) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (task.key, task.account, task.kind, task.year, task.month, value),
+            )
+
+    async def async_write(self, task: BackfillTask, data: Any) -> None:
+        """Store the response of a task."""
+        await asyncio.to_thread(
+            self._write, task, json.dumps(data, ensure_ascii=False)
+        )
+
+    async def async_close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._conn.close()
+
+
+class BackfillCheckpoint:
+    """Keys of completed tasks, appended to a file as they finish."""
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self._done: set[str] = set()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as file:
+                self._done.update(line.strip() for line in file if line.strip())
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = asyncio.Lock()
+
+    def __contains__(self, key: object) -> bool:
+        """Return True if the task with the key is completed."""
+        return key in self._done
+
+    def __len__(self) -> int:
+        """Return number of completed tasks."""
+        return len(self._done)
+
+    def _write(self, line: str) -> None:
+        """Append a line and flush it to disk."""
+        self._file.write(line)
+        self._file.flush()
+
+    async def async_mark_done(self, key: str) -> None:
+        """Record a completed task."""
+        self._done.add(key)
+        async with self._lock:
+            await asyncio.to_thread(self._write, key + "\n")
+
+    async def async_close(self) -> None:
+        """Close the checkpoint file."""
+        async with self._lock:
+            self._file.close()
+
+
+def iter_months(start: date, end: date) -> Iterator[tuple[int, int]]:
+    """Yield (year, month) from start to end inclusive."""
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        yield year, month
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+class TNSEBackfill:
+    """Fetch history and invoices of many accounts over a date range.
+
+    Monthly history and yearly invoices of every account are requested by
+    up to ``max_concurrency`` workers and streamed to ``sink`` as they
+    arrive. Completed tasks are recorded in ``checkpoint``, so a run
+    interrupted by a crash resumes where it stopped. Failed tasks are
+    reported in the summary and retried by the next run.
+    """
+
+    def __init__(
+        self,
+        api: TNSEApi,
+        accounts: Iterable[str],
+        start: date,
+        end: date,
+        *,
+        sink: AbstractBackfillSink,
+        checkpoint: BackfillCheckpoint | None = None,
+        history: bool = True,
+        invoices: bool = True,
+        max_concurrency: int = DEFAULT_BACKFILL_CONCURRENCY,
+    ) -> None:
+        self._api = api
+        self._accounts = list(accounts)
+        self._start = start
+        self._end = end
+        self._sink = sink
+        self._checkpoint = checkpoint
+        self._history = history
+        self._invoices = invoices
+        self._max_concurrency = max_concurrency
+
+    def tasks(self) -> Iterator[BackfillTask]:
+        """Yield all tasks of the backfill, including completed ones."""
+        for account in self._accounts:
+            if self._invoices:
+                for year in range(self._start.year, self._end.year + 1):
+                    yield BackfillTask(account, "invoices", year)
+            if self._history:
+                for year, month in iter_months(self._start, self._end):
+                    yield BackfillTask(account, "history", year, month)
+
+    async def _async_fetch(self, task: BackfillTask) -> Any:
+        """Send the request of a task."""
+        if task.month is None:
+            return await self._api.async_get_invoices(task.account, task.year)
+        return await self._api.async_get_history(task.account, task.year, task.month)
+
+    async def _async_worker(
+        self, tasks: Iterator[BackfillTask], summary: BackfillSummary
+    ) -> None:
+        """Process tasks until none are left."""
+        for task in tasks:
+            if self._checkpoint is not None and task.key in self._checkpoint:
+                summary.skipped += 1
+                continue
+            try:
+                data = await self._async_fetch(task)
+            except (TNSEApiError, ClientError, TimeoutError) as err:
+                LOGGER.debug("Backfill %s failed: %r", task.key, err)
+                summary.failed[task.key] = err
+                continue
+            await self._sink.async_write(task, data)
+            if self._checkpoint is not None:
+                await self._checkpoint.async_mark_done(task.key)
+            summary.completed += 1
+
+    async def async_run(self) -> BackfillSummary:
+        """Run the backfill and return its summary."""
+        summary = BackfillSummary()
+        # Workers share one lazy iterator, so pending tasks are never
+        # materialized up front.
+        tasks = self.tasks()
+        workers = [
+            asyncio.create_task(self._async_worker(tasks, summary))
+            for _ in range(self._max_concurrency)
+        ]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+        LOGGER.debug(
+            "Backfill finished: %d completed, %d skipped, %d failed",
+            summary.completed,
+            summary.skipped,
+            len(summary.failed),
+        )
+        return summary
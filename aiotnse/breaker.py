@@ -0,0 +1,172 @@
+"""Circuit breaker for regional TNS-Energo API hosts."""
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager
+from enum import StrEnum
+
+from aiohttp import ClientError, ClientResponse
+
+from .const import (
+    DEFAULT_CIRCUIT_FAILURE_THRESHOLD,
+    DEFAULT_CIRCUIT_HALF_OPEN_CALLS,
+    DEFAULT_CIRCUIT_RECOVERY_TIMEOUT,
+    LOGGER,
+)
+from .exceptions import TNSECircuitOpenError
+
+
+class CircuitState(StrEnum):
+    """Circuit breaker state."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitCall:
+    """A single request admitted by the circuit breaker."""
+
+    __slots__ = ("failed",)
+
+    def __init__(self) -> None:
+        self.failed: bool | None = None
+
+    def record(self, resp: ClientResponse) -> None:
+        """Record the response of the request; 5xx counts as a failure."""
+        self.failed = resp.status >= 500
+
+
+class CircuitBreaker:
+    """Circuit breaker for a single host.
+
+    After ``failure_threshold`` consecutive failures (connection errors,
+    timeouts or 5xx) the circuit opens and requests fail immediately. After
+    ``recovery_timeout`` seconds up to ``half_open_calls`` probe requests
+    are let through: a success closes the circuit, a failure opens it again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        failure_threshold: int = DEFAULT_CIRCUIT_FAILURE_THRESHOLD,
+        recovery_timeout: float = DEFAULT_CIRCUIT_RECOVERY_TIMEOUT,
+        half_open_calls: int = DEFAULT_CIRCUIT_HALF_OPEN_CALLS,
+    ) -> None:
+        self.name = name
+        self.failures = 0
+        self._failure_threshold = failure_threshold
+        self._recovery_timeout = recovery_timeout
+        self._half_open_calls = half_open_calls
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+
+    @property
+    def state(self) -> CircuitState:
+        """Return current state."""
+        if (
+            self._state is CircuitState.OPEN
+            and time.monotonic() - self._opened_at >= self._recovery_timeout
+        ):
+            self._set_state(CircuitState.HALF_OPEN)
+            self._probes = 0
+        return self._state
+
+    def _set_state(self, state: CircuitState) -> None:
+        """Switch to the given state."""
+        LOGGER.debug("Circuit %s: %s -> %s", self.name, self._state, state)
+        self._state = state
+
+    def _admit(self) -> None:
+        """Admit a request or raise TNSECircuitOpenError."""
+        state = self.state
+        if state is CircuitState.CLOSED:
+            return
+        if state is CircuitState.HALF_OPEN and self._probes < self._half_open_calls:
+            self._probes += 1
+            return
+        retry_after = max(
+            0.0, self._opened_at + self._recovery_timeout - time.monotonic()
+        )
+        raise TNSECircuitOpenError(
+            f"Circuit open for {self.name}, retry in {retry_after:.0f}s",
+            retry_after=retry_after,
+        )
+
+    def _release(self, call: CircuitCall, was_probe: bool) -> None:
+        """Update state with the outcome of an admitted request."""
+        if was_probe:
+            self._probes -= 1
+        if call.failed is None:
+            # Cancelled or failed before reaching the server: no signal
+            return
+        if not call.failed:
+            self.failures = 0
+            if self._state is not CircuitState.CLOSED:
+                self._set_state(CircuitState.CLOSED)
+            return
+
+        self.failures += 1
+        if self._state is CircuitState.HALF_OPEN or (
+            self._state is CircuitState.CLOSED
+            and self.failures >= self._failure_threshold
+        ):
+            self._set_state(CircuitState.OPEN)
+            self._opened_at = time.monotonic()
+
+    @contextmanager
+    def guard(self) -> Iterator[CircuitCall]:
+        """Admit a request and record its outcome."""
+        self._admit()
+        was_probe = self._state is CircuitState.HALF_OPEN
+        call = CircuitCall()
+        try:
+            yield call
+        except (ClientError, TimeoutError):
+            call.failed = True
+            raise
+        finally:
+            self._release(call, was_probe)
+
+
+class TNSECircuitBreaker:
+    """Circuit breakers keyed by regional base URL.
+
+    While the circuit of a host is open, requests to it raise
+    TNSECircuitOpenError immediately instead of waiting for timeouts, so a
+    failing region does not tie up connections needed by healthy ones.
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = DEFAULT_CIRCUIT_FAILURE_THRESHOLD,
+        recovery_timeout: float = DEFAULT_CIRCUIT_RECOVERY_TIMEOUT,
+        half_open_calls: int = DEFAULT_CIRCUIT_HALF_OPEN_CALLS,
+    ) -> None:
+        self._failure_threshold = failure_threshold
+        self._recovery_timeout = recovery_timeout
+        self._half_open_calls = half_open_calls
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def get(self, base_url: str) -> CircuitBreaker:
+        """Return the circuit breaker for a host."""
+        if (breaker := self._breakers.get(base_url)) is None:
+            breaker = self._breakers[base_url] = CircuitBreaker(
+                base_url,
+                failure_threshold=self._failure_threshold,
+                recovery_timeout=self._recovery_timeout,
+                half_open_calls=self._half_open_calls,
+            )
+        return breaker
+
+    def states(self) -> dict[str, CircuitState]:
+        """Return current state by base URL, for monitoring."""
+        return {url: breaker.state for url, breaker in self._breakers.items()}
+
+    def guard(self, base_url: str) -> AbstractContextManager[CircuitCall]:
+        """Admit a request to the host and record its outcome."""
+        return self.get(base_url).guard()
@@ -0,0 +1,194 @@
+"""In-memory response cache for TNS-Energo API."""
+from __future__ import annotations
+
+import sys
+import time
+from collections import OrderedDict
+from collections.abc import Hashable, Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from .const import (
+    DEFAULT_CACHE_MAX_ENTRIES,
+    DEFAULT_CACHE_MAX_SIZE,
+    DEFAULT_CACHE_TTLS,
+    LOGGER,
+)
+from .helpers import path_template
+
+CacheKey = tuple[Hashable, str, str, tuple[tuple[str, Any], ...]]
+
+
+@dataclass(slots=True)
+class _CacheEntry:
+    """Cached response payload."""
+
+    value: Any
+    expires: float
+    endpoint: str
+    account: str | None
+    size: int
+
+
+def _estimate_size(obj: Any) -> int:
+    """Estimate memory used by a decoded JSON value, in bytes."""
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += _estimate_size(key) + _estimate_size(value)
+    elif isinstance(obj, list):
+        for item in obj:
+            size += _estimate_size(item)
+    return size
+
+
+class TNSEResponseCache:
+    """LRU cache for GET responses with per-endpoint TTLs and a memory bound.
+
+    Only endpoints listed in ``ttls`` (keyed by path template, e.g.
+    ``"counters/{id}/readings"``) are cached. Cached payloads are shared
+    between callers and must be treated as read-only.
+
+    Entries are keyed by ``scope`` as well as by request, so one cache can be
+    shared by clients of different users: TNSEApi passes its auth as scope.
+
+    A response fetched while its entries were invalidated is stale: pass
+    generation() taken before the request to set() to skip storing it.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttls: Mapping[str, float] | None = None,
+        max_entries: int = DEFAULT_CACHE_MAX_ENTRIES,
+        max_size: int = DEFAULT_CACHE_MAX_SIZE,
+    ) -> None:
+        self._ttls = dict(DEFAULT_CACHE_TTLS if ttls is None else ttls)
+        self._max_entries = max_entries
+        self._max_size = max_size
+        self._entries: OrderedDict[CacheKey, _CacheEntry] = OrderedDict()
+        self._size = 0
+        # Bumped by invalidation of all accounts and of a single account
+        self._generation = 0
+        self._account_generations: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        """Return number of cached entries."""
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        """Return estimated memory used by cached payloads, in bytes."""
+        return self._size
+
+    def generation(self, account: str | None = None) -> int:
+        """Return a counter that changes when entries of the account are dropped."""
+        if account is None:
+            return self._generation
+        return self._generation + self._account_generations.get(account, 0)
+
+    @staticmethod
+    def _make_key(
+        scope: Hashable,
+        region: str,
+        path: str,
+        params: Mapping[str, Any] | None,
+    ) -> CacheKey:
+        """Build cache key for a request."""
+        return scope, region, path, tuple(sorted((params or {}).items()))
+
+    def get(
+        self,
+        region: str,
+        path: str,
+        params: Mapping[str, Any] | None = None,
+        default: Any = None,
+        *,
+        scope: Hashable = None,
+    ) -> Any:
+        """Return cached payload for a request, or default if missing/expired."""
+        key = self._make_key(scope, region, path, params)
+        if (entry := self._entries.get(key)) is None:
+            return default
+        if entry.expires <= time.monotonic():
+            self._remove(key)
+            return default
+        self._entries.move_to_end(key)
+        return entry.value
+
+    def set(
+        self,
+        region: str,
+        path: str,
+        params: Mapping[str, Any] | None,
+        value: Any,
+        *,
+        generation: int | None = None,
+        scope: Hashable = None,
+    ) -> None:
+        """Store payload for a request if its endpoint is cacheable.
+
+        Nothing is stored if ``generation`` is given and the entries of the
+        account were invalidated since it was taken.
+        """
+        endpoint = path_template(path)
+        if (ttl := self._ttls.get(endpoint)) is None:
+            return
+        account = params.get("account") if params else None
+        if generation is not None and generation != self.generation(account):
+            LOGGER.debug("Stale response not cached: /%s", path)
+            return
+        size = _estimate_size(value)
+        if size > self._max_size:
+            LOGGER.debug("Response too large to cache: /%s (%d bytes)", path, size)
+            return
+
+        key = self._make_key(scope, region, path, params)
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = _CacheEntry(
+            value, time.monotonic() + ttl, endpoint, account, size
+        )
+        self._size += size
+
+        while len(self._entries) > self._max_entries or self._size > self._max_size:
+            self._remove(next(iter(self._entries)))
+
+    def invalidate(
+        self,
+        *,
+        account: str | None = None,
+        endpoints: Iterable[str] | None = None,
+    ) -> int:
+        """Drop entries matching account and/or endpoint templates.
+
+        Without arguments the whole cache is cleared. Return the number of
+        dropped entries.
+        """
+        if account is None:
+            self._generation += 1
+        else:
+            self._account_generations[account] = (
+                self._account_generations.get(account, 0) + 1
+            )
+        endpoint_set = None if endpoints is None else set(endpoints)
+        keys = [
+            key
+            for key, entry in self._entries.items()
+            if (account is None or entry.account == account)
+            and (endpoint_set is None or entry.endpoint in endpoint_set)
+        ]
+        for key in keys:
+            self._remove(key)
+        return len(keys)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._generation += 1
+        self._entries.clear()
+        self._size = 0
+
+    def _remove(self, key: CacheKey) -> None:
+        """Remove entry by key."""
+        entry = self._entries.pop(key)
+        self._size -= entry.size
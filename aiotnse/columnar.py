@@ -0,0 +1,178 @@
+"""Columnar NumPy export of counter readings history.
+
+Requires numpy (``pip install aiotnse[numpy]``).
+"""
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from .const import DEFAULT_ANOMALY_THRESHOLD
+from .models import parse_date, parse_number
+
+# Reading titles look like "День ПУ 10000001"
+_ZONE_SEPARATOR = " ПУ "
+
+
+@dataclass(slots=True, frozen=True)
+class PeriodConsumption:
+    """Consumption summed by counter, tariff zone and period."""
+
+    counters: np.ndarray
+    zones: np.ndarray
+    periods: np.ndarray
+    consumption: np.ndarray
+    counter_ids: tuple[str, ...]
+    zone_names: tuple[str, ...]
+
+
+@dataclass(slots=True, frozen=True)
+class ReadingsArray:
+    """Readings of one or many counters as parallel arrays.
+
+    Every row is a reading of one tariff zone: ``counters`` and ``zones``
+    index ``counter_ids`` and ``zone_names``, ``dates`` is datetime64[D] and
+    ``values`` float64 (NaN if missing). Rows are sorted by counter, zone and
+    date, so consecutive rows of a group are consecutive readings.
+    """
+
+    counters: np.ndarray
+    zones: np.ndarray
+    dates: np.ndarray
+    values: np.ndarray
+    counter_ids: tuple[str, ...]
+    zone_names: tuple[str, ...]
+
+    def __len__(self) -> int:
+        """Return number of rows."""
+        return len(self.values)
+
+    @property
+    def groups(self) -> np.ndarray:
+        """Return group index of every row, one group per counter zone."""
+        return self.counters * len(self.zone_names) + self.zones
+
+    def _group_starts(self) -> np.ndarray:
+        """Return mask of rows starting a new counter zone."""
+        groups = self.groups
+        starts = np.ones(len(groups), dtype=bool)
+        starts[1:] = groups[1:] != groups[:-1]
+        return starts
+
+    def deltas(self) -> np.ndarray:
+        """Return change of every reading since the previous one.
+
+        The first reading of every counter zone has no previous one and
+        gets NaN.
+        """
+        deltas = np.empty(len(self.values))
+        deltas[1:] = np.diff(self.values)
+        deltas[self._group_starts()] = np.nan
+        return deltas
+
+    def consumption(self, period: str = "M") -> PeriodConsumption:
+        """Return consumption summed by counter zone and period.
+
+        ``period`` is a NumPy datetime unit: ``"M"`` for months, ``"Y"``
+        for years, ``"D"`` for days. Consumption is attributed to the
+        period of the closing reading.
+        """
+        deltas = self.deltas()
+        valid = ~np.isnan(deltas)
+        groups = self.groups[valid].astype(np.int64)
+        periods = self.dates[valid].astype(f"datetime64[{period}]").astype(np.int64)
+        first = periods.min() if len(periods) else 0
+        span = periods.max() - first + 1 if len(periods) else 1
+        # One integer key per (group, period) keeps np.unique one-dimensional
+        keys, index = np.unique(groups * span + periods - first, return_inverse=True)
+        totals = np.bincount(index, weights=deltas[valid], minlength=len(keys))
+        n_zones = max(len(self.zone_names), 1)
+        return PeriodConsumption(
+            counters=keys // span // n_zones,
+            zones=keys // span % n_zones,
+            periods=(keys % span + first).astype(f"datetime64[{period}]"),
+            consumption=totals.astype(np.float64),
+            counter_ids=self.counter_ids,
+            zone_names=self.zone_names,
+        )
+
+    def anomalies(self, threshold: float = DEFAULT_ANOMALY_THRESHOLD) -> np.ndarray:
+        """Return mask of suspicious readings.
+
+        A reading is flagged if it is lower than the previous one (meter
+        replaced or mistyped) or its daily consumption is more than
+        ``threshold`` times the median daily consumption of its counter zone.
+        """
+        deltas = self.deltas()
+        days = np.empty(len(self.dates))
+        days[1:] = np.diff(self.dates).astype(np.float64)
+        days[self._group_starts()] = np.nan
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rates = deltas / days
+        valid = np.isfinite(rates)
+
+        groups = self.groups
+        median = _group_median(
+            groups[valid], rates[valid], len(self.counter_ids) * len(self.zone_names)
+        )
+        with np.errstate(invalid="ignore"):
+            spikes = valid & (rates > threshold * median[groups])
+            return (deltas < 0) | spikes
+
+
+def _group_median(groups: np.ndarray, values: np.ndarray, size: int) -> np.ndarray:
+    """Return median of values by group index, NaN for empty groups."""
+    order = np.lexsort((values, groups))
+    ordered = values[order]
+    counts = np.bincount(groups, minlength=size)
+    starts = np.cumsum(counts) - counts
+    median = np.full(size, np.nan)
+    present = counts > 0
+    low = starts[present] + (counts[present] - 1) // 2
+    high = starts[present] + counts[present] // 2
+    median[present] = (ordered[low] + ordered[high]) / 2
+    return median
+
+
+def readings_to_arrays(
+    readings: Mapping[str, Iterable[Mapping[str, Any]]],
+) -> ReadingsArray:
+    """Convert readings history by counter ID to a ReadingsArray.
+
+    ``readings`` maps counter IDs to results of
+    ``TNSEApi.async_get_counter_readings()``, e.g.
+    ``AccountSnapshot.readings``. Records without a valid date are skipped.
+    """
+    zone_index: dict[str, int] = {}
+    counters: list[int] = []
+    zones: list[int] = []
+    dates: list[Any] = []
+    values: list[float] = []
+
+    for counter, records in enumerate(readings.values()):
+        for record in records:
+            if (day := parse_date(record.get("date"))) is None:
+                continue
+            for item in record.get("readings") or ():
+                zone = (item.get("title") or "").partition(_ZONE_SEPARATOR)[0]
+                value = parse_number(item.get("value"))
+                counters.append(counter)
+                zones.append(zone_index.setdefault(zone, len(zone_index)))
+                dates.append(day)
+                values.append(np.nan if value is None else value)
+
+    counters_arr = np.array(counters, dtype=np.int32)
+    zones_arr = np.array(zones, dtype=np.int16)
+    dates_arr = np.array(dates, dtype="datetime64[D]")
+    order = np.lexsort((dates_arr, zones_arr, counters_arr))
+    return ReadingsArray(
+        counters=counters_arr[order],
+        zones=zones_arr[order],
+        dates=dates_arr[order],
+        values=np.array(values, dtype=np.float64)[order],
+        counter_ids=tuple(readings),
+        zone_names=tuple(zone_index),
+    )
@@ -13,6 +13,13 @@ BEARER_HEADER: Final = "authorizationtest"
 API_HASH_HEADER: Final = "x-api-hash"
 DEVICE_ID_HEADER: Final = "x-device-id"
 
+# HTTP statuses returned when the server rejects the access token.
+AUTH_FAILURE_STATUSES: Final = frozenset({401, 403})
+# HTTP statuses signalling that the server is overloaded.
+THROTTLE_STATUSES: Final = frozenset({429, 502, 503, 504})
+# HTTP statuses of transient server failures worth retrying.
+RETRY_STATUSES: Final = frozenset({500, 502, 503, 504})
+
 DEFAULT_CONTENT_TYPE: Final = "application/json"
 DEFAULT_USER_AGENT: Final = "Dart/3.9 (dart:io)"
 DEFAULT_API_HASH: Final = "b4c9554247f14b9a281f5f60df923f5e"
@@ -23,6 +30,104 @@ DEFAULT_REGION: Final = "rostov"
 DEFAULT_PLATFORM: Final = "android"
 ACCOUNT_NUMBER_LENGTH: Final = 12
 
+# Default TTLs of cached GET responses by endpoint template, in seconds.
+DEFAULT_CACHE_TTLS: Final[dict[str, float]] = {
+    "user": 3600,
+    "accounts": 3600,
+    "accounts/{id}": 3600,
+    "information": 3600,
+    "main-page/debt/info": 300,
+    "counters": 300,
+    "counters/{id}/readings": 300,
+    "payments/new-balance": 300,
+    "history": 300,
+    "invoices": 3600,
+    "invoices/settings": 3600,
+}
+DEFAULT_CACHE_MAX_ENTRIES: Final = 1024
+DEFAULT_CACHE_MAX_SIZE: Final = 16 * 1024 * 1024
+
+# Cached endpoints whose data changes after sending meter readings: of the
+# account, and of the whole user (cached without an account).
+READINGS_DEPENDENT_ENDPOINTS: Final = (
+    "counters",
+    "counters/{id}/readings",
+    "payments/new-balance",
+    "history",
+)
+USER_READINGS_DEPENDENT_ENDPOINTS: Final = ("main-page/debt/info",)
+
+# Max concurrent requests when fetching an account snapshot.
+DEFAULT_SNAPSHOT_CONCURRENCY: Final = 4
+
+# Max concurrent requests of a history and invoices backfill.
+DEFAULT_BACKFILL_CONCURRENCY: Final = 4
+
+# Max users processed concurrently by TNSEFleet, in total and per region.
+DEFAULT_FLEET_CONCURRENCY: Final = 32
+DEFAULT_FLEET_REGION_CONCURRENCY: Final = 8
+
+# Per-region client-side rate limiting defaults.
+DEFAULT_RATE_LIMIT: Final = 10.0
+DEFAULT_RATE_LIMIT_BURST: Final = 10.0
+DEFAULT_RATE_LIMIT_CONCURRENCY: Final = 8
+DEFAULT_RATE_LIMIT_LATENCY: Final = 5.0
+
+# Retry policy defaults: attempts include the first request, delays in seconds.
+DEFAULT_RETRY_ATTEMPTS: Final = 3
+DEFAULT_RETRY_BASE_DELAY: Final = 0.5
+DEFAULT_RETRY_MAX_DELAY: Final = 10.0
+# Retries allowed per regular request, and retries kept for bursts.
+DEFAULT_RETRY_BUDGET_RATIO: Final = 0.1
+DEFAULT_RETRY_BUDGET_MAX_TOKENS: Final = 10.0
+
+# Connection pool defaults of create_session(): total and per regional host
+# connections, seconds to keep idle connections and DNS answers.
+DEFAULT_CONNECTION_LIMIT: Final = 100
+DEFAULT_CONNECTION_LIMIT_PER_HOST: Final = 8
+DEFAULT_KEEPALIVE_TIMEOUT: Final = 60.0
+DEFAULT_DNS_CACHE_TTL: Final = 300
+
+# Upper bounds of request latency histogram buckets, in seconds.
+DEFAULT_LATENCY_BUCKETS: Final = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Maximum length of a request or response body formatted into a log record.
+DEFAULT_LOG_BODY_LIMIT: Final = 2048
+# Lowercased body keys whose values are never formatted into log records.
+REDACTED_LOG_KEYS: Final = frozenset(
+    {"accesstoken", "refreshtoken", "password", "authorization", BEARER_HEADER}
+)
+
+# Chunk size for streaming downloads of invoice files.
+DEFAULT_STREAM_CHUNK_SIZE: Final = 64 * 1024
+
+# Circuit breaker defaults: consecutive failures to open the circuit,
+# seconds before probing the host again, and number of probe requests.
+DEFAULT_CIRCUIT_FAILURE_THRESHOLD: Final = 5
+DEFAULT_CIRCUIT_RECOVERY_TIMEOUT: Final = 30.0
+DEFAULT_CIRCUIT_HALF_OPEN_CALLS: Final = 1
+
+# Multiple of the median daily consumption of a counter zone above which a
+# reading is flagged as anomalous in columnar readings export.
+DEFAULT_ANOMALY_THRESHOLD: Final = 3.0
+
+# Full months after which a billing period is considered closed.
+DEFAULT_ARCHIVE_LAG_MONTHS: Final = 1
+
+# Background token refresh timings, in seconds.
+DEFAULT_TOKEN_REFRESH_MARGIN: Final = 120.0
+DEFAULT_TOKEN_REFRESH_JITTER: Final = 30.0
+DEFAULT_TOKEN_REFRESH_RETRY_INTERVAL: Final = 30.0
+
+# Seconds before expiry a token is no longer used, covering clock skew left
+# after the Date header correction and request latency.
+DEFAULT_TOKEN_EXPIRY_MARGIN: Final = 10.0
+
+# Token store lock: max wait (and lease of SQLite locks) and poll interval,
+# in seconds.
+DEFAULT_TOKEN_STORE_LOCK_TIMEOUT: Final = 60.0
+DEFAULT_TOKEN_STORE_LOCK_POLL_INTERVAL: Final = 0.05
+
 BASIC_AUTH_TEMPLATE: Final = "mobile-api-{region}:mobile-api-{region}"
 BASE_URL_TEMPLATE: Final = "https://mobile-api-{region}.tns-e.ru"
 
@@ -5,6 +5,17 @@ from __future__ import annotations
 class TNSEApiError(Exception):
     """Base class for aiotnse errors."""
 
+    def __init__(
+        self,
+        *args: object,
+        status: int | None = None,
+        content_type: str | None = None,
+    ) -> None:
+        """Initialize the error with the HTTP status and content type, if any."""
+        super().__init__(*args)
+        self.status = status
+        self.content_type = content_type
+
 
 class TNSEAuthError(TNSEApiError):
     """Base class for aiotnse auth errors."""
@@ -18,6 +29,15 @@ class TNSETokenRefreshError(TNSEAuthError):
     """Refresh token failed, re-authentication required."""
 
 
+class TNSECircuitOpenError(TNSEApiError):
+    """Requests to the regional host are blocked by an open circuit breaker."""
+
+    def __init__(self, *args: object, retry_after: float = 0.0) -> None:
+        """Initialize the error with seconds until the next probe request."""
+        super().__init__(*args)
+        self.retry_after = retry_after
+
+
 class RegionNotFound(TNSEApiError):
     """Region for account number is not found."""
 
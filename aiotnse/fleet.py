@@ -0,0 +1,160 @@
+"""Orchestrator for polling many TNS-Energo users at once."""
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+from collections.abc import AsyncIterator, Callable, Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+from aiohttp import ClientError, ClientSession
+
+from .api import TNSEApi
+from .auth import SimpleTNSEAuth
+from .breaker import TNSECircuitBreaker
+from .const import (
+    DEFAULT_FLEET_CONCURRENCY,
+    DEFAULT_FLEET_REGION_CONCURRENCY,
+    DEFAULT_SNAPSHOT_CONCURRENCY,
+    LOGGER,
+)
+from .exceptions import TNSEApiError
+from .models import AccountSnapshot
+from .retry import RetryPolicy
+from .session import create_session
+from .throttle import TNSERateLimiter
+
+
+@dataclass(slots=True, frozen=True)
+class TNSECredentials:
+    """Login credentials of a single user."""
+
+    email: str
+    password: str = field(repr=False)
+    region: str
+
+
+@dataclass(slots=True)
+class FleetResult:
+    """Outcome of walking all accounts of a single user."""
+
+    credentials: TNSECredentials
+    accounts: Any = None
+    snapshots: list[AccountSnapshot] = field(default_factory=list)
+    error: Exception | None = None
+
+    @property
+    def complete(self) -> bool:
+        """Return True if the user and all its accounts were fetched."""
+        return self.error is None and all(s.complete for s in self.snapshots)
+
+
+class TNSEFleet:
+    """Run the full account walk for many users concurrently.
+
+    Every user gets its own SimpleTNSEAuth and TNSEApi, while users of the
+    same region share one ClientSession (every region is a separate host).
+    At most ``max_concurrency`` users are processed at once, and at most
+    ``max_region_concurrency`` of them per region. A shared TNSERateLimiter
+    additionally limits the request rate of all users per region.
+    """
+
+    def __init__(
+        self,
+        credentials: Iterable[TNSECredentials],
+        *,
+        max_concurrency: int = DEFAULT_FLEET_CONCURRENCY,
+        max_region_concurrency: int = DEFAULT_FLEET_REGION_CONCURRENCY,
+        snapshot_concurrency: int = DEFAULT_SNAPSHOT_CONCURRENCY,
+        session_factory: Callable[[], ClientSession] = create_session,
+        rate_limiter: TNSERateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+        circuit_breaker: TNSECircuitBreaker | None = None,
+    ) -> None:
+        self._credentials = list(credentials)
+        self._rate_limiter = rate_limiter
+        self._retry_policy = retry_policy
+        self._circuit_breaker = circuit_breaker
+        self._snapshot_concurrency = snapshot_concurrency
+        self._session_factory = session_factory
+        self._sessions: dict[str, ClientSession] = {}
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._region_semaphores: defaultdict[str, asyncio.Semaphore] = defaultdict(
+            lambda: asyncio.Semaphore(max_region_concurrency)
+        )
+
+    async def __aenter__(self) -> TNSEFleet:
+        """Enter the fleet context."""
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Close sessions on context exit."""
+        await self.async_close()
+
+    async def async_close(self) -> None:
+        """Close all sessions created by the fleet."""
+        sessions, self._sessions = self._sessions, {}
+        for session in sessions.values():
+            await session.close()
+
+    def _get_session(self, region: str) -> ClientSession:
+        """Return shared session for the region host."""
+        if (session := self._sessions.get(region)) is None:
+            session = self._sessions[region] = self._session_factory()
+        return session
+
+    async def _async_walk(self, credentials: TNSECredentials) -> FleetResult:
+        """Login and fetch snapshots of all accounts of a single user."""
+        result = FleetResult(credentials)
+        auth = SimpleTNSEAuth(
+            self._get_session(credentials.region),
+            region=credentials.region,
+            email=credentials.email,
+            password=credentials.password,
+            rate_limiter=self._rate_limiter,
+            retry_policy=self._retry_policy,
+            circuit_breaker=self._circuit_breaker,
+        )
+        api = TNSEApi(auth)
+        await auth.async_login()
+        result.accounts = await api.async_get_accounts()
+        result.snapshots = list(
+            await asyncio.gather(
+                *(
+                    api.async_get_account_snapshot(
+                        account["number"],
+                        max_concurrency=self._snapshot_concurrency,
+                    )
+                    for account in result.accounts or ()
+                )
+            )
+        )
+        return result
+
+    async def _async_run(self, credentials: TNSECredentials) -> FleetResult:
+        """Walk a single user within the concurrency limits."""
+        async with self._region_semaphores[credentials.region], self._semaphore:
+            try:
+                return await self._async_walk(credentials)
+            except (TNSEApiError, ClientError, TimeoutError) as err:
+                LOGGER.debug("Fleet walk for %s failed: %r", credentials.email, err)
+                return FleetResult(credentials, error=err)
+            except Exception as err:
+                # Unexpected payload (missing fields, bad dates) of one user
+                # must not cancel the walks of the others.
+                LOGGER.exception("Fleet walk for %s failed", credentials.email)
+                return FleetResult(credentials, error=err)
+
+    async def async_iter_results(self) -> AsyncIterator[FleetResult]:
+        """Yield results as soon as each user completes."""
+        tasks = [
+            asyncio.create_task(self._async_run(credentials))
+            for credentials in self._credentials
+        ]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                yield await next_result
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
@@ -2,8 +2,14 @@
 from __future__ import annotations
 
 import json
-from base64 import b64encode
-from typing import Any
+import re
+from base64 import b64encode, urlsafe_b64decode
+from collections.abc import AsyncIterator, Callable, Iterator, Mapping
+from contextlib import AsyncExitStack, asynccontextmanager
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any
 
 import aiohttp
 from aiohttp import hdrs
@@ -11,15 +17,59 @@ from aiohttp import hdrs
 from .const import (
     ACCOUNT_NUMBER_LENGTH,
     API_HASH_HEADER,
+    AUTH_FAILURE_STATUSES,
     BASE_URL_TEMPLATE,
     BASIC_AUTH_TEMPLATE,
     DEFAULT_API_HASH,
     DEFAULT_CONTENT_TYPE,
+    DEFAULT_LOG_BODY_LIMIT,
     DEFAULT_USER_AGENT,
     DEVICE_ID_HEADER,
     LOGGER,
+    REDACTED_LOG_KEYS,
 )
 from .exceptions import TNSEApiError
+from .tracing import start_span
+
+if TYPE_CHECKING:
+    from .breaker import TNSECircuitBreaker
+    from .throttle import TNSERateLimiter
+
+JSONLoads = Callable[[bytes], Any]
+
+# Same check as aiohttp.ClientResponse.json()
+_JSON_CONTENT_TYPE = re.compile(r"^application/(?:[\w.+-]+?\+)?json")
+
+
+def _get_default_json_loads() -> JSONLoads:
+    """Return the fastest installed JSON decoder that accepts bytes.
+
+    Decoders must raise ValueError on invalid input.
+    """
+    try:
+        import orjson
+    except ImportError:
+        pass
+    else:
+        return orjson.loads
+
+    try:
+        import msgspec  # type: ignore[import-not-found]
+    except ImportError:
+        return json.loads
+
+    decoder = msgspec.json.Decoder()
+
+    def msgspec_loads(data: bytes) -> Any:
+        try:
+            return decoder.decode(data)
+        except msgspec.DecodeError as err:
+            raise ValueError(str(err)) from err
+
+    return msgspec_loads
+
+
+json_loads: JSONLoads = _get_default_json_loads()
 
 
 def is_valid_account(account: str) -> bool:
@@ -32,6 +82,17 @@ def get_base_url(region: str) -> str:
     return BASE_URL_TEMPLATE.format(region=region)
 
 
+def path_template(path: str) -> str:
+    """Return endpoint template for an API path.
+
+    Numeric path segments (account and counter IDs) are replaced with
+    ``{id}``, e.g. ``counters/10000001/readings`` -> ``counters/{id}/readings``.
+    """
+    return "/".join(
+        "{id}" if segment.isdigit() else segment for segment in path.split("/")
+    )
+
+
 def build_request_headers(region: str, device_id: str) -> dict[str, str]:
     """Build common request headers for the given region and device."""
     credentials = BASIC_AUTH_TEMPLATE.format(region=region)
@@ -45,11 +106,103 @@ def build_request_headers(region: str, device_id: str) -> dict[str, str]:
     }
 
 
+@lru_cache(maxsize=64)
+def get_request_headers(region: str, device_id: str) -> Mapping[str, str]:
+    """Return cached read-only common headers for the given region and device.
+
+    The headers only depend on the region and device ID, so they are built
+    once per pair and shared by all auth instances and public requests.
+    """
+    return MappingProxyType(build_request_headers(region, device_id))
+
+
+@asynccontextmanager
+async def async_open_request(
+    session: aiohttp.ClientSession,
+    method: str,
+    url: str,
+    *,
+    region: str,
+    base_url: str,
+    rate_limiter: TNSERateLimiter | None = None,
+    circuit_breaker: TNSECircuitBreaker | None = None,
+    **kwargs: Any,
+) -> AsyncIterator[aiohttp.ClientResponse]:
+    """Send a request to a regional host within client-side limits.
+
+    The circuit breaker is checked first so requests to a failing host fail
+    fast instead of waiting for a rate limiter slot.
+    """
+    async with AsyncExitStack() as stack:
+        call = (
+            stack.enter_context(circuit_breaker.guard(base_url))
+            if circuit_breaker
+            else None
+        )
+        slot = (
+            await stack.enter_async_context(rate_limiter.async_limit(region))
+            if rate_limiter
+            else None
+        )
+        resp = await stack.enter_async_context(
+            session.request(method, url, **kwargs)
+        )
+        if call:
+            call.record(resp)
+        if slot:
+            slot.record(resp)
+        yield resp
+
+
+def is_auth_failure(status: int | None, content_type: str | None) -> bool:
+    """Return True if a response status means the access token was rejected.
+
+    A 403 rejects the token only with a JSON body; the HTML 403 the server
+    sends when throttling is overload, not an auth failure.
+    """
+    if status not in AUTH_FAILURE_STATUSES:
+        return False
+    return status != 403 or "json" in (content_type or "")
+
+
+def is_json_response(resp: aiohttp.ClientResponse) -> bool:
+    """Return True if the response has a JSON content type."""
+    return _JSON_CONTENT_TYPE.match(resp.content_type) is not None
+
+
+async def async_read_json(
+    resp: aiohttp.ClientResponse, loads: JSONLoads | None = None
+) -> Any:
+    """Read response JSON, decoding straight from bytes.
+
+    Behaves like ``resp.json()``: raises ContentTypeError for non-JSON
+    content types and returns None for an empty body.
+    """
+    if not is_json_response(resp):
+        raise aiohttp.ContentTypeError(
+            resp.request_info,
+            resp.history,
+            status=resp.status,
+            message=f"Attempt to decode JSON with unexpected mimetype: "
+            f"{resp.content_type}",
+            headers=resp.headers,
+        )
+    body = (await resp.read()).strip()
+    if not body:
+        return None
+    # Unknown charsets fall back to UTF-8, as in resp.json()
+    if (encoding := resp.get_encoding()) != "utf-8":
+        body = body.decode(encoding).encode()
+    with start_span("tnse.json_decode", response_size=len(body)):
+        return (loads or json_loads)(body)
+
+
 async def parse_api_response(
     resp: aiohttp.ClientResponse,
     *,
     error_class: type[TNSEApiError] = TNSEApiError,
     default_error: str = "API request failed",
+    loads: JSONLoads | None = None,
 ) -> Any:
     """Parse API response JSON, check for HTTP and API-level errors.
 
@@ -61,12 +214,32 @@ async def parse_api_response(
     request_info = f"{resp.method} {resp.url.path}"
 
     try:
-        data = await resp.json()
-    except (json.JSONDecodeError, aiohttp.ContentTypeError) as err:
+        data = await async_read_json(resp, loads)
+    except (ValueError, aiohttp.ContentTypeError) as err:
         raise error_class(
-            f"{default_error} ({request_info} -> {resp.status})"
+            f"{default_error} ({request_info} -> {resp.status})",
+            status=resp.status,
+            content_type=resp.content_type,
         ) from err
 
+    return unwrap_api_data(
+        resp, data, error_class=error_class, default_error=default_error
+    )
+
+
+def unwrap_api_data(
+    resp: aiohttp.ClientResponse,
+    data: Any,
+    *,
+    error_class: type[TNSEApiError] = TNSEApiError,
+    default_error: str = "API request failed",
+) -> Any:
+    """Check decoded API response for HTTP and API-level errors.
+
+    Return the ``data`` member of the response envelope.
+    """
+    request_info = f"{resp.method} {resp.url.path}"
+
     if not resp.ok:
         error_msg = f"{default_error} ({request_info} -> {resp.status})"
         if isinstance(data, dict):
@@ -78,9 +251,11 @@ async def parse_api_response(
                 "HTTP error: %s -> %d body=%s",
                 request_info,
                 resp.status,
-                data,
+                LogBody(data),
             )
-        raise error_class(error_msg)
+        raise error_class(
+            error_msg, status=resp.status, content_type=resp.content_type
+        )
 
     if isinstance(data, dict) and not data.get("result"):
         error = data.get("error", {})
@@ -89,9 +264,101 @@ async def parse_api_response(
             if isinstance(error, dict)
             else default_error
         )
-        LOGGER.debug("API error: %s body=%s", request_info, data)
-        raise error_class(f"{desc} ({request_info})")
+        LOGGER.debug("API error: %s body=%s", request_info, LogBody(data))
+        raise error_class(
+            f"{desc} ({request_info})",
+            status=resp.status,
+            content_type=resp.content_type,
+        )
 
     if isinstance(data, dict):
         return data.get("data")
     return data
+
+
+def jwt_expiry(token: str) -> float | None:
+    """Return the ``exp`` claim of a JWT as a POSIX timestamp.
+
+    The signature is not verified. Return None if the token is not a JWT
+    or has no numeric ``exp`` claim.
+    """
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        exp = claims["exp"]
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+    if isinstance(exp, bool) or not isinstance(exp, int | float):
+        return None
+    return float(exp)
+
+
+def parse_http_date(value: str | None) -> float | None:
+    """Return an HTTP date header value as a POSIX timestamp, None if invalid."""
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def _iter_log_parts(value: Any, limit: int) -> Iterator[str]:
+    """Yield pieces of the repr of a JSON value with secrets redacted."""
+    if isinstance(value, Mapping):
+        yield "{"
+        for index, (key, item) in enumerate(value.items()):
+            yield f"{', ' if index else ''}{key!r}: "
+            if isinstance(key, str) and key.lower() in REDACTED_LOG_KEYS:
+                yield "'***'"
+            else:
+                yield from _iter_log_parts(item, limit)
+        yield "}"
+    elif isinstance(value, list | tuple):
+        yield "["
+        for index, item in enumerate(value):
+            if index:
+                yield ", "
+            yield from _iter_log_parts(item, limit)
+        yield "]"
+    elif isinstance(value, str):
+        # Long strings (base64 files) are cut before repr() copies them
+        yield repr(value[: limit + 1])
+    else:
+        yield repr(value)
+
+
+def format_log_body(data: Any, limit: int = DEFAULT_LOG_BODY_LIMIT) -> str:
+    """Format a request or response body for logging.
+
+    Values of token and password keys are replaced with ``'***'`` and the
+    result is cut to ``limit`` characters; formatting stops as soon as the
+    limit is reached, so huge payloads are never stringified in full.
+    """
+    parts: list[str] = []
+    size = 0
+    for part in _iter_log_parts(data, limit):
+        parts.append(part)
+        size += len(part)
+        if size > limit:
+            return f"{''.join(parts)[:limit]}... (truncated)"
+    return "".join(parts)
+
+
+class LogBody:
+    """Log record argument formatting a body with format_log_body() lazily.
+
+    Nothing is formatted unless a handler actually emits the record.
+    """
+
+    __slots__ = ("_data", "_limit")
+
+    def __init__(self, data: Any, limit: int = DEFAULT_LOG_BODY_LIMIT) -> None:
+        self._data = data
+        self._limit = limit
+
+    def __str__(self) -> str:
+        """Return the redacted, size-capped body."""
+        return format_log_body(self._data, self._limit)
+
+    __repr__ = __str__
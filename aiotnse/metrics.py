@@ -0,0 +1,191 @@
+"""Request instrumentation and latency histograms for TNS-Energo API."""
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+
+from .const import DEFAULT_LATENCY_BUCKETS
+
+
+@dataclass(slots=True, frozen=True)
+class RequestEvent:
+    """Outcome of a single HTTP request, passed to request hooks.
+
+    ``kind`` is ``api`` for attempts of AbstractTNSEAuth.request() (logout
+    included) and stream_request(), and ``auth`` for login and token
+    refresh calls. ``endpoint`` is the path template
+    (``counters/{id}/readings``), ``duration`` is in seconds including
+    client-side limiter waits, and ``attempt`` counts retries from 0.
+    ``status`` is None if no response was received. ``response_size`` is
+    the Content-Length header, None for chunked responses.
+    """
+
+    kind: str
+    method: str
+    endpoint: str
+    region: str
+    status: int | None
+    duration: float
+    response_size: int | None = None
+    attempt: int = 0
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Return True if the request succeeded."""
+        return self.error is None
+
+
+RequestHook = Callable[[RequestEvent], None]
+
+
+@dataclass(slots=True)
+class LatencyHistogram:
+    """Request latency distribution and counters of one endpoint."""
+
+    bounds: tuple[float, ...]
+    buckets: list[int] = field(default_factory=list)
+    count: int = 0
+    total: float = 0.0
+    errors: int = 0
+    response_bytes: int = 0
+    statuses: dict[str, int] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        """Create buckets, the last one for values above all bounds."""
+        if not self.buckets:
+            self.buckets = [0] * (len(self.bounds) + 1)
+
+    def observe(self, event: RequestEvent) -> None:
+        """Add a request to the histogram."""
+        self.buckets[bisect_left(self.bounds, event.duration)] += 1
+        self.count += 1
+        self.total += event.duration
+        self.response_bytes += event.response_size or 0
+        if event.error is not None:
+            self.errors += 1
+        status = "error" if event.status is None else str(event.status)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def quantile(self, q: float) -> float:
+        """Estimate a latency quantile by interpolating within its bucket."""
+        if not self.count:
+            return float("nan")
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for upper, in_bucket in zip(self.bounds, self.buckets):
+            if in_bucket and seen + in_bucket >= rank:
+                return lower + (upper - lower) * (rank - seen) / in_bucket
+            seen += in_bucket
+            lower = upper
+        # Above the largest bound: the best estimate is the bound itself
+        return self.bounds[-1] if self.bounds else float("nan")
+
+
+def _labels(**labels: str) -> str:
+    """Format Prometheus labels, escaping values."""
+    return ",".join(
+        '{}="{}"'.format(
+            key,
+            value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+        )
+        for key, value in labels.items()
+    )
+
+
+class TNSEMetrics:
+    """In-process aggregator of request events, usable as a request hook.
+
+    Keeps a LatencyHistogram per method, endpoint and region, readable from
+    code and tests via histograms(), and renders them in the Prometheus
+    text exposition format.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> None:
+        self._bounds = tuple(sorted(buckets))
+        self._histograms: dict[tuple[str, str, str], LatencyHistogram] = {}
+
+    def __call__(self, event: RequestEvent) -> None:
+        """Record a request event."""
+        key = (event.method, event.endpoint, event.region)
+        if (histogram := self._histograms.get(key)) is None:
+            histogram = self._histograms[key] = LatencyHistogram(self._bounds)
+        histogram.observe(event)
+
+    def histograms(self) -> dict[tuple[str, str, str], LatencyHistogram]:
+        """Return histograms keyed by (method, endpoint, region)."""
+        return dict(self._histograms)
+
+    def get(
+        self, endpoint: str, *, method: str | None = None, region: str | None = None
+    ) -> LatencyHistogram:
+        """Return a histogram of an endpoint merged over methods and regions."""
+        merged = LatencyHistogram(self._bounds)
+        for (key_method, key_endpoint, key_region), histogram in (
+            self._histograms.items()
+        ):
+            if key_endpoint != endpoint:
+                continue
+            if method is not None and key_method != method:
+                continue
+            if region is not None and key_region != region:
+                continue
+            merged.buckets = [
+                a + b for a, b in zip(merged.buckets, histogram.buckets)
+            ]
+            merged.count += histogram.count
+            merged.total += histogram.total
+            merged.errors += histogram.errors
+            merged.response_bytes += histogram.response_bytes
+            for status, count in histogram.statuses.items():
+                merged.statuses[status] = merged.statuses.get(status, 0) + count
+        return merged
+
+    def reset(self) -> None:
+        """Drop all recorded data."""
+        self._histograms.clear()
+
+    def render_prometheus(self, prefix: str = "tnse") -> str:
+        """Return metrics in the Prometheus text exposition format."""
+        duration = f"{prefix}_request_duration_seconds"
+        requests = f"{prefix}_requests_total"
+        size = f"{prefix}_response_bytes_total"
+        lines = [
+            f"# HELP {duration} TNS-Energo API request latency.",
+            f"# TYPE {duration} histogram",
+        ]
+        for (method, endpoint, region), histogram in self._histograms.items():
+            labels = _labels(method=method, endpoint=endpoint, region=region)
+            cumulative = 0
+            for bound, count in zip(self._bounds, histogram.buckets):
+                cumulative += count
+                lines.append(
+                    f'{duration}_bucket{{{labels},le="{bound:g}"}} {cumulative}'
+                )
+            lines.append(
+                f'{duration}_bucket{{{labels},le="+Inf"}} {histogram.count}'
+            )
+            lines.append(f"{duration}_sum{{{labels}}} {histogram.total}")
+            lines.append(f"{duration}_count{{{labels}}} {histogram.count}")
+
+        lines += [
+            f"# HELP {requests} TNS-Energo API requests by status.",
+            f"# TYPE {requests} counter",
+        ]
+        for (method, endpoint, region), histogram in self._histograms.items():
+            for status, count in histogram.statuses.items():
+                labels = _labels(
+                    method=method, endpoint=endpoint, region=region, status=status
+                )
+                lines.append(f"{requests}{{{labels}}} {count}")
+
+        lines += [
+            f"# HELP {size} TNS-Energo API response body bytes.",
+            f"# TYPE {size} counter",
+        ]
+        for (method, endpoint, region), histogram in self._histograms.items():
+            labels = _labels(method=method, endpoint=endpoint, region=region)
+            lines.append(f"{size}{{{labels}}} {histogram.response_bytes}")
+        return "\n".join(lines) + "\n"
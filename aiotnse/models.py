@@ -0,0 +1,228 @@
+"""Data models for TNS-Energo API.
+
+Typed models are optional: TNSEApi methods return raw API data, which can
+be converted with ``Model.from_dict()``. Numbers sent as strings and
+``dd.mm.yy``/``dd.mm.yyyy`` dates are converted once, at construction.
+"""
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Self
+
+
+@lru_cache(maxsize=4096)
+def parse_date(value: str | None) -> date | None:
+    """Parse an API date (``dd.mm.yy`` or ``dd.mm.yyyy``), None if invalid."""
+    if not value:
+        return None
+    fmt = "%d.%m.%y" if len(value) == 8 else "%d.%m.%Y"
+    try:
+        return datetime.strptime(value, fmt).date()
+    except ValueError:
+        return None
+
+
+def parse_number(value: Any) -> float | None:
+    """Parse an API number that may be sent as a string, None if invalid."""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, int | float):
+        return float(value)
+    try:
+        return float(str(value).replace(" ", "").replace(",", "."))
+    except ValueError:
+        return None
+
+
+class _Model(ABC):
+    """Base of typed models built from API data."""
+
+    __slots__ = ()
+
+    @classmethod
+    @abstractmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> Self:
+        """Create from API data."""
+
+    @classmethod
+    def from_list(cls, items: Iterable[Mapping[str, Any]]) -> list[Self]:
+        """Create from a list of API items."""
+        return [cls.from_dict(item) for item in items]
+
+
+@dataclass(slots=True, frozen=True)
+class Account(_Model):
+    """Personal account of the user."""
+
+    id: int
+    number: str
+    name: str = ""
+    address: str = ""
+    initial_year: int | None = None
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> Self:
+        """Create from an ``accounts`` item."""
+        return cls(
+            id=data["id"],
+            number=data["number"],
+            name=data.get("name") or "",
+            address=data.get("address") or "",
+            initial_year=data.get("initial_year"),
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class Balance(_Model):
+    """Current balance of an account."""
+
+    sum_to_pay: float | None
+    debt: float | None = None
+    peni_debt: float | None = None
+    avans_total: float | None = None
+    closed_month: date | None = None
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> Self:
+        """Create from ``payments/new-balance`` data."""
+        return cls(
+            sum_to_pay=parse_number(data.get("sumToPay")),
+            debt=parse_number(data.get("debt")),
+            peni_debt=parse_number(data.get("peniDebt")),
+            avans_total=parse_number(data.get("avansTotal")),
+            closed_month=parse_date(data.get("closedMonth")),
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class CounterReading(_Model):
+    """Last reading of a counter tariff zone."""
+
+    name: str
+    value: float | None
+    date: date | None
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> Self:
+        """Create from a ``lastReadings`` item."""
+        return cls(
+            name=data.get("name") or "",
+            value=parse_number(data.get("value")),
+            date=parse_date(data.get("date")),
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class Counter(_Model):
+    """Counter (meter) of an account."""
+
+    counter_id: str
+    row_id: str
+    tariff: int | None = None
+    checking_date: date | None = None
+    last_readings: tuple[CounterReading, ...] = ()
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> Self:
+        """Create from a ``counters`` item."""
+        return cls(
+            counter_id=data["counterId"],
+            row_id=data["rowId"],
+            tariff=data.get("tariff"),
+            checking_date=parse_date(data.get("checkingDate")),
+            last_readings=tuple(
+                CounterReading.from_dict(item)
+                for item in data.get("lastReadings") or ()
+            ),
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class Indication(_Model):
+    """Value of a tariff zone in a reading record or history item."""
+
+    title: str
+    value: float | None
+    consumption: float | None = None
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> Self:
+        """Create from a ``readings`` or ``indications`` item."""
+        return cls(
+            title=data.get("title") or "",
+            value=parse_number(data.get("value")),
+            consumption=parse_number(data.get("consumption")),
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class ReadingRecord(_Model):
+    """Readings of a counter taken on a single date."""
+
+    date: date | None
+    readings: tuple[Indication, ...] = ()
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> Self:
+        """Create from a ``counters/{id}/readings`` item."""
+        return cls(
+            date=parse_date(data.get("date")),
+            readings=tuple(
+                Indication.from_dict(item) for item in data.get("readings") or ()
+            ),
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class HistoryItem(_Model):
+    """Payment, readings or invoice entry of the account history."""
+
+    type: int
+    title: str
+    date: date | None
+    description: str = ""
+    amount: float | None = None
+    indications: tuple[Indication, ...] = ()
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> Self:
+        """Create from a ``history`` or ``invoices`` item."""
+        return cls(
+            type=data.get("type", 0),
+            title=data.get("title") or "",
+            date=parse_date(data.get("date")),
+            description=data.get("description") or "",
+            amount=parse_number(data.get("amount")),
+            indications=tuple(
+                Indication.from_dict(item)
+                for item in data.get("indications") or ()
+            ),
+        )
+
+
+@dataclass(slots=True)
+class AccountSnapshot:
+    """Combined account data returned by TNSEApi.async_get_account_snapshot().
+
+    Parts that could not be fetched are None (or missing from ``readings``)
+    and the corresponding errors are collected in ``errors`` keyed by part
+    name: ``information``, ``balance``, ``counters``,
+    ``readings/<counter_id>`` or ``counters/<index>`` for a counter
+    without ``counterId``.
+    """
+
+    account: str
+    information: Any = None
+    balance: Any = None
+    counters: Any = None
+    readings: dict[str, Any] = field(default_factory=dict)
+    errors: dict[str, Exception] = field(default_factory=dict)
+
+    @property
+    def complete(self) -> bool:
+        """Return True if all parts were fetched successfully."""
+        return not self.errors
@@ -0,0 +1,91 @@
+"""Retry policy for transient TNS-Energo API failures."""
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass, field
+
+from aiohttp import ClientError
+
+from .const import (
+    DEFAULT_RETRY_ATTEMPTS,
+    DEFAULT_RETRY_BASE_DELAY,
+    DEFAULT_RETRY_BUDGET_MAX_TOKENS,
+    DEFAULT_RETRY_BUDGET_RATIO,
+    DEFAULT_RETRY_MAX_DELAY,
+    RETRY_STATUSES,
+)
+from .exceptions import TNSEApiError
+
+
+class RetryBudget:
+    """Cap retries to a share of regular requests.
+
+    Every request deposits ``ratio`` tokens and every retry withdraws one,
+    so during an outage retries add at most ``ratio`` extra load instead of
+    multiplying it. Up to ``max_tokens`` are kept for bursts after quiet
+    periods.
+    """
+
+    def __init__(
+        self,
+        *,
+        ratio: float = DEFAULT_RETRY_BUDGET_RATIO,
+        max_tokens: float = DEFAULT_RETRY_BUDGET_MAX_TOKENS,
+    ) -> None:
+        self._ratio = ratio
+        self._max_tokens = max_tokens
+        self._tokens = max_tokens
+
+    @property
+    def tokens(self) -> float:
+        """Return retries currently available."""
+        return self._tokens
+
+    def record_request(self) -> None:
+        """Deposit tokens for a regular request."""
+        self._tokens = min(self._max_tokens, self._tokens + self._ratio)
+
+    def try_withdraw(self) -> bool:
+        """Take a token for a retry, return False if the budget is exhausted."""
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+
+@dataclass(slots=True, frozen=True)
+class RetryPolicy:
+    """Which requests to retry and how long to wait between attempts.
+
+    Only idempotent ``methods`` are retried, on connection errors, timeouts
+    and HTTP ``statuses``, with capped exponential backoff and full jitter.
+    Share one policy (and thus one budget) between all auth instances to
+    enforce a global retry budget.
+    """
+
+    max_attempts: int = DEFAULT_RETRY_ATTEMPTS
+    base_delay: float = DEFAULT_RETRY_BASE_DELAY
+    max_delay: float = DEFAULT_RETRY_MAX_DELAY
+    methods: frozenset[str] = frozenset({"GET"})
+    statuses: frozenset[int] = RETRY_STATUSES
+    budget: RetryBudget = field(default_factory=RetryBudget)
+
+    def is_retryable(self, method: str, err: Exception) -> bool:
+        """Return True if the failed request may be retried."""
+        if method.upper() not in self.methods:
+            return False
+        if isinstance(err, TNSEApiError):
+            return err.status in self.statuses
+        return isinstance(err, (ClientError, TimeoutError))
+
+    def should_retry(self, method: str, err: Exception, attempt: int) -> bool:
+        """Return True if a retry is allowed after the given failed attempt."""
+        return (
+            attempt + 1 < self.max_attempts
+            and self.is_retryable(method, err)
+            and self.budget.try_withdraw()
+        )
+
+    def backoff(self, attempt: int) -> float:
+        """Return delay before the retry following the given attempt."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
@@ -0,0 +1,88 @@
+"""Client session tuned for regional TNS-Energo hosts."""
+from __future__ import annotations
+
+import asyncio
+import ssl
+from collections.abc import Iterable
+from functools import lru_cache
+from typing import Any
+
+from aiohttp import ClientError, ClientSession, TCPConnector
+
+from .api import async_check_version
+from .const import (
+    DEFAULT_CONNECTION_LIMIT,
+    DEFAULT_CONNECTION_LIMIT_PER_HOST,
+    DEFAULT_DNS_CACHE_TTL,
+    DEFAULT_KEEPALIVE_TIMEOUT,
+    LOGGER,
+)
+from .exceptions import TNSEApiError
+
+
+@lru_cache(maxsize=1)
+def get_ssl_context() -> ssl.SSLContext:
+    """Return the TLS context shared by all sessions.
+
+    Loading the CA bundle is done once instead of per session.
+    """
+    return ssl.create_default_context()
+
+
+def create_session(
+    *,
+    limit: int = DEFAULT_CONNECTION_LIMIT,
+    limit_per_host: int = DEFAULT_CONNECTION_LIMIT_PER_HOST,
+    keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT,
+    ttl_dns_cache: int = DEFAULT_DNS_CACHE_TTL,
+    **kwargs: Any,
+) -> ClientSession:
+    """Create a ClientSession with a connector tuned for the API.
+
+    Every region is a separate host: connections are capped per host so a
+    busy region cannot starve the others, idle connections are kept alive
+    between polls to avoid repeated TCP and TLS handshakes, and DNS answers
+    are cached. Extra keyword arguments are passed to ClientSession.
+    """
+    connector = TCPConnector(
+        limit=limit,
+        limit_per_host=limit_per_host,
+        keepalive_timeout=keepalive_timeout,
+        ttl_dns_cache=ttl_dns_cache,
+        ssl=get_ssl_context(),
+    )
+    return ClientSession(connector=connector, **kwargs)
+
+
+async def async_warm_up(
+    session: ClientSession,
+    regions: Iterable[str],
+    *,
+    connections: int = 1,
+) -> dict[str, Exception | None]:
+    """Open connections to regional hosts ahead of the first poll.
+
+    Sends ``connections`` concurrent lightweight public requests to every
+    region, resolving DNS and completing TLS handshakes so the connections
+    stay in the pool for later requests. Failures do not raise; the result
+    maps every region to its first error, or None.
+    """
+    regions = list(dict.fromkeys(regions))
+    results = await asyncio.gather(
+        *(
+            async_check_version(session, region)
+            for region in regions
+            for _ in range(connections)
+        ),
+        return_exceptions=True,
+    )
+    errors: dict[str, Exception | None] = dict.fromkeys(regions)
+    for index, result in enumerate(results):
+        region = regions[index // connections]
+        if isinstance(result, (TNSEApiError, ClientError, TimeoutError)):
+            LOGGER.debug("Warm-up of %s failed: %r", region, result)
+            if errors[region] is None:
+                errors[region] = result
+        elif isinstance(result, BaseException):
+            raise result
+    return errors
@@ -0,0 +1,181 @@
+"""Streaming decoding of base64 files embedded in API responses."""
+from __future__ import annotations
+
+import asyncio
+import inspect
+import os
+import re
+import uuid
+from base64 import b64decode
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from typing import IO, Any, Protocol
+
+import aiohttp
+
+from .const import DEFAULT_STREAM_CHUNK_SIZE
+from .exceptions import TNSEApiError
+from .helpers import (
+    is_json_response,
+    json_loads,
+    parse_api_response,
+    unwrap_api_data,
+)
+
+# JSON escapes that may appear inside a base64 string value
+_UNESCAPE = ((b"\\/", b"/"), (b"\\n", b""), (b"\\r", b""))
+
+
+class AsyncWriter(Protocol):
+    """Object with an async ``write()``, such as an aiofiles file."""
+
+    async def write(self, data: bytes, /) -> Any:
+        """Write bytes."""
+
+
+class Base64FieldDecoder:
+    """Incrementally decode a base64 string field of a JSON document.
+
+    Chunks of the document are passed to feed(), which returns decoded
+    bytes of the field as soon as they arrive. Only the JSON around the
+    field and less than one base64 quantum are buffered, so memory stays
+    bounded regardless of the field size.
+    """
+
+    def __init__(self, field: str) -> None:
+        self._pattern = re.compile(rb'"%s"\s*:\s*"' % re.escape(field.encode()))
+        self._head = bytearray()
+        self._tail = bytearray()
+        self._pending = b""
+        self._state = "head"
+
+    @property
+    def found(self) -> bool:
+        """Return True if the field was found and read completely."""
+        return self._state == "tail"
+
+    @property
+    def envelope(self) -> bytes:
+        """Return the document with the field value replaced by ``""``."""
+        if self._state == "head":
+            return bytes(self._head)
+        return bytes(self._head + b'"' + self._tail)
+
+    def feed(self, chunk: bytes) -> bytes:
+        """Consume a chunk of the document and return decoded field bytes."""
+        if self._state == "tail":
+            self._tail += chunk
+            return b""
+        if self._state == "head":
+            self._head += chunk
+            if (match := self._pattern.search(self._head)) is None:
+                return b""
+            chunk = bytes(self._head[match.end() :])
+            del self._head[match.end() :]
+            self._state = "value"
+
+        data = self._pending + chunk
+        escape = b""
+        if (end := data.find(b'"')) >= 0:
+            self._tail += data[end + 1 :]
+            self._state = "tail"
+            data = data[:end]
+        elif data.endswith(b"\\"):
+            # Keep an escape sequence split between chunks for the next one
+            data, escape = data[:-1], b"\\"
+
+        for escaped, value in _UNESCAPE:
+            data = data.replace(escaped, value)
+        if self._state == "tail":
+            self._pending = b""
+            return b64decode(data, validate=True)
+        usable = len(data) // 4 * 4
+        self._pending = data[usable:] + escape
+        return b64decode(data[:usable], validate=True)
+
+    def close(self) -> None:
+        """Check that the document ended after a complete field value."""
+        if self._state == "value":
+            raise ValueError("Unterminated base64 field")
+
+
+@asynccontextmanager
+async def async_open_writer(
+    file: str | os.PathLike[str] | IO[bytes] | AsyncWriter,
+) -> AsyncIterator[Callable[[bytes], Awaitable[Any]]]:
+    """Return an async write function for a path, binary file or async writer.
+
+    Data for a path is written to a temporary file next to it, which
+    replaces the path only if the block exits without an error, so a failed
+    download never leaves a truncated or partial file. Writes to it run in
+    a worker thread.
+    """
+    if isinstance(file, str | os.PathLike):
+        path = os.fspath(file)
+        tmp_path = f"{path}.{uuid.uuid4().hex[:8]}.part"
+        handle = await asyncio.to_thread(open, tmp_path, "xb")
+        try:
+            yield lambda data: asyncio.to_thread(handle.write, data)
+        except BaseException:
+            await asyncio.to_thread(handle.close)
+            await asyncio.to_thread(os.unlink, tmp_path)
+            raise
+        await asyncio.to_thread(handle.close)
+        await asyncio.to_thread(os.replace, tmp_path, path)
+    elif inspect.iscoroutinefunction(file.write):
+        yield file.write
+    else:
+
+        async def write(data: bytes) -> Any:
+            return file.write(data)
+
+        yield write
+
+
+async def async_check_stream_response(resp: aiohttp.ClientResponse) -> None:
+    """Raise TNSEApiError for an error response before its body is streamed.
+
+    Error responses are small: they are read and parsed as usual.
+    """
+    if not resp.ok or not is_json_response(resp):
+        await parse_api_response(resp)
+
+
+async def async_read_base64_field(
+    resp: aiohttp.ClientResponse,
+    field: str,
+    write: Callable[[bytes], Awaitable[Any]],
+    *,
+    chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+) -> int:
+    """Stream a base64 field of an API response to ``write``.
+
+    Raise TNSEApiError like parse_api_response() for HTTP and API-level
+    errors, invalid JSON or base64 (a ValueError subclass), and a missing
+    field. Return the number of decoded bytes.
+    """
+    await async_check_stream_response(resp)
+
+    request_info = f"{resp.method} {resp.url.path}"
+    decoder = Base64FieldDecoder(field)
+    size = 0
+    try:
+        async for chunk in resp.content.iter_chunked(chunk_size):
+            if data := decoder.feed(chunk):
+                await write(data)
+                size += len(data)
+        decoder.close()
+        body = decoder.envelope.strip()
+        envelope = json_loads(body) if body else None
+    except ValueError as err:
+        raise TNSEApiError(
+            f"API request failed ({request_info} -> {resp.status})",
+            status=resp.status,
+        ) from err
+
+    data = unwrap_api_data(resp, envelope)
+    if not decoder.found or not isinstance(data, dict) or field not in data:
+        raise TNSEApiError(
+            f"Field '{field}' not found ({request_info})", status=resp.status
+        )
+    return size
@@ -0,0 +1,162 @@
+"""Client-side rate limiting for TNS-Energo API."""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import defaultdict
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+
+import aiohttp
+
+from .const import (
+    DEFAULT_RATE_LIMIT,
+    DEFAULT_RATE_LIMIT_BURST,
+    DEFAULT_RATE_LIMIT_CONCURRENCY,
+    DEFAULT_RATE_LIMIT_LATENCY,
+    LOGGER,
+    THROTTLE_STATUSES,
+)
+
+
+def is_throttled_response(resp: aiohttp.ClientResponse) -> bool:
+    """Return True if the response looks like server-side throttling.
+
+    Besides 429/5xx, the API answers overload with HTTP 403 and an HTML
+    body, unlike a JSON 403 for rejected tokens.
+    """
+    if resp.status in THROTTLE_STATUSES:
+        return True
+    return resp.status == 403 and "json" not in resp.content_type
+
+
+class TokenBucket:
+    """Token bucket allowing ``rate`` requests per second with bursts."""
+
+    def __init__(self, rate: float, burst: float) -> None:
+        self._rate = rate
+        self._burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+
+    async def async_acquire(self) -> None:
+        """Take a token, waiting for the bucket to refill if needed."""
+        now = time.monotonic()
+        self._tokens = min(
+            self._burst, self._tokens + (now - self._updated) * self._rate
+        )
+        self._updated = now
+        # Reserve the token up front so concurrent waiters queue up fairly.
+        self._tokens -= 1
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens / self._rate)
+
+
+@dataclass(slots=True)
+class RateLimitSlot:
+    """Permission to send one request, used to report its outcome."""
+
+    started: float
+    throttled: bool = False
+
+    def record(self, resp: aiohttp.ClientResponse) -> None:
+        """Record the response of the request."""
+        self.throttled = is_throttled_response(resp)
+
+
+class AdaptiveConcurrencyLimit:
+    """Concurrency limit adjusted with additive increase/multiplicative decrease.
+
+    Every request answered quickly raises the limit by ``1 / limit`` (about
+    +1 per round of requests); a throttled or slow request halves it,
+    at most once per round so one burst of errors counts as one signal.
+    """
+
+    def __init__(
+        self,
+        max_limit: int,
+        *,
+        min_limit: int = 1,
+        latency_threshold: float = DEFAULT_RATE_LIMIT_LATENCY,
+        backoff: float = 0.5,
+    ) -> None:
+        self.limit = float(max_limit)
+        self.in_flight = 0
+        self._min_limit = min_limit
+        self._max_limit = max_limit
+        self._latency_threshold = latency_threshold
+        self._backoff = backoff
+        self._last_decrease = 0.0
+        self._condition = asyncio.Condition()
+
+    async def async_acquire(self) -> None:
+        """Wait for a free concurrency slot."""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def async_release(self, slot: RateLimitSlot) -> None:
+        """Release a slot and adapt the limit to the request outcome."""
+        now = time.monotonic()
+        if slot.throttled or now - slot.started > self._latency_threshold:
+            if slot.started >= self._last_decrease:
+                self.limit = max(self._min_limit, self.limit * self._backoff)
+                self._last_decrease = now
+                LOGGER.debug("Concurrency limit decreased to %d", int(self.limit))
+        else:
+            self.limit = min(self._max_limit, self.limit + 1 / self.limit)
+
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+
+class TNSERateLimiter:
+    """Per-region token bucket and adaptive concurrency limit.
+
+    Every region is served by its own host, so each region gets its own
+    bucket of ``rate`` requests per second (bursts up to ``burst``) and up
+    to ``max_concurrency`` requests in flight, shrinking on throttling.
+    """
+
+    def __init__(
+        self,
+        *,
+        rate: float = DEFAULT_RATE_LIMIT,
+        burst: float = DEFAULT_RATE_LIMIT_BURST,
+        max_concurrency: int = DEFAULT_RATE_LIMIT_CONCURRENCY,
+        min_concurrency: int = 1,
+        latency_threshold: float = DEFAULT_RATE_LIMIT_LATENCY,
+    ) -> None:
+        self._buckets: defaultdict[str, TokenBucket] = defaultdict(
+            lambda: TokenBucket(rate, burst)
+        )
+        self._limits: defaultdict[str, AdaptiveConcurrencyLimit] = defaultdict(
+            lambda: AdaptiveConcurrencyLimit(
+                max_concurrency,
+                min_limit=min_concurrency,
+                latency_threshold=latency_threshold,
+            )
+        )
+
+    def concurrency_limits(self) -> dict[str, int]:
+        """Return current concurrency limit by region."""
+        return {region: int(limit.limit) for region, limit in self._limits.items()}
+
+    @asynccontextmanager
+    async def async_limit(self, region: str) -> AsyncIterator[RateLimitSlot]:
+        """Wait for permission to send a request to the region host."""
+        limit = self._limits[region]
+        await limit.async_acquire()
+        slot = RateLimitSlot(time.monotonic())
+        try:
+            await self._buckets[region].async_acquire()
+            slot.started = time.monotonic()
+            yield slot
+        except (aiohttp.ClientError, TimeoutError):
+            # Connection errors and timeouts signal an overloaded host too
+            slot.throttled = True
+            raise
+        finally:
+            await limit.async_release(slot)
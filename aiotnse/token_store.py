@@ -0,0 +1,300 @@
+"""Token stores shared by processes logging in as the same user."""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from typing import Any
+
+from .const import (
+    DEFAULT_TOKEN_STORE_LOCK_POLL_INTERVAL,
+    DEFAULT_TOKEN_STORE_LOCK_TIMEOUT,
+    LOGGER,
+)
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore[assignment]
+    import msvcrt
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tokens (
+    key TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS token_locks (
+    key TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires REAL NOT NULL
+);
+"""
+
+
+def _lock_file(fd: int, blocking: bool) -> bool:
+    """Lock an open file exclusively, return False if it is locked."""
+    try:
+        if fcntl is not None:
+            flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+            fcntl.flock(fd, flags)
+        else:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+    except OSError:
+        if blocking:
+            raise
+        return False
+    return True
+
+
+def _unlock_file(fd: int) -> None:
+    """Unlock a file locked with _lock_file()."""
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+async def _async_poll(
+    acquire: Callable[[], Awaitable[bool]], timeout: float, interval: float
+) -> None:
+    """Call acquire until it returns True, raise TimeoutError after timeout."""
+    async with asyncio.timeout(timeout):
+        while not await acquire():
+            await asyncio.sleep(interval)
+
+
+class AbstractTokenStore(ABC):
+    """Storage of tokens shared by processes logging in as the same user.
+
+    Token data is the dict passed to ``token_update_callback``. lock()
+    holds an exclusive lock across processes, so only one of them renews
+    the tokens of a key while the others wait and then reuse the result.
+    """
+
+    def __init__(
+        self,
+        *,
+        lock_timeout: float = DEFAULT_TOKEN_STORE_LOCK_TIMEOUT,
+        poll_interval: float = DEFAULT_TOKEN_STORE_LOCK_POLL_INTERVAL,
+    ) -> None:
+        self._lock_timeout = lock_timeout
+        self._poll_interval = poll_interval
+        # Tasks of this process queue up here instead of polling the lock
+        self._local_locks: defaultdict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+    @abstractmethod
+    async def async_load(self, key: str) -> dict[str, Any] | None:
+        """Return stored token data of the key."""
+
+    @abstractmethod
+    async def async_save(self, key: str, data: dict[str, Any]) -> None:
+        """Store token data of the key."""
+
+    @abstractmethod
+    async def async_delete(self, key: str) -> None:
+        """Remove token data of the key."""
+
+    @abstractmethod
+    def _lock(self, key: str) -> AbstractAsyncContextManager[None]:
+        """Hold the cross-process lock of the key."""
+
+    @asynccontextmanager
+    async def lock(self, key: str) -> AsyncIterator[None]:
+        """Hold the exclusive lock of the key for renewing its tokens.
+
+        Raise TimeoutError if the lock is not acquired in ``lock_timeout``
+        seconds.
+        """
+        async with self._local_locks[key], self._lock(key):
+            yield
+
+
+class JSONFileTokenStore(AbstractTokenStore):
+    """Keep tokens of all keys in a JSON file, guarded by file locks.
+
+    The file is replaced atomically and readable by the owner only. Every
+    key gets its own ``.lock`` file next to it for lock(); file locks are
+    released by the OS when a process dies.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        *,
+        lock_timeout: float = DEFAULT_TOKEN_STORE_LOCK_TIMEOUT,
+        poll_interval: float = DEFAULT_TOKEN_STORE_LOCK_POLL_INTERVAL,
+    ) -> None:
+        super().__init__(lock_timeout=lock_timeout, poll_interval=poll_interval)
+        self._path = os.fspath(path)
+
+    def _read(self) -> dict[str, Any]:
+        """Read the token file."""
+        try:
+            with open(self._path, encoding="utf-8") as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return {}
+        except ValueError:
+            LOGGER.warning("Ignoring corrupt token file %s", self._path)
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _write(self, data: dict[str, Any]) -> None:
+        """Replace the token file atomically."""
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(self._path) or ".", prefix=".tokens-"
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(data, file)
+            os.replace(tmp_path, self._path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _update(self, key: str, value: dict[str, Any] | None) -> None:
+        """Set or remove token data of a key under the file lock."""
+        fd = os.open(f"{self._path}.lock", os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            _lock_file(fd, blocking=True)
+            data = self._read()
+            if value is None:
+                data.pop(key, None)
+            else:
+                data[key] = value
+            self._write(data)
+        finally:
+            os.close(fd)
+
+    async def async_load(self, key: str) -> dict[str, Any] | None:
+        """Return stored token data of the key."""
+        return (await asyncio.to_thread(self._read)).get(key)
+
+    async def async_save(self, key: str, data: dict[str, Any]) -> None:
+        """Store token data of the key."""
+        await asyncio.to_thread(self._update, key, data)
+
+    async def async_delete(self, key: str) -> None:
+        """Remove token data of the key."""
+        await asyncio.to_thread(self._update, key, None)
+
+    @asynccontextmanager
+    async def _lock(self, key: str) -> AsyncIterator[None]:
+        """Hold the file lock of the key."""
+        digest = hashlib.sha256(key.encode()).hexdigest()[:16]
+        fd = os.open(f"{self._path}.{digest}.lock", os.O_RDWR | os.O_CREAT, 0o600)
+
+        async def try_lock() -> bool:
+            return _lock_file(fd, blocking=False)
+
+        try:
+            await _async_poll(try_lock, self._lock_timeout, self._poll_interval)
+            try:
+                yield
+            finally:
+                _unlock_file(fd)
+        finally:
+            os.close(fd)
+
+
+class SQLiteTokenStore(AbstractTokenStore):
+    """Keep tokens in an SQLite database shared by processes.
+
+    The database is readable by the owner only. lock() takes a lease in
+    the ``token_locks`` table; a lease left by a crashed process expires
+    after ``lock_timeout`` seconds.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        *,
+        lock_timeout: float = DEFAULT_TOKEN_STORE_LOCK_TIMEOUT,
+        poll_interval: float = DEFAULT_TOKEN_STORE_LOCK_POLL_INTERVAL,
+    ) -> None:
+        super().__init__(lock_timeout=lock_timeout, poll_interval=poll_interval)
+        self._lock_thread = threading.Lock()
+        if os.fspath(path) != ":memory:":
+            # Created before sqlite3 does it with umask permissions
+            os.close(os.open(path, os.O_RDWR | os.O_CREAT, 0o600))
+            os.chmod(path, 0o600)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock_thread, self._conn:
+            self._conn.executescript(_SCHEMA)
+
+    def _execute(self, sql: str, params: tuple[Any, ...]) -> sqlite3.Cursor:
+        """Execute a statement in its own transaction."""
+        with self._lock_thread, self._conn:
+            return self._conn.execute(sql, params)
+
+    def _load(self, key: str) -> dict[str, Any] | None:
+        """Read token data of a key."""
+        row = self._execute("SELECT data FROM tokens WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _try_acquire(self, key: str, owner: str) -> bool:
+        """Take the lease of a key unless another owner holds it."""
+        now = time.time()
+        cursor = self._execute(
+            "INSERT INTO token_locks (key, owner, expires) VALUES (?, ?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET "
+            "owner = excluded.owner, expires = excluded.expires "
+            "WHERE token_locks.expires < ?",
+            (key, owner, now + self._lock_timeout, now),
+        )
+        return cursor.rowcount == 1
+
+    async def async_load(self, key: str) -> dict[str, Any] | None:
+        """Return stored token data of the key."""
+        return await asyncio.to_thread(self._load, key)
+
+    async def async_save(self, key: str, data: dict[str, Any]) -> None:
+        """Store token data of the key."""
+        await asyncio.to_thread(
+            self._execute,
+            "INSERT OR REPLACE INTO tokens (key, data) VALUES (?, ?)",
+            (key, json.dumps(data)),
+        )
+
+    async def async_delete(self, key: str) -> None:
+        """Remove token data of the key."""
+        await asyncio.to_thread(
+            self._execute, "DELETE FROM tokens WHERE key = ?", (key,)
+        )
+
+    @asynccontextmanager
+    async def _lock(self, key: str) -> AsyncIterator[None]:
+        """Hold the lease of the key."""
+        owner = f"{os.getpid()}:{uuid.uuid4().hex}"
+        try:
+            await _async_poll(
+                lambda: asyncio.to_thread(self._try_acquire, key, owner),
+                self._lock_timeout,
+                self._poll_interval,
+            )
+            yield
+        finally:
+            # Also runs on timeout or cancellation, in case the lease was
+            # taken by an attempt still running in the worker thread
+            await asyncio.to_thread(
+                self._execute,
+                "DELETE FROM token_locks WHERE key = ? AND owner = ?",
+                (key, owner),
+            )
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock_thread:
+            self._conn.close()
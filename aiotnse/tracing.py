@@ -0,0 +1,61 @@
+"""Optional OpenTelemetry tracing of TNS-Energo API calls."""
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+try:
+    from opentelemetry import trace
+except ImportError:
+    trace = None  # type: ignore[assignment]
+
+TRACER_NAME = "aiotnse"
+
+_tracer = trace.get_tracer(TRACER_NAME) if trace is not None else None
+
+
+class _NoOpSpan:
+    """Stand-in span used when OpenTelemetry is not installed."""
+
+    __slots__ = ()
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Ignore the attribute."""
+
+
+_NOOP_SPAN = _NoOpSpan()
+
+
+@contextmanager
+def start_span(
+    name: str,
+    *,
+    region: str | None = None,
+    endpoint: str | None = None,
+    client: bool = False,
+    **attributes: Any,
+) -> Iterator[Any]:
+    """Run the block in a span named ``name``, yielding the span.
+
+    Spans carry ``tnse.region`` and ``tnse.endpoint`` attributes, extra
+    keyword attributes are prefixed with ``tnse.``. Without OpenTelemetry
+    the span is a no-op; with the API but no configured SDK it is not
+    recorded.
+    """
+    if _tracer is None:
+        yield _NOOP_SPAN
+        return
+    span_attributes: dict[str, Any] = {}
+    if region is not None:
+        span_attributes["tnse.region"] = region
+    if endpoint is not None:
+        span_attributes["tnse.endpoint"] = endpoint
+    for key, value in attributes.items():
+        span_attributes[f"tnse.{key}"] = value
+    with _tracer.start_as_current_span(
+        name,
+        kind=trace.SpanKind.CLIENT if client else trace.SpanKind.INTERNAL,
+        attributes=span_attributes,
+    ) as span:
+        yield span
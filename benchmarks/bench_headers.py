@@ -0,0 +1,52 @@
+"""Micro-benchmark for per-request header construction.
+
+Compares building the common headers from scratch on every request with the
+cached per-region headers, including the dict merge that
+``AbstractTNSEAuth.request`` performs for every call.
+
+Run from the repo root:
+
+    python -m benchmarks.bench_headers
+"""
+
+from __future__ import annotations
+
+import timeit
+
+from aiotnse.const import BEARER_HEADER, DEVICE_ID
+from aiotnse.helpers import build_request_headers, get_request_headers
+
+REGION = "rostov"
+NUMBER = 200_000
+
+
+def _uncached() -> dict[str, str]:
+    """Build headers the way every request used to."""
+    headers = {**{}, **build_request_headers(REGION, DEVICE_ID)}
+    headers[BEARER_HEADER] = "Bearer token"
+    return headers
+
+
+def _cached() -> dict[str, str]:
+    """Build headers from the cached per-region template."""
+    headers = {**{}, **get_request_headers(REGION, DEVICE_ID)}
+    headers[BEARER_HEADER] = "Bearer token"
+    return headers
+
+
+def main() -> None:
+    """Run the benchmark and print per-call timings."""
+    results = {}
+    for name, func in (("uncached", _uncached), ("cached", _cached)):
+        best = min(timeit.repeat(func, number=NUMBER, repeat=5))
+        results[name] = best / NUMBER * 1e9
+        print(f"{name:>9}: {results[name]:8.1f} ns/request")
+    saved = results["uncached"] - results["cached"]
+    print(
+        f"    saved: {saved:8.1f} ns/request "
+        f"({results['uncached'] / results['cached']:.1f}x faster)"
+    )
+
+
+if __name__ == "__main__":
+    main()
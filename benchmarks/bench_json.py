@@ -0,0 +1,76 @@
+"""Micro-benchmark for API response JSON decoding.
+
+Compares the ``resp.json()`` path (decode the body to ``str``, then parse it
+with stdlib ``json``) with decoding straight from bytes using every
+installed decoder, over the ``tests/fixtures`` payloads. Payloads are
+repeated to approximate large history and readings responses.
+
+Run from the repo root:
+
+    python -m benchmarks.bench_json
+"""
+
+from __future__ import annotations
+
+import json
+import timeit
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+FIXTURES_DIR = Path(__file__).parent.parent / "tests" / "fixtures"
+NUMBER = 200
+REPEAT = 50
+
+
+def _load_payloads() -> list[bytes]:
+    """Build large payloads out of every fixture."""
+    payloads = []
+    for path in sorted(FIXTURES_DIR.glob("*.json")):
+        data = json.loads(path.read_bytes())
+        payloads.append(json.dumps([data] * REPEAT, ensure_ascii=False).encode())
+    return payloads
+
+
+def _decoders() -> dict[str, Callable[[bytes], Any]]:
+    """Return every available decoder by name."""
+    decoders: dict[str, Callable[[bytes], Any]] = {
+        "resp.json": lambda body: json.loads(body.decode("utf-8")),
+        "json bytes": json.loads,
+    }
+    try:
+        import orjson
+    except ImportError:
+        pass
+    else:
+        decoders["orjson"] = orjson.loads
+    try:
+        import msgspec
+    except ImportError:
+        pass
+    else:
+        decoders["msgspec"] = msgspec.json.Decoder().decode
+    return decoders
+
+
+def main() -> None:
+    """Run the benchmark and print per-payload timings."""
+    payloads = _load_payloads()
+    size = sum(len(payload) for payload in payloads) / len(payloads)
+    print(f"{len(payloads)} payloads, {size / 1024:.1f} KiB on average")
+
+    results = {}
+    for name, loads in _decoders().items():
+
+        def run(loads: Callable[[bytes], Any] = loads) -> None:
+            for payload in payloads:
+                loads(payload)
+
+        best = min(timeit.repeat(run, number=NUMBER, repeat=5))
+        results[name] = best / NUMBER / len(payloads) * 1e6
+        speedup = results["resp.json"] / results[name]
+        print(f"{name:>10}: {results[name]:8.1f} us/payload ({speedup:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+"""End-to-end benchmark of request throughput and tail latency.
+
+Runs TNSEApi and SimpleTNSEAuth against ``tests/fake_server.py`` started in
+a separate process, so the numbers below cover the client only:
+
+- requests per second and p50/p99 request latency (from request hooks);
+- CPU time per request and p99 event-loop lag (a 1 ms ticker's overshoot);
+- allocations per request: tracemalloc peak growth during a shorter traced
+  pass, divided by the number of requests in flight.
+
+Scenarios:
+
+- ``single``: one account polled sequentially (readings history);
+- ``fanout``: snapshots of many accounts of one user fetched concurrently;
+- ``refresh-storm``: the server revokes the access token and many
+  concurrent requests are rejected with 401 at once.
+
+Results are saved as JSON, and ``--compare`` prints the change against a
+previous run. Run from the repo root:
+
+    python -m benchmarks.bench_requests
+    python -m benchmarks.bench_requests --compare benchmarks/results/<file>.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import re
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import aiohttp
+
+from aiotnse import RequestEvent, SimpleTNSEAuth, TNSEApi, create_session
+from aiotnse.helpers import json_loads
+from tests.common import EMAIL, PASSWORD, REGION
+
+RESULTS_DIR = Path(__file__).parent / "results"
+LOOP_TICK = 0.001
+
+Scenario = Callable[[TNSEApi, "FakeServerProcess", int], Awaitable[None]]
+
+
+@dataclass(slots=True)
+class ScenarioResult:
+    """Measurements of one scenario."""
+
+    name: str
+    requests: int
+    seconds: float
+    rps: float
+    p50_ms: float
+    p99_ms: float
+    cpu_ms_per_request: float
+    loop_lag_p99_ms: float
+    alloc_kib_per_request: float
+    auth_requests: int
+
+
+class FakeServerProcess:
+    """Fake TNS-Energo server running in a child process."""
+
+    def __init__(self, session: aiohttp.ClientSession, url: str) -> None:
+        self.session = session
+        self.url = url
+
+    async def async_expire_access_tokens(self) -> None:
+        """Revoke all access tokens issued by the server."""
+        async with self.session.post(f"{self.url}/_fake/expire-access-tokens"):
+            pass
+
+
+@asynccontextmanager
+async def async_start_server(
+    args: argparse.Namespace,
+) -> AsyncIterator[FakeServerProcess]:
+    """Start the fake server process and wait until it listens."""
+    process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-m",
+        "tests.fake_server",
+        "--port",
+        "0",
+        "--accounts",
+        str(args.accounts),
+        "--latency",
+        str(args.latency),
+        stdout=asyncio.subprocess.PIPE,
+    )
+    try:
+        assert process.stdout is not None
+        line = (await process.stdout.readline()).decode()
+        if (match := re.search(r"http://\S+", line)) is None:
+            raise RuntimeError(f"Fake server failed to start: {line!r}")
+        async with aiohttp.ClientSession() as session:
+            yield FakeServerProcess(session, match.group())
+    finally:
+        process.terminate()
+        await process.wait()
+
+
+async def _single(api: TNSEApi, server: FakeServerProcess, rounds: int) -> None:
+    """Poll readings of one counter sequentially."""
+    for _ in range(rounds):
+        await api.async_get_counter_readings("10000001", "610000000001")
+
+
+async def _fanout(api: TNSEApi, server: FakeServerProcess, rounds: int) -> None:
+    """Fetch snapshots of all accounts concurrently."""
+    accounts = await api.async_get_accounts()
+    for _ in range(rounds):
+        await asyncio.gather(
+            *(api.async_get_account_snapshot(a["number"]) for a in accounts)
+        )
+
+
+def _refresh_storm(size: int) -> Scenario:
+    """Return a scenario sending ``size`` requests with a revoked token."""
+
+    async def storm(api: TNSEApi, server: FakeServerProcess, rounds: int) -> None:
+        for _ in range(rounds):
+            await server.async_expire_access_tokens()
+            await asyncio.gather(*(api.async_get_user_info() for _ in range(size)))
+
+    return storm
+
+
+async def _async_monitor_loop(lags: list[float]) -> None:
+    """Record how late a periodic 1 ms tick wakes up."""
+    while True:
+        started = time.perf_counter()
+        await asyncio.sleep(LOOP_TICK)
+        lags.append(time.perf_counter() - started - LOOP_TICK)
+
+
+def _percentile(values: list[float], q: float) -> float:
+    """Return a percentile of values (nearest rank)."""
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def async_run_scenario(
+    name: str,
+    scenario: Scenario,
+    server: FakeServerProcess,
+    *,
+    rounds: int,
+    in_flight: int,
+) -> ScenarioResult:
+    """Warm up, then measure a scenario."""
+    durations: list[float] = []
+    auth_requests = 0
+
+    def hook(event: RequestEvent) -> None:
+        nonlocal auth_requests
+        if event.kind == "api":
+            durations.append(event.duration)
+        else:
+            auth_requests += 1
+
+    async with create_session() as session:
+        auth = SimpleTNSEAuth(
+            session,
+            region=REGION,
+            email=EMAIL,
+            password=PASSWORD,
+            base_url=server.url,
+            request_hooks=[hook],
+        )
+        api = TNSEApi(auth)
+        await auth.async_login()
+        await scenario(api, server, max(rounds // 10, 1))
+
+        durations.clear()
+        auth_requests = 0
+        lags: list[float] = []
+        monitor = asyncio.create_task(_async_monitor_loop(lags))
+        cpu_started = time.process_time()
+        started = time.perf_counter()
+        await scenario(api, server, rounds)
+        seconds = time.perf_counter() - started
+        cpu = time.process_time() - cpu_started
+        monitor.cancel()
+        requests = len(durations)
+        measured_auth_requests = auth_requests
+
+        traced_rounds = max(rounds // 10, 1)
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+        await scenario(api, server, traced_rounds)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return ScenarioResult(
+        name=name,
+        requests=requests,
+        seconds=seconds,
+        rps=requests / seconds,
+        p50_ms=_percentile(durations, 0.5) * 1000,
+        p99_ms=_percentile(durations, 0.99) * 1000,
+        cpu_ms_per_request=cpu / requests * 1000,
+        loop_lag_p99_ms=_percentile(lags, 0.99) * 1000,
+        alloc_kib_per_request=(peak - baseline) / in_flight / 1024,
+        auth_requests=measured_auth_requests,
+    )
+
+
+def _metadata(args: argparse.Namespace) -> dict[str, Any]:
+    """Describe the environment of the run."""
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        revision = "unknown"
+    return {
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "revision": revision,
+        "python": platform.python_version(),
+        "aiohttp": aiohttp.__version__,
+        "json": json_loads.__module__,
+        "accounts": args.accounts,
+        "latency": args.latency,
+        "rounds": args.rounds,
+    }
+
+
+def _print_results(
+    results: list[ScenarioResult], previous: dict[str, dict[str, Any]]
+) -> None:
+    """Print a table of results with changes against a previous run."""
+    columns = (
+        ("rps", "req/s"),
+        ("p50_ms", "p50 ms"),
+        ("p99_ms", "p99 ms"),
+        ("cpu_ms_per_request", "cpu ms/req"),
+        ("loop_lag_p99_ms", "lag p99 ms"),
+        ("alloc_kib_per_request", "KiB/req"),
+    )
+    print(f"{'scenario':>14} " + " ".join(f"{title:>16}" for _, title in columns))
+    for result in results:
+        row = []
+        for key, _ in columns:
+            value = getattr(result, key)
+            cell = f"{value:.2f}"
+            if (old := previous.get(result.name, {}).get(key)) is not None and old:
+                cell += f" ({(value - old) / old:+.0%})"
+            row.append(f"{cell:>16}")
+        print(f"{result.name:>14} " + " ".join(row))
+        print(
+            f"{'':>14} {result.requests} requests in {result.seconds:.2f}s, "
+            f"{result.auth_requests} auth requests"
+        )
+
+
+async def async_main(args: argparse.Namespace) -> list[ScenarioResult]:
+    """Run all scenarios."""
+    scenarios: list[tuple[str, Scenario, int, int]] = [
+        ("single", _single, args.rounds, 1),
+        ("fanout", _fanout, max(args.rounds // args.accounts, 1), args.accounts),
+        (
+            "refresh-storm",
+            _refresh_storm(args.storm),
+            max(args.rounds // args.storm, 1),
+            args.storm,
+        ),
+    ]
+    results = []
+    async with async_start_server(args) as server:
+        for name, scenario, rounds, in_flight in scenarios:
+            if args.scenario and name not in args.scenario:
+                continue
+            results.append(
+                await async_run_scenario(
+                    name, scenario, server, rounds=rounds, in_flight=in_flight
+                )
+            )
+    return results
+
+
+def main() -> None:
+    """Run the benchmark, print and save the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=1000)
+    parser.add_argument("--accounts", type=int, default=20)
+    parser.add_argument("--storm", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument(
+        "--scenario", action="append", choices=("single", "fanout", "refresh-storm")
+    )
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--compare", type=Path, default=None)
+    args = parser.parse_args()
+
+    previous = {}
+    if args.compare is not None:
+        data = json.loads(args.compare.read_text(encoding="utf-8"))
+        previous = {result["name"]: result for result in data["results"]}
+
+    results = asyncio.run(async_main(args))
+    _print_results(results, previous)
+
+    output = args.output
+    if output is None:
+        RESULTS_DIR.mkdir(exist_ok=True)
+        output = RESULTS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.write_text(
+        json.dumps(
+            {"meta": _metadata(args), "results": [asdict(r) for r in results]},
+            indent=2,
+        ),
+        encoding="utf-8",
+    )
+    print(f"Results saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,8 @@
 from __future__ import annotations
 
 import json
+from base64 import urlsafe_b64encode
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any
 
@@ -22,6 +24,23 @@ def load_fixture(name: str) -> dict[str, Any]:
         return json.load(f)
 
 
+def make_jwt(exp: float) -> str:
+    """Build an unsigned JWT with an ``exp`` claim."""
+    return ".".join(
+        urlsafe_b64encode(part).rstrip(b"=").decode()
+        for part in (b'{"alg":"none"}', json.dumps({"exp": exp}).encode(), b"")
+    )
+
+
+def token_payload(access_token: str, *, login: bool = False) -> dict[str, Any]:
+    """Build an auth response with tokens that expire in the future."""
+    expires = (datetime.now() + timedelta(hours=1)).isoformat(" ", "seconds")
+    data = {"accessToken": access_token, "accessTokenExpires": expires}
+    if login:
+        data |= {"refreshToken": REFRESH_TOKEN, "refreshTokenExpires": expires}
+    return {"result": True, "statusCode": 200, "data": data}
+
+
 @pytest_asyncio.fixture
 async def auth() -> SimpleTNSEAuth:
     """Create a SimpleTNSEAuth instance with test tokens."""
@@ -0,0 +1,541 @@
+"""Local fake TNS-Energo API server for load tests and benchmarks.
+
+Serves every endpoint of ``docs/API.md`` over real sockets on localhost,
+with payloads built from ``tests/fixtures``, so TNSEApi and SimpleTNSEAuth
+can be exercised end to end including connection pooling and parsing.
+Latency, error injection, token expiry and throttling are configurable.
+
+Run standalone from the repo root:
+
+    python -m tests.fake_server --port 8080 --latency 0.05 --accounts 10
+
+and point the client at it with ``SimpleTNSEAuth(..., base_url=server.url)``.
+A server in another process is controlled with ``POST /_fake/<action>``,
+where action is ``expire-access-tokens`` or ``expire-refresh-tokens``.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import copy
+import json
+import random
+import secrets
+import time
+from base64 import b64encode, urlsafe_b64encode
+from collections import Counter, defaultdict, deque
+from collections.abc import Awaitable, Callable
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from aiohttp import web
+
+from aiotnse.const import BEARER_HEADER, DEFAULT_API_PATH
+from tests.common import EMAIL, PASSWORD
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+# Endpoints answered without a Bearer token
+PUBLIC_ENDPOINTS = frozenset(
+    {"app/version", "contacts/regions", "user/auth", "user/refresh-token"}
+)
+
+MONTHS = (
+    "Январь",
+    "Февраль",
+    "Март",
+    "Апрель",
+    "Май",
+    "Июнь",
+    "Июль",
+    "Август",
+    "Сентябрь",
+    "Октябрь",
+    "Ноябрь",
+    "Декабрь",
+)
+
+Handler = Callable[[web.Request], Awaitable[web.StreamResponse]]
+
+
+@lru_cache
+def _fixture_data(name: str) -> Any:
+    """Return the ``data`` member of a fixture response.
+
+    The result is shared between calls and must not be modified.
+    """
+    return json.loads((FIXTURES_DIR / f"{name}_response.json").read_bytes())["data"]
+
+
+def _ok(data: Any) -> web.Response:
+    """Return a successful API response."""
+    return web.json_response({"result": True, "statusCode": 200, "data": data})
+
+
+def _error(status: int, description: str, kind: str = "PROVIDER_ERROR") -> web.Response:
+    """Return an API error response."""
+    return web.json_response(
+        {
+            "result": False,
+            "statusCode": status,
+            "error": {"type": kind, "description": description},
+        },
+        status=status,
+    )
+
+
+def _months_back(start: date, count: int) -> list[date]:
+    """Return ``count`` first days of months going back from ``start``."""
+    year, month = start.year, start.month
+    months = []
+    for _ in range(count):
+        months.append(date(year, month, 1))
+        year, month = (year - 1, 12) if month == 1 else (year, month - 1)
+    return months
+
+
+class FakeTNSEServer:
+    """aiohttp server imitating the TNS-Energo mobile API.
+
+    ``accounts`` accounts with one two-zone counter each are served to
+    ``email``/``password``; readings history is ``readings_months`` long and
+    invoice files are ``invoice_size`` bytes. Every request waits
+    ``latency`` plus up to ``jitter`` seconds and fails with
+    ``error_status`` with probability ``error_rate``. Access tokens expire
+    after ``access_token_ttl`` seconds. With ``rate_limit`` set, requests
+    above ``rate_limit`` per second (bursts up to ``burst``) are throttled
+    like the real server does: HTTP 403 with an HTML body.
+    """
+
+    def __init__(
+        self,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        email: str = EMAIL,
+        password: str = PASSWORD,
+        accounts: int = 2,
+        readings_months: int = 24,
+        invoice_size: int = 64 * 1024,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        access_token_ttl: float = 3600.0,
+        refresh_token_ttl: float = 30 * 86400.0,
+        rate_limit: float | None = None,
+        burst: float | None = None,
+        seed: int | None = 0,
+    ) -> None:
+        self.url = ""
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.access_token_ttl = access_token_ttl
+        self.refresh_token_ttl = refresh_token_ttl
+        self.requests: Counter[str] = Counter()
+        self._host = host
+        self._port = port
+        self._email = email
+        self._password = password
+        self._random = random.Random(seed)
+        self._rate_limit = rate_limit
+        self._burst = burst if burst is not None else rate_limit or 0.0
+        self._bucket = self._burst
+        self._bucket_updated = time.monotonic()
+        self._failures: defaultdict[str, deque[int]] = defaultdict(deque)
+        self._access_tokens: dict[str, float] = {}
+        self._refresh_tokens: dict[str, float] = {}
+        self._runner: web.AppRunner | None = None
+        self._build_payloads(accounts, readings_months, invoice_size)
+
+    def _build_payloads(
+        self, accounts: int, readings_months: int, invoice_size: int
+    ) -> None:
+        """Generate payloads of all accounts from the fixtures."""
+        account_template = _fixture_data("accounts")[0]
+        info_template = _fixture_data("account_info")
+        counter_template = _fixture_data("counters")[0]
+        self.accounts: list[dict[str, Any]] = []
+        self._account_info: dict[int, Any] = {}
+        self._counters: dict[str, Any] = {}
+        self._readings: dict[tuple[str, str], Any] = {}
+        for index in range(accounts):
+            number = f"61{index + 1:010d}"
+            counter_id = f"{10000001 + index}"
+            account = account_template | {"id": 100001 + index, "number": number}
+            self.accounts.append(account)
+            self._account_info[account["id"]] = info_template | {
+                "id": account["id"],
+                "number": number,
+                "countersInfo": [
+                    info_template["countersInfo"][0] | {"number": counter_id}
+                ],
+            }
+            counter = copy.deepcopy(counter_template)
+            counter["counterId"] = counter_id
+            counter["rowId"] = f"{2000001 + index}"
+            self._counters[number] = [counter]
+            self._readings[(number, counter_id)] = self._build_readings(
+                counter_id, readings_months
+            )
+        self._invoice_file = {
+            "file": b64encode(
+                b"%PDF-1.5\n" + self._random.randbytes(max(invoice_size - 9, 0))
+            ).decode()
+        }
+
+    def _build_readings(self, counter_id: str, months: int) -> list[dict[str, Any]]:
+        """Generate monthly two-zone readings, newest first."""
+        day, night = 1000 + months * 160, 500 + months * 80
+        readings = []
+        for month in _months_back(date.today(), months):
+            day_usage = self._random.randint(80, 160)
+            night_usage = self._random.randint(40, 80)
+            readings.append(
+                {
+                    "date": month.replace(day=24).strftime("%d.%m.%y"),
+                    "readings": [
+                        {
+                            "title": f"День ПУ {counter_id}",
+                            "value": day,
+                            "consumption": day_usage,
+                        },
+                        {
+                            "title": f"Ночь ПУ {counter_id}",
+                            "value": night,
+                            "consumption": night_usage,
+                        },
+                    ],
+                }
+            )
+            day -= day_usage
+            night -= night_usage
+        return readings
+
+    def fail_next(self, endpoint: str, status: int = 503, count: int = 1) -> None:
+        """Fail the next ``count`` requests to the endpoint with ``status``.
+
+        ``endpoint`` is the path template, e.g. ``accounts/{account_id}``.
+        """
+        self._failures[endpoint].extend([status] * count)
+
+    def expire_access_tokens(self) -> None:
+        """Expire all access tokens, as if revoked server-side."""
+        self._access_tokens.clear()
+
+    def expire_refresh_tokens(self) -> None:
+        """Expire all refresh tokens, forcing clients to log in again."""
+        self._refresh_tokens.clear()
+
+    async def __aenter__(self) -> FakeTNSEServer:
+        """Start the server."""
+        await self.async_start()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Stop the server."""
+        await self.async_stop()
+
+    async def async_start(self) -> None:
+        """Start listening; the address is available as ``url``."""
+        self._runner = web.AppRunner(self._build_app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self._host, self._port)
+        await site.start()
+        host, port = self._runner.addresses[0][:2]
+        self.url = f"http://{host}:{port}"
+
+    async def async_stop(self) -> None:
+        """Stop the server."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def _build_app(self) -> web.Application:
+        """Create the application with all API routes."""
+        app = web.Application(middlewares=[self._middleware])
+        prefix = f"/{DEFAULT_API_PATH}"
+        app.router.add_routes(
+            [
+                web.get(f"{prefix}/app/version", self._handle_version),
+                web.get(f"{prefix}/contacts/regions", self._handle_regions),
+                web.post(f"{prefix}/user/auth", self._handle_login),
+                web.post(f"{prefix}/user/refresh-token", self._handle_refresh),
+                web.post(f"{prefix}/user/logout", self._handle_logout),
+                web.get(f"{prefix}/user", self._handle_user),
+                web.get(f"{prefix}/accounts", self._handle_accounts),
+                web.get(f"{prefix}/accounts/{{account_id}}", self._handle_account),
+                web.get(f"{prefix}/main-page/debt/info", self._handle_debt_info),
+                web.get(f"{prefix}/information", self._handle_information),
+                web.get(f"{prefix}/counters", self._handle_counters),
+                web.get(
+                    f"{prefix}/counters/{{counter_id}}/readings",
+                    self._handle_readings,
+                ),
+                web.post(
+                    f"{prefix}/counters/send-readings", self._handle_send_readings
+                ),
+                web.get(f"{prefix}/payments/new-balance", self._handle_balance),
+                web.get(f"{prefix}/invoices/settings", self._handle_invoice_settings),
+                web.get(f"{prefix}/invoices", self._handle_invoices),
+                web.get(f"{prefix}/invoices/get-file", self._handle_invoice_file),
+                web.get(f"{prefix}/history", self._handle_history),
+                web.post("/_fake/{action}", self._handle_control),
+            ]
+        )
+        return app
+
+    def _take_rate_token(self) -> bool:
+        """Take a token from the rate limit bucket, return False if empty."""
+        if self._rate_limit is None:
+            return True
+        now = time.monotonic()
+        self._bucket = min(
+            self._burst, self._bucket + (now - self._bucket_updated) * self._rate_limit
+        )
+        self._bucket_updated = now
+        if self._bucket < 1:
+            return False
+        self._bucket -= 1
+        return True
+
+    @web.middleware
+    async def _middleware(
+        self, request: web.Request, handler: Handler
+    ) -> web.StreamResponse:
+        """Apply throttling, latency, error injection and authorization."""
+        resource = request.match_info.route.resource
+        if resource is None:
+            return _error(404, "Not found")
+        if resource.canonical.startswith("/_fake/"):
+            return await handler(request)
+        endpoint = resource.canonical.removeprefix(f"/{DEFAULT_API_PATH}/")
+        self.requests[f"{request.method} {endpoint}"] += 1
+
+        if not self._take_rate_token():
+            return web.Response(
+                status=403,
+                text="<html><body><h1>403 Forbidden</h1></body></html>",
+                content_type="text/html",
+            )
+        if delay := self.latency + self._random.uniform(0, self.jitter):
+            await asyncio.sleep(delay)
+        if failures := self._failures.get(endpoint):
+            return _error(failures.popleft(), "Injected failure", "SERVER_ERROR")
+        if self.error_rate and self._random.random() < self.error_rate:
+            return _error(self.error_status, "Injected failure", "SERVER_ERROR")
+
+        if endpoint not in PUBLIC_ENDPOINTS:
+            token = request.headers.get(BEARER_HEADER, "").removeprefix("Bearer ")
+            expires = self._access_tokens.get(token)
+            if expires is None or expires < time.monotonic():
+                return _error(401, "Unauthorized", "AUTH_ERROR")
+        return await handler(request)
+
+    def _issue_token(self, tokens: dict[str, float], ttl: float) -> tuple[str, str]:
+        """Issue a JWT, return it with its expiration time string."""
+        claims = {"exp": int(time.time() + ttl), "jti": secrets.token_hex(8)}
+        token = ".".join(
+            urlsafe_b64encode(part).rstrip(b"=").decode()
+            for part in (
+                b'{"alg":"HS256","typ":"JWT"}',
+                json.dumps(claims).encode(),
+                secrets.token_bytes(32),
+            )
+        )
+        tokens[token] = time.monotonic() + ttl
+        expires = datetime.now() + timedelta(seconds=ttl)
+        return token, expires.isoformat(" ", "seconds")
+
+    def _account(self, request: web.Request) -> str | None:
+        """Return the ``account`` query parameter if the account exists."""
+        number = request.query.get("account")
+        if number not in self._counters:
+            return None
+        return number
+
+    async def _handle_control(self, request: web.Request) -> web.Response:
+        actions = {
+            "expire-access-tokens": self.expire_access_tokens,
+            "expire-refresh-tokens": self.expire_refresh_tokens,
+        }
+        if (action := actions.get(request.match_info["action"])) is None:
+            return _error(404, "Unknown action")
+        action()
+        return _ok([])
+
+    async def _handle_version(self, request: web.Request) -> web.Response:
+        return _ok(_fixture_data("app_version"))
+
+    async def _handle_regions(self, request: web.Request) -> web.Response:
+        return _ok(_fixture_data("regions"))
+
+    async def _handle_login(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        if body.get("login") != self._email or body.get("password") != self._password:
+            return _error(400, "Неверный логин или пароль.")
+        access_token, access_expires = self._issue_token(
+            self._access_tokens, self.access_token_ttl
+        )
+        refresh_token, refresh_expires = self._issue_token(
+            self._refresh_tokens, self.refresh_token_ttl
+        )
+        return _ok(
+            {
+                "accessTokenExpires": access_expires,
+                "accessToken": access_token,
+                "refreshTokenExpires": refresh_expires,
+                "refreshToken": refresh_token,
+            }
+        )
+
+    async def _handle_refresh(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        expires = self._refresh_tokens.get(body.get("refreshToken", ""))
+        if expires is None or expires < time.monotonic():
+            return _error(401, "Refresh token expired", "AUTH_ERROR")
+        access_token, access_expires = self._issue_token(
+            self._access_tokens, self.access_token_ttl
+        )
+        return _ok(
+            {"accessTokenExpires": access_expires, "accessToken": access_token}
+        )
+
+    async def _handle_logout(self, request: web.Request) -> web.Response:
+        token = request.headers.get(BEARER_HEADER, "").removeprefix("Bearer ")
+        self._access_tokens.pop(token, None)
+        return _ok([])
+
+    async def _handle_user(self, request: web.Request) -> web.Response:
+        return _ok(_fixture_data("user_info") | {"email": self._email})
+
+    async def _handle_accounts(self, request: web.Request) -> web.Response:
+        return _ok(self.accounts)
+
+    async def _handle_account(self, request: web.Request) -> web.Response:
+        try:
+            info = self._account_info.get(int(request.match_info["account_id"]))
+        except ValueError:
+            info = None
+        if info is None:
+            return _error(404, "Лицевой счет не найден")
+        return _ok(info)
+
+    async def _handle_debt_info(self, request: web.Request) -> web.Response:
+        return _ok(_fixture_data("main_page_debt"))
+
+    async def _handle_information(self, request: web.Request) -> web.Response:
+        if self._account(request) is None:
+            return _error(400, "Лицевой счет не найден")
+        return _ok(_fixture_data("information"))
+
+    async def _handle_counters(self, request: web.Request) -> web.Response:
+        if (account := self._account(request)) is None:
+            return _error(400, "Лицевой счет не найден")
+        return _ok(self._counters[account])
+
+    async def _handle_readings(self, request: web.Request) -> web.Response:
+        key = (request.query.get("account", ""), request.match_info["counter_id"])
+        if (readings := self._readings.get(key)) is None:
+            return _error(400, "Прибор учета не найден")
+        return _ok(readings)
+
+    async def _handle_send_readings(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        if body.get("account") not in self._counters:
+            return _error(400, "Лицевой счет не найден")
+        return _ok(_fixture_data("send_readings"))
+
+    async def _handle_balance(self, request: web.Request) -> web.Response:
+        if self._account(request) is None:
+            return _error(400, "Лицевой счет не найден")
+        return _ok(_fixture_data("balance"))
+
+    async def _handle_invoice_settings(self, request: web.Request) -> web.Response:
+        if self._account(request) is None:
+            return _error(400, "Лицевой счет не найден")
+        return _ok(_fixture_data("invoice_settings"))
+
+    async def _handle_invoices(self, request: web.Request) -> web.Response:
+        if (account := self._account(request)) is None:
+            return _error(400, "Лицевой счет не найден")
+        year = int(request.query.get("year", date.today().year))
+        template = _fixture_data("invoices")[0]
+        return _ok(
+            [
+                template
+                | {
+                    "title": f"Квитанция за {MONTHS[month - 1]} {year}",
+                    "date": f"01.{month:02d}.{year}",
+                    "description": f"Лицевой счет {account}",
+                }
+                for month in range(12, 0, -1)
+                if date(year, month, 1) <= date.today()
+            ]
+        )
+
+    async def _handle_invoice_file(self, request: web.Request) -> web.Response:
+        if self._account(request) is None:
+            return _error(400, "Лицевой счет не найден")
+        return _ok(self._invoice_file)
+
+    async def _handle_history(self, request: web.Request) -> web.Response:
+        if (account := self._account(request)) is None:
+            return _error(400, "Лицевой счет не найден")
+        history = copy.deepcopy(_fixture_data("history"))
+        today = date.today()
+        year = int(request.query.get("year", today.year))
+        month = int(request.query.get("month", today.month))
+        suffix = f"{month:02d}.{year % 100:02d}"
+        for item in history["items"]:
+            item["date"] = f"{item['date'][:2]}.{suffix}"
+            if item["type"] == 1:
+                item["title"] = f"Платеж от {item['date']}"
+                item["description"] = f"Лицевой счет {account}"
+        return _ok(history)
+
+
+async def _async_serve(args: argparse.Namespace) -> None:
+    """Run the server until interrupted."""
+    async with FakeTNSEServer(
+        host=args.host,
+        port=args.port,
+        accounts=args.accounts,
+        readings_months=args.readings_months,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        access_token_ttl=args.token_ttl,
+        rate_limit=args.rate_limit,
+    ) as server:
+        print(
+            f"Fake TNS-Energo API at {server.url} ({EMAIL} / {PASSWORD})",
+            flush=True,
+        )
+        await asyncio.Event().wait()
+
+
+def main() -> None:
+    """Parse arguments and run the server."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--accounts", type=int, default=2)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--token-ttl", type=float, default=3600.0)
+    parser.add_argument("--rate-limit", type=float, default=None)
+    parser.add_argument("--readings-months", type=int, default=24)
+    try:
+        asyncio.run(_async_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
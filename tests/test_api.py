@@ -1,11 +1,14 @@
 """Tests for aiotnse API module."""
 from __future__ import annotations
 
+import asyncio
+from typing import Any
+
 import aiohttp
 import pytest
-from aioresponses import aioresponses
+from aioresponses import CallbackResult, aioresponses
 
-from aiotnse import TNSEApi
+from aiotnse import SimpleTNSEAuth, TNSEApi
 from aiotnse.api import async_check_version, async_get_regions
 from aiotnse.const import DEFAULT_APP_VERSION
 from aiotnse.exceptions import RequiredApiParamNotFound, TNSEApiError
@@ -230,3 +233,179 @@ class TestTNSEApi:
         assert "filters" in data
         assert "items" in data
         assert len(data["items"]) > 0
+
+
+class TestAccountSnapshot:
+    def _mock_snapshot(
+        self,
+        session_mock: aioresponses,
+        balance_status: int = 200,
+        counters: dict[str, Any] | None = None,
+    ) -> None:
+        session_mock.get(
+            f"{API_URL}/information?account={ACCOUNT}",
+            payload=load_fixture("information_response.json"),
+            headers=HEADERS,
+        )
+        if balance_status == 200:
+            session_mock.get(
+                f"{API_URL}/payments/new-balance?account={ACCOUNT}",
+                payload=load_fixture("balance_response.json"),
+                headers=HEADERS,
+            )
+        else:
+            session_mock.get(
+                f"{API_URL}/payments/new-balance?account={ACCOUNT}",
+                status=balance_status,
+            )
+        session_mock.get(
+            f"{API_URL}/counters?account={ACCOUNT}",
+            payload=counters or load_fixture("counters_response.json"),
+            headers=HEADERS,
+        )
+        session_mock.get(
+            f"{API_URL}/counters/{COUNTER_ID}/readings?account={ACCOUNT}",
+            payload=load_fixture("counter_readings_response.json"),
+            headers=HEADERS,
+        )
+
+    async def test_snapshot(self, api: TNSEApi, session_mock: aioresponses) -> None:
+        self._mock_snapshot(session_mock)
+        snapshot = await api.async_get_account_snapshot(ACCOUNT)
+
+        assert snapshot.complete
+        assert snapshot.account == ACCOUNT
+        assert snapshot.information == []
+        assert snapshot.balance["sumToPay"] == 1500.5
+        assert snapshot.counters[0]["counterId"] == COUNTER_ID
+        assert len(snapshot.readings[COUNTER_ID]) > 0
+
+    async def test_snapshot_partial_failure(
+        self, api: TNSEApi, session_mock: aioresponses
+    ) -> None:
+        self._mock_snapshot(session_mock, balance_status=500)
+        snapshot = await api.async_get_account_snapshot(ACCOUNT)
+
+        assert not snapshot.complete
+        assert snapshot.balance is None
+        assert isinstance(snapshot.errors["balance"], TNSEApiError)
+        assert list(snapshot.errors) == ["balance"]
+        assert COUNTER_ID in snapshot.readings
+
+    async def test_snapshot_counter_without_id(
+        self, api: TNSEApi, session_mock: aioresponses
+    ) -> None:
+        counters = load_fixture("counters_response.json")
+        counters["data"].insert(0, {"name": "broken"})
+        self._mock_snapshot(session_mock, counters=counters)
+        snapshot = await api.async_get_account_snapshot(ACCOUNT)
+
+        assert list(snapshot.errors) == ["counters/0"]
+        assert isinstance(snapshot.errors["counters/0"], RequiredApiParamNotFound)
+        assert COUNTER_ID in snapshot.readings
+
+    async def test_snapshot_counters_failure(
+        self, api: TNSEApi, session_mock: aioresponses
+    ) -> None:
+        session_mock.get(
+            f"{API_URL}/information?account={ACCOUNT}",
+            payload=load_fixture("information_response.json"),
+            headers=HEADERS,
+        )
+        session_mock.get(
+            f"{API_URL}/payments/new-balance?account={ACCOUNT}",
+            payload=load_fixture("balance_response.json"),
+            headers=HEADERS,
+        )
+        session_mock.get(f"{API_URL}/counters?account={ACCOUNT}", status=503)
+        snapshot = await api.async_get_account_snapshot(ACCOUNT)
+
+        assert set(snapshot.errors) == {"counters"}
+        assert snapshot.counters is None
+        assert snapshot.readings == {}
+
+    async def test_snapshot_timeout(
+        self, api: TNSEApi, session_mock: aioresponses
+    ) -> None:
+        self._mock_snapshot(session_mock)
+
+        async def slow_balance(account: str) -> None:
+            await asyncio.sleep(1)
+
+        api.async_get_balance = slow_balance  # type: ignore[method-assign]
+        snapshot = await api.async_get_account_snapshot(ACCOUNT, timeout=0.05)
+
+        assert isinstance(snapshot.errors["balance"], TimeoutError)
+        assert snapshot.information == []
+        assert COUNTER_ID in snapshot.readings
+
+
+class TestRequestCoalescing:
+    async def test_concurrent_calls_share_request(
+        self, auth: SimpleTNSEAuth, session_mock: aioresponses
+    ) -> None:
+        api = TNSEApi(auth, coalesce=True)
+        session_mock.get(
+            f"{API_URL}/payments/new-balance?account={ACCOUNT}",
+            payload=load_fixture("balance_response.json"),
+            headers=HEADERS,
+        )
+        results = await asyncio.gather(
+            *(api.async_get_balance(ACCOUNT) for _ in range(5))
+        )
+
+        assert all(result is results[0] for result in results)
+        assert len(session_mock.requests) == 1
+
+    async def test_sequential_calls_not_shared(
+        self, auth: SimpleTNSEAuth, session_mock: aioresponses
+    ) -> None:
+        api = TNSEApi(auth, coalesce=True)
+        session_mock.get(
+            f"{API_URL}/counters?account={ACCOUNT}",
+            payload=load_fixture("counters_response.json"),
+            headers=HEADERS,
+            repeat=True,
+        )
+        await api.async_get_counters(ACCOUNT)
+        await api.async_get_counters(ACCOUNT)
+
+        calls = next(iter(session_mock.requests.values()))
+        assert len(calls) == 2
+
+    async def test_error_shared_by_all_callers(
+        self, auth: SimpleTNSEAuth, session_mock: aioresponses
+    ) -> None:
+        api = TNSEApi(auth, coalesce=True)
+        session_mock.get(f"{API_URL}/counters?account={ACCOUNT}", status=503)
+        results = await asyncio.gather(
+            api.async_get_counters(ACCOUNT),
+            api.async_get_counters(ACCOUNT),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(result, TNSEApiError) for result in results)
+
+    async def test_cancelled_caller_does_not_cancel_others(
+        self, auth: SimpleTNSEAuth, session_mock: aioresponses
+    ) -> None:
+        api = TNSEApi(auth, coalesce=True)
+        release = asyncio.Event()
+
+        async def slow_counters(url: object, **kwargs: object) -> CallbackResult:
+            await release.wait()
+            return CallbackResult(
+                payload=load_fixture("counters_response.json"), headers=HEADERS
+            )
+
+        session_mock.get(
+            f"{API_URL}/counters?account={ACCOUNT}", callback=slow_counters
+        )
+        first = asyncio.create_task(api.async_get_counters(ACCOUNT))
+        second = asyncio.create_task(api.async_get_counters(ACCOUNT))
+        await asyncio.sleep(0)
+        first.cancel()
+        release.set()
+
+        assert (await second)[0]["counterId"] == COUNTER_ID
+        assert first.cancelled()
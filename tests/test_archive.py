@@ -0,0 +1,113 @@
+"""Tests for aiotnse archive module."""
+from __future__ import annotations
+
+from datetime import date
+from pathlib import Path
+
+import pytest
+from aioresponses import aioresponses
+
+from aiotnse import SimpleTNSEAuth, TNSEApi, TNSEArchive
+from tests.common import ACCOUNT, API_URL, HEADERS
+from tests.conftest import load_fixture
+
+TODAY = date.today()
+
+
+@pytest.fixture
+def archive(tmp_path: Path) -> TNSEArchive:
+    """Create an archive in a temporary directory."""
+    with TNSEArchive(tmp_path / "archive.db") as archive:
+        yield archive
+
+
+class TestClosedPeriod:
+    def test_is_closed_period(self, archive: TNSEArchive) -> None:
+        today = date(2026, 3, 15)
+        assert archive.is_closed_period(2026, 3, today) is False
+        assert archive.is_closed_period(2026, 2, today) is False
+        assert archive.is_closed_period(2026, 1, today) is True
+        assert archive.is_closed_period(2025, 12, today) is True
+
+    def test_lag_months(self, tmp_path: Path) -> None:
+        today = date(2026, 3, 15)
+        with TNSEArchive(tmp_path / "archive.db", lag_months=0) as archive:
+            assert archive.is_closed_period(2026, 3, today) is False
+            assert archive.is_closed_period(2026, 2, today) is True
+
+    def test_is_closed_date(self, archive: TNSEArchive) -> None:
+        today = date(2026, 3, 15)
+        assert archive.is_closed_date("01.01.2026", today) is True
+        assert archive.is_closed_date("01.02.2026", today) is False
+        assert archive.is_closed_date("not a date", today) is False
+
+
+class TestTNSEArchive:
+    async def test_roundtrip(self, tmp_path: Path) -> None:
+        payload = load_fixture("history_response.json")["data"]
+        params = {"account": ACCOUNT, "year": 2025, "month": 1}
+        with TNSEArchive(tmp_path / "archive.db") as archive:
+            assert await archive.async_get("rostov", "history", params) is None
+            await archive.async_put("rostov", "history", params, payload)
+
+        with TNSEArchive(tmp_path / "archive.db") as archive:
+            assert await archive.async_get("rostov", "history", params) == payload
+            assert await archive.async_get("penza", "history", params) is None
+
+
+class TestTNSEApiArchive:
+    async def test_closed_history_archived(
+        self, auth: SimpleTNSEAuth, archive: TNSEArchive, session_mock: aioresponses
+    ) -> None:
+        session_mock.get(
+            f"{API_URL}/history?account={ACCOUNT}&year=2025&month=1",
+            payload=load_fixture("history_response.json"),
+            headers=HEADERS,
+        )
+        api = TNSEApi(auth, archive=archive)
+        first = await api.async_get_history(ACCOUNT, 2025, 1)
+        second = await api.async_get_history(ACCOUNT, 2025, 1)
+
+        assert first == second
+        assert len(session_mock.requests) == 1
+
+    async def test_current_history_not_archived(
+        self, auth: SimpleTNSEAuth, archive: TNSEArchive, session_mock: aioresponses
+    ) -> None:
+        url = (
+            f"{API_URL}/history?account={ACCOUNT}"
+            f"&year={TODAY.year}&month={TODAY.month}"
+        )
+        session_mock.get(
+            url, payload=load_fixture("history_response.json"), headers=HEADERS
+        )
+        session_mock.get(
+            url, payload=load_fixture("history_response.json"), headers=HEADERS
+        )
+        api = TNSEApi(auth, archive=archive)
+        await api.async_get_history(ACCOUNT, TODAY.year, TODAY.month)
+        await api.async_get_history(ACCOUNT, TODAY.year, TODAY.month)
+
+        assert sum(len(calls) for calls in session_mock.requests.values()) == 2
+
+    async def test_past_invoices_archived(
+        self, auth: SimpleTNSEAuth, archive: TNSEArchive, session_mock: aioresponses
+    ) -> None:
+        session_mock.get(
+            f"{API_URL}/invoices?account={ACCOUNT}&year=2020",
+            payload=load_fixture("invoices_response.json"),
+            headers=HEADERS,
+        )
+        session_mock.get(
+            f"{API_URL}/invoices/get-file?account={ACCOUNT}&date=01.01.2020",
+            payload=load_fixture("invoice_file_response.json"),
+            headers=HEADERS,
+        )
+        api = TNSEApi(auth, archive=archive)
+        for _ in range(2):
+            invoices = await api.async_get_invoices(ACCOUNT, 2020)
+            invoice = await api.async_get_invoice_file(ACCOUNT, "01.01.2020")
+
+        assert invoices[0]["date"] == "01.01.2026"
+        assert invoice["file"]
+        assert len(session_mock.requests) == 2
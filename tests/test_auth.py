@@ -1,17 +1,25 @@
 """Tests for aiotnse auth module."""
 from __future__ import annotations
 
+import asyncio
+import logging
+import time
 from base64 import b64encode
-from datetime import datetime, timedelta
-from unittest.mock import MagicMock
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime, timedelta, timezone
+from email.utils import format_datetime
+from threading import get_ident
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
 
 import aiohttp
 import pytest
 import pytest_asyncio
-from aioresponses import aioresponses
+from aioresponses import CallbackResult, aioresponses
+from yarl import URL
 
 from aiotnse import SimpleTNSEAuth
-from aiotnse.const import DEVICE_ID, _DEVICE_IDS
+from aiotnse.const import BEARER_HEADER, DEVICE_ID, _DEVICE_IDS
 from aiotnse.exceptions import TNSEApiError, TNSEAuthError, TNSETokenRefreshError
 from tests.common import (
     ACCESS_TOKEN,
@@ -24,7 +32,7 @@ from tests.common import (
     REFRESH_TOKEN_EXPIRES,
     REGION,
 )
-from tests.conftest import load_fixture
+from tests.conftest import load_fixture, make_jwt, token_payload
 
 
 @pytest_asyncio.fixture
@@ -67,6 +75,39 @@ class TestSimpleTNSEAuth:
             REFRESH_TOKEN_EXPIRES
         )
 
+    async def test_login_debug_log_redacts_tokens(
+        self,
+        login_auth: SimpleTNSEAuth,
+        session_mock: aioresponses,
+        caplog: pytest.LogCaptureFixture,
+    ) -> None:
+        session_mock.post(
+            f"{API_URL}/user/auth",
+            payload=load_fixture("auth_response.json"),
+            headers=HEADERS,
+        )
+        with caplog.at_level(logging.DEBUG, logger="aiotnse"):
+            await login_auth.async_login()
+
+        assert "Auth response: POST /user/auth" in caplog.text
+        for secret in ("test_access_token_new", "test_refresh_token_new", PASSWORD):
+            assert secret not in caplog.text
+
+    async def test_no_log_formatting_without_debug(
+        self,
+        auth: SimpleTNSEAuth,
+        session_mock: aioresponses,
+        monkeypatch: pytest.MonkeyPatch,
+        caplog: pytest.LogCaptureFixture,
+    ) -> None:
+        def fail(*args: Any) -> None:
+            raise AssertionError("log body built")
+
+        monkeypatch.setattr("aiotnse.auth.LogBody", fail)
+        session_mock.get(f"{API_URL}/user?a=1", payload={"result": True, "data": {}})
+        with caplog.at_level(logging.INFO, logger="aiotnse"):
+            assert await auth.request("GET", "user", params={"a": "1"}) == {}
+
     async def test_login_wrong_credentials(
         self, login_auth: SimpleTNSEAuth, session_mock: aioresponses
     ) -> None:
@@ -210,6 +251,11 @@ class TestSimpleTNSEAuth:
         assert auth.region == "nn"
         assert auth.base_url == "https://mobile-api-nn.tns-e.ru"
 
+    async def test_set_region_updates_headers(self, auth: SimpleTNSEAuth) -> None:
+        auth.region = "nn"
+        expected = "Basic " + b64encode(b"mobile-api-nn:mobile-api-nn").decode()
+        assert auth._build_headers()["Authorization"] == expected
+
     async def test_device_id_in_headers(self, auth: SimpleTNSEAuth) -> None:
         headers = auth._build_headers()
         assert headers["x-device-id"] == DEVICE_ID
@@ -260,6 +306,92 @@ class TestSimpleTNSEAuth:
         assert token_data["access_token"] == "test_access_token_refreshed"
         assert token_data["access_token_expires"] is not None
 
+    async def test_async_token_update_callback(
+        self, auth: SimpleTNSEAuth, session_mock: aioresponses
+    ) -> None:
+        """Test that an async callback does not block token refresh."""
+        release = asyncio.Event()
+        updates: list[dict[str, Any]] = []
+
+        async def callback(token_data: dict[str, Any]) -> None:
+            await release.wait()
+            updates.append(token_data)
+
+        auth._token_update_callback = callback
+        session_mock.post(
+            f"{API_URL}/user/refresh-token",
+            payload=load_fixture("refresh_token_response.json"),
+            headers=HEADERS,
+        )
+        await auth.async_refresh_token()
+        assert auth.access_token == "test_access_token_refreshed"
+        assert not updates
+
+        release.set()
+        await auth.async_flush_token_updates()
+        assert [u["access_token"] for u in updates] == ["test_access_token_refreshed"]
+
+    async def test_token_updates_coalesced(self, auth: SimpleTNSEAuth) -> None:
+        """Test that a burst of updates produces one write of the latest."""
+        updates: list[str | None] = []
+
+        async def callback(token_data: dict[str, Any]) -> None:
+            updates.append(token_data["access_token"])
+
+        auth._token_update_callback = callback
+        for token in ("first", "second", "third"):
+            auth._access_token = token
+            auth._notify_token_update()
+        await auth.async_flush_token_updates()
+        assert updates == ["third"]
+
+    @pytest.mark.filterwarnings("error::RuntimeWarning")
+    async def test_token_update_callback_returning_coroutine(
+        self, auth: SimpleTNSEAuth
+    ) -> None:
+        """Test that a sync callback returning a coroutine is awaited."""
+        updates: list[str | None] = []
+
+        async def save(token_data: dict[str, Any]) -> None:
+            updates.append(token_data["access_token"])
+
+        auth._token_update_callback = lambda data: save(data)
+        for token in ("first", "second", "third"):
+            auth._access_token = token
+            auth._notify_token_update()
+        await auth.async_flush_token_updates()
+        assert updates == ["first", "third"]
+
+    async def test_token_update_callback_in_executor(self) -> None:
+        """Test that a sync callback runs in the given executor."""
+        threads: list[int] = []
+        async with aiohttp.ClientSession() as session:
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                async with SimpleTNSEAuth(
+                    session=session,
+                    region=REGION,
+                    access_token=ACCESS_TOKEN,
+                    token_update_callback=lambda _: threads.append(get_ident()),
+                    token_update_executor=executor,
+                ) as auth:
+                    auth._notify_token_update()
+                    assert not threads
+        assert len(threads) == 1
+        assert threads[0] != get_ident()
+
+    async def test_token_update_callback_error(
+        self, auth: SimpleTNSEAuth, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        """Test that callback errors are logged."""
+
+        async def callback(token_data: dict[str, Any]) -> None:
+            raise OSError("disk full")
+
+        auth._token_update_callback = callback
+        auth._notify_token_update()
+        await auth.async_flush_token_updates()
+        assert "Error in token update callback" in caplog.text
+
     async def test_get_access_token_valid(self) -> None:
         """Test async_get_access_token returns token when not expired."""
         async with aiohttp.ClientSession() as session:
@@ -385,3 +517,339 @@ class TestSimpleTNSEAuth:
             )
             token = await auth.async_get_access_token()
         assert token == ACCESS_TOKEN
+
+
+class TestBackgroundTokenRefresh:
+    async def test_refreshes_ahead_of_expiry(self, session_mock: aioresponses) -> None:
+        """Token close to expiry is refreshed without any API request."""
+        callback = MagicMock()
+        async with aiohttp.ClientSession() as session:
+            auth = SimpleTNSEAuth(
+                session=session,
+                region=REGION,
+                access_token=ACCESS_TOKEN,
+                refresh_token=REFRESH_TOKEN,
+                access_token_expires=datetime.now() + timedelta(seconds=30),
+                token_update_callback=callback,
+            )
+            session_mock.post(
+                f"{API_URL}/user/refresh-token",
+                payload=load_fixture("refresh_token_response.json"),
+                headers=HEADERS,
+            )
+            async with auth:
+                auth.start_token_refresh(margin=60, jitter=0)
+                for _ in range(50):
+                    if callback.called:
+                        break
+                    await asyncio.sleep(0.01)
+
+        callback.assert_called_once()
+        assert auth.access_token == "test_access_token_refreshed"
+        assert auth._refresh_task is None
+
+    async def test_jitter_refreshes_earlier(
+        self, session_mock: aioresponses, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """The jittered lead time is used when re-checked under the lock."""
+        monkeypatch.setattr("aiotnse.auth.random.uniform", lambda low, high: high)
+        callback = MagicMock()
+        async with aiohttp.ClientSession() as session:
+            auth = SimpleTNSEAuth(
+                session=session,
+                region=REGION,
+                access_token=ACCESS_TOKEN,
+                refresh_token=REFRESH_TOKEN,
+                access_token_expires=datetime.now() + timedelta(seconds=30),
+                token_update_callback=callback,
+                expiry_margin=0,
+            )
+            session_mock.post(
+                f"{API_URL}/user/refresh-token",
+                payload=load_fixture("refresh_token_response.json"),
+                headers=HEADERS,
+            )
+            async with auth:
+                # Due in 20s by the margin alone, now with the jitter
+                auth.start_token_refresh(margin=10, jitter=30)
+                for _ in range(50):
+                    if callback.called:
+                        break
+                    await asyncio.sleep(0.01)
+
+        callback.assert_called_once()
+        assert auth.access_token == "test_access_token_refreshed"
+
+    async def test_waits_until_margin(self) -> None:
+        """Token far from expiry is left alone."""
+        async with aiohttp.ClientSession() as session:
+            auth = SimpleTNSEAuth(
+                session=session,
+                region=REGION,
+                access_token=ACCESS_TOKEN,
+                refresh_token=REFRESH_TOKEN,
+                access_token_expires=datetime.now() + timedelta(hours=1),
+            )
+            auth.start_token_refresh(margin=60, jitter=0)
+            await asyncio.sleep(0.05)
+            task = auth._refresh_task
+            assert task is not None and not task.done()
+            await auth.async_stop_token_refresh()
+
+        assert task.cancelled()
+        assert auth.access_token == ACCESS_TOKEN
+
+    async def test_failed_refresh_keeps_running(
+        self, session_mock: aioresponses
+    ) -> None:
+        """A failed background refresh is logged and retried later."""
+        async with aiohttp.ClientSession() as session:
+            auth = SimpleTNSEAuth(
+                session=session,
+                region=REGION,
+                access_token=ACCESS_TOKEN,
+                refresh_token=REFRESH_TOKEN,
+                access_token_expires=datetime.now() + timedelta(seconds=30),
+            )
+            session_mock.post(f"{API_URL}/user/refresh-token", status=500)
+            auth.start_token_refresh(margin=60, jitter=0)
+            await asyncio.sleep(0.05)
+            task = auth._refresh_task
+            assert task is not None and not task.done()
+            await auth.async_stop_token_refresh()
+
+        assert auth.access_token == ACCESS_TOKEN
+
+    async def test_unexpected_error_keeps_running(
+        self, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        """An unexpected refresh error is logged and does not end the loop."""
+        async with aiohttp.ClientSession() as session:
+            auth = SimpleTNSEAuth(
+                session=session,
+                region=REGION,
+                access_token=ACCESS_TOKEN,
+                refresh_token=REFRESH_TOKEN,
+                access_token_expires=datetime.now() + timedelta(seconds=30),
+            )
+            auth._async_renew_tokens = AsyncMock(side_effect=KeyError("data"))
+            auth.start_token_refresh(margin=60, jitter=0)
+            await asyncio.sleep(0.05)
+            task = auth._refresh_task
+            assert task is not None and not task.done()
+            await auth.async_stop_token_refresh()
+
+        auth._async_renew_tokens.assert_awaited_once()
+        assert "Unexpected error in background token refresh" in caplog.text
+
+    async def test_start_is_idempotent(self, auth: SimpleTNSEAuth) -> None:
+        auth.start_token_refresh()
+        task = auth._refresh_task
+        auth.start_token_refresh()
+        assert auth._refresh_task is task
+        await auth.async_stop_token_refresh()
+
+
+class TestTokenExpiry:
+    async def test_jwt_exp_preferred(self, session_mock: aioresponses) -> None:
+        """The exp claim wins over an expiry string in another timezone."""
+        token = make_jwt(time.time() + 3600)
+        expires = (datetime.now() - timedelta(hours=3)).isoformat(" ", "seconds")
+        payload = token_payload(token, login=True)
+        payload["data"]["accessTokenExpires"] = expires
+        session_mock.post(f"{API_URL}/user/auth", payload=payload, headers=HEADERS)
+        async with aiohttp.ClientSession() as session:
+            auth = SimpleTNSEAuth(
+                session=session, region=REGION, email=EMAIL, password=PASSWORD
+            )
+            await auth.async_login()
+            # Nothing else is mocked, renewing would fail
+            assert await auth.async_get_access_token() == token
+        assert auth.access_token_expires == datetime.fromisoformat(expires)
+
+    async def test_server_date_corrects_skew(
+        self, session_mock: aioresponses
+    ) -> None:
+        """Expiry is read against the server clock from the Date header."""
+        server_now = datetime.now() - timedelta(hours=1)
+        payload = token_payload(ACCESS_TOKEN, login=True)
+        payload["data"]["accessTokenExpires"] = (
+            server_now + timedelta(minutes=30)
+        ).isoformat(" ", "seconds")
+        date = format_datetime(datetime.now(UTC) - timedelta(hours=1), usegmt=True)
+        session_mock.post(
+            f"{API_URL}/user/auth", payload=payload, headers=HEADERS | {"Date": date}
+        )
+        async with aiohttp.ClientSession() as session:
+            auth = SimpleTNSEAuth(
+                session=session, region=REGION, email=EMAIL, password=PASSWORD
+            )
+            await auth.async_login()
+            assert await auth.async_get_access_token() == ACCESS_TOKEN
+        remaining = auth._access_token_deadline - time.monotonic()
+        assert 1800 - 10 - 3 < remaining < 1800 - 10 + 3
+
+    async def test_server_timezone(self) -> None:
+        """Naive expiry times are read in the server timezone if given."""
+        moscow = timezone(timedelta(hours=3))
+        expires = datetime.now(moscow).replace(tzinfo=None) + timedelta(hours=1)
+        async with aiohttp.ClientSession() as session:
+            auth = SimpleTNSEAuth(
+                session=session,
+                region=REGION,
+                access_token=ACCESS_TOKEN,
+                access_token_expires=expires,
+                server_timezone=moscow,
+            )
+        remaining = auth._access_token_deadline - time.monotonic()
+        assert 3600 - 10 - 3 < remaining < 3600 - 10 + 3
+        assert auth.access_token_expires == expires
+
+    @pytest.mark.parametrize(("margin", "refreshed"), [(10, False), (60, True)])
+    async def test_expiry_margin(
+        self, session_mock: aioresponses, margin: float, refreshed: bool
+    ) -> None:
+        """Tokens are renewed expiry_margin seconds before they expire."""
+        session_mock.post(
+            f"{API_URL}/user/refresh-token",
+            payload=load_fixture("refresh_token_response.json"),
+            headers=HEADERS,
+        )
+        async with aiohttp.ClientSession() as session:
+            auth = SimpleTNSEAuth(
+                session=session,
+                region=REGION,
+                access_token=make_jwt(time.time() + 30),
+                refresh_token=REFRESH_TOKEN,
+                expiry_margin=margin,
+            )
+            token = await auth.async_get_access_token()
+        assert (token == "test_access_token_refreshed") is refreshed
+
+
+class TestAuthFailureReplay:
+    async def test_replays_after_refresh(
+        self, auth: SimpleTNSEAuth, session_mock: aioresponses
+    ) -> None:
+        """A request rejected with 401 is replayed with a refreshed token."""
+        session_mock.get(f"{API_URL}/some-endpoint", status=401)
+        session_mock.post(
+            f"{API_URL}/user/refresh-token",
+            payload=token_payload("test_access_token_refreshed"),
+            headers=HEADERS,
+        )
+        session_mock.get(
+            f"{API_URL}/some-endpoint",
+            payload={"result": True, "data": {"ok": True}},
+            headers=HEADERS,
+        )
+        data = await auth.request("GET", "some-endpoint")
+
+        assert data == {"ok": True}
+        assert auth.access_token == "test_access_token_refreshed"
+        calls = session_mock.requests[("GET", URL(f"{API_URL}/some-endpoint"))]
+        assert calls[0].kwargs["headers"][BEARER_HEADER] == (
+            f"Bearer {ACCESS_TOKEN}"
+        )
+        assert calls[1].kwargs["headers"][BEARER_HEADER] == (
+            "Bearer test_access_token_refreshed"
+        )
+
+    async def test_concurrent_failures_share_one_refresh(
+        self, auth: SimpleTNSEAuth, session_mock: aioresponses
+    ) -> None:
+        """Concurrent rejected requests trigger a single token refresh."""
+        def respond(url: URL, **kwargs: Any) -> CallbackResult:
+            if kwargs["headers"][BEARER_HEADER] == f"Bearer {ACCESS_TOKEN}":
+                return CallbackResult(status=403)
+            return CallbackResult(payload={"result": True, "data": []})
+
+        session_mock.get(f"{API_URL}/some-endpoint", callback=respond, repeat=True)
+        session_mock.post(
+            f"{API_URL}/user/refresh-token",
+            payload=token_payload("test_access_token_refreshed"),
+            headers=HEADERS,
+        )
+        results = await asyncio.gather(
+            *(auth.request("GET", "some-endpoint") for _ in range(3))
+        )
+
+        assert results == [[], [], []]
+        refresh_calls = session_mock.requests[
+            ("POST", URL(f"{API_URL}/user/refresh-token"))
+        ]
+        assert len(refresh_calls) == 1
+
+    async def test_replays_only_once(
+        self, auth: SimpleTNSEAuth, session_mock: aioresponses
+    ) -> None:
+        """A request rejected again after renewal raises TNSEApiError."""
+        session_mock.get(f"{API_URL}/some-endpoint", status=401)
+        session_mock.post(
+            f"{API_URL}/user/refresh-token",
+            payload=token_payload("test_access_token_refreshed"),
+            headers=HEADERS,
+        )
+        session_mock.get(f"{API_URL}/some-endpoint", status=401)
+        with pytest.raises(TNSEApiError, match="401"):
+            await auth.request("GET", "some-endpoint")
+
+    async def test_html_403_is_not_auth_failure(
+        self, auth: SimpleTNSEAuth, session_mock: aioresponses
+    ) -> None:
+        """An HTML 403 (throttling) is raised without renewing the token."""
+        for _ in range(2):
+            session_mock.get(
+                f"{API_URL}/some-endpoint",
+                status=403,
+                body="<html>Too many requests</html>",
+                content_type="text/html",
+            )
+        with pytest.raises(TNSEApiError) as exc_info:
+            await auth.request("GET", "some-endpoint")
+        assert exc_info.value.status == 403
+        async with auth.stream_request("GET", "some-endpoint") as resp:
+            assert resp.status == 403
+
+        assert ("POST", URL(f"{API_URL}/user/refresh-token")) not in (
+            session_mock.requests
+        )
+        assert auth.access_token == ACCESS_TOKEN
+
+    async def test_no_recovery_path_raises_original_error(
+        self, no_creds_auth: SimpleTNSEAuth, session_mock: aioresponses
+    ) -> None:
+        """Without a token no renewal is attempted."""
+        session_mock.get(f"{API_URL}/some-endpoint", status=401)
+        with pytest.raises(TNSEApiError, match="401"):
+            await no_creds_auth.request("GET", "some-endpoint")
+
+    async def test_refresh_rejected_falls_back_to_login(
+        self, session_mock: aioresponses
+    ) -> None:
+        """A rejected refresh during replay falls back to login."""
+        async with aiohttp.ClientSession() as session:
+            auth = SimpleTNSEAuth(
+                session=session,
+                region=REGION,
+                email=EMAIL,
+                password=PASSWORD,
+                access_token=ACCESS_TOKEN,
+                refresh_token=REFRESH_TOKEN,
+            )
+            session_mock.get(f"{API_URL}/some-endpoint", status=401)
+            session_mock.post(f"{API_URL}/user/refresh-token", status=403)
+            session_mock.post(
+                f"{API_URL}/user/auth",
+                payload=token_payload("test_access_token_new", login=True),
+                headers=HEADERS,
+            )
+            session_mock.get(
+                f"{API_URL}/some-endpoint",
+                payload={"result": True, "data": []},
+                headers=HEADERS,
+            )
+            data = await auth.request("GET", "some-endpoint")
+
+        assert data == []
+        assert auth.access_token == "test_access_token_new"
@@ -0,0 +1,141 @@
+"""Tests for aiotnse backfill module."""
+from __future__ import annotations
+
+import json
+import sqlite3
+from contextlib import closing
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from aiotnse import (
+    AbstractBackfillSink,
+    BackfillCheckpoint,
+    BackfillTask,
+    JSONLinesBackfillSink,
+    SQLiteBackfillSink,
+    TNSEApiError,
+    TNSEBackfill,
+)
+from aiotnse.backfill import iter_months
+from tests.common import ACCOUNT
+
+START = date(2025, 11, 1)
+END = date(2026, 2, 28)
+
+
+class FakeApi:
+    """API stub recording calls and failing selected months."""
+
+    def __init__(self, failing: set[tuple[int, int]] | None = None) -> None:
+        self.calls: list[tuple[Any, ...]] = []
+        self.failing = failing or set()
+
+    async def async_get_history(self, account: str, year: int, month: int) -> Any:
+        self.calls.append(("history", account, year, month))
+        if (year, month) in self.failing:
+            raise TNSEApiError("unavailable", status=503)
+        return {"items": [{"date": f"01.{month:02d}.{year}"}]}
+
+    async def async_get_invoices(self, account: str, year: int) -> Any:
+        self.calls.append(("invoices", account, year))
+        return [{"date": f"01.01.{year}"}]
+
+
+class MemorySink(AbstractBackfillSink):
+    """Sink keeping responses in memory."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, Any] = {}
+
+    async def async_write(self, task: BackfillTask, data: Any) -> None:
+        self.data[task.key] = data
+
+
+def _backfill(api: FakeApi, sink: AbstractBackfillSink, **kwargs: Any) -> TNSEBackfill:
+    """Create a backfill over the test date range."""
+    return TNSEBackfill(api, [ACCOUNT], START, END, sink=sink, **kwargs)  # type: ignore[arg-type]
+
+
+class TestBackfill:
+    def test_iter_months(self) -> None:
+        assert list(iter_months(START, END)) == [
+            (2025, 11),
+            (2025, 12),
+            (2026, 1),
+            (2026, 2),
+        ]
+
+    def test_tasks(self) -> None:
+        keys = [task.key for task in _backfill(FakeApi(), MemorySink()).tasks()]
+        assert keys == [
+            f"invoices/{ACCOUNT}/2025",
+            f"invoices/{ACCOUNT}/2026",
+            f"history/{ACCOUNT}/2025/11",
+            f"history/{ACCOUNT}/2025/12",
+            f"history/{ACCOUNT}/2026/01",
+            f"history/{ACCOUNT}/2026/02",
+        ]
+
+    async def test_run(self) -> None:
+        sink = MemorySink()
+        summary = await _backfill(FakeApi(), sink, max_concurrency=3).async_run()
+        assert summary.complete
+        assert summary.completed == 6
+        assert sink.data[f"history/{ACCOUNT}/2026/01"]["items"][0]["date"] == (
+            "01.01.2026"
+        )
+
+    async def test_resume_from_checkpoint(self, tmp_path: Path) -> None:
+        api = FakeApi(failing={(2025, 12)})
+        sink = MemorySink()
+        checkpoint = BackfillCheckpoint(tmp_path / "checkpoint")
+        summary = await _backfill(api, sink, checkpoint=checkpoint).async_run()
+        await checkpoint.async_close()
+        assert summary.completed == 5
+        assert list(summary.failed) == [f"history/{ACCOUNT}/2025/12"]
+
+        # Resume after a "crash": only the failed task is requested again
+        api = FakeApi()
+        checkpoint = BackfillCheckpoint(tmp_path / "checkpoint")
+        summary = await _backfill(api, sink, checkpoint=checkpoint).async_run()
+        await checkpoint.async_close()
+        assert summary.completed == 1
+        assert summary.skipped == 5
+        assert api.calls == [("history", ACCOUNT, 2025, 12)]
+        assert len(sink.data) == 6
+
+    async def test_sink_error_stops_run(self) -> None:
+        class FailingSink(AbstractBackfillSink):
+            async def async_write(self, task: BackfillTask, data: Any) -> None:
+                raise OSError("disk full")
+
+        with pytest.raises(OSError):
+            await _backfill(FakeApi(), FailingSink()).async_run()
+
+
+class TestSinks:
+    async def test_jsonl_sink(self, tmp_path: Path) -> None:
+        sink = JSONLinesBackfillSink(tmp_path / "backfill.jsonl")
+        await _backfill(FakeApi(), sink, history=False).async_run()
+        await sink.async_close()
+
+        lines = (tmp_path / "backfill.jsonl").read_text(encoding="utf-8").splitlines()
+        records = sorted((json.loads(line) for line in lines), key=lambda r: r["key"])
+        assert [record["year"] for record in records] == [2025, 2026]
+        assert records[0]["data"] == [{"date": "01.01.2025"}]
+
+    async def test_sqlite_sink(self, tmp_path: Path) -> None:
+        sink = SQLiteBackfillSink(tmp_path / "backfill.db")
+        await _backfill(FakeApi(), sink).async_run()
+        await sink.async_close()
+
+        with closing(sqlite3.connect(tmp_path / "backfill.db")) as conn:
+            rows = conn.execute(
+                "SELECT kind, year, month, data FROM backfill ORDER BY key"
+            ).fetchall()
+        assert len(rows) == 6
+        assert rows[0][:3] == ("history", 2025, 11)
+        assert json.loads(rows[0][3]) == {"items": [{"date": "01.11.2025"}]}
@@ -0,0 +1,160 @@
+"""Tests for aiotnse breaker module."""
+from __future__ import annotations
+
+from collections.abc import AsyncIterator, Iterator
+from unittest.mock import patch
+
+import aiohttp
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from aiotnse import (
+    CircuitState,
+    RetryPolicy,
+    SimpleTNSEAuth,
+    TNSEApiError,
+    TNSECircuitBreaker,
+    TNSECircuitOpenError,
+)
+from tests.common import ACCESS_TOKEN, REGION
+
+HOST = "https://example.test"
+
+
+class _Clock:
+    """Controllable replacement for time.monotonic."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> Iterator[_Clock]:
+    """Patch monotonic clock of the breaker module."""
+    fake = _Clock()
+    with patch("aiotnse.breaker.time.monotonic", fake):
+        yield fake
+
+
+def _fail(breaker: TNSECircuitBreaker) -> None:
+    """Record a failed request."""
+    with pytest.raises(aiohttp.ClientConnectionError):
+        with breaker.guard(HOST):
+            raise aiohttp.ClientConnectionError
+
+
+def _succeed(breaker: TNSECircuitBreaker) -> None:
+    """Record a successful request."""
+    with breaker.guard(HOST) as call:
+        call.failed = False
+
+
+class TestCircuitBreaker:
+    def test_opens_after_consecutive_failures(self, clock: _Clock) -> None:
+        breaker = TNSECircuitBreaker(failure_threshold=3)
+        for _ in range(2):
+            _fail(breaker)
+        _succeed(breaker)
+        for _ in range(2):
+            _fail(breaker)
+        assert breaker.states() == {HOST: CircuitState.CLOSED}
+
+        _fail(breaker)
+        assert breaker.states() == {HOST: CircuitState.OPEN}
+
+    def test_open_circuit_fails_fast(self, clock: _Clock) -> None:
+        breaker = TNSECircuitBreaker(failure_threshold=1, recovery_timeout=30)
+        _fail(breaker)
+        clock.now += 10
+        with pytest.raises(TNSECircuitOpenError) as exc_info:
+            with breaker.guard(HOST):
+                pytest.fail("request must not be sent")
+        assert exc_info.value.retry_after == pytest.approx(20)
+        assert exc_info.value.status is None
+
+    def test_half_open_probe_closes_circuit(self, clock: _Clock) -> None:
+        breaker = TNSECircuitBreaker(failure_threshold=1, recovery_timeout=30)
+        _fail(breaker)
+        clock.now += 30
+        assert breaker.states() == {HOST: CircuitState.HALF_OPEN}
+
+        with breaker.guard(HOST) as call:
+            # Only one probe is let through while half-open
+            with pytest.raises(TNSECircuitOpenError):
+                with breaker.guard(HOST):
+                    pass
+            call.failed = False
+        assert breaker.states() == {HOST: CircuitState.CLOSED}
+
+    def test_half_open_failure_reopens_circuit(self, clock: _Clock) -> None:
+        breaker = TNSECircuitBreaker(failure_threshold=3, recovery_timeout=30)
+        for _ in range(3):
+            _fail(breaker)
+        clock.now += 30
+        _fail(breaker)
+        assert breaker.states() == {HOST: CircuitState.OPEN}
+        clock.now += 29
+        assert breaker.states() == {HOST: CircuitState.OPEN}
+
+    def test_cancelled_request_is_not_counted(self, clock: _Clock) -> None:
+        breaker = TNSECircuitBreaker(failure_threshold=1)
+        with pytest.raises(RuntimeError):
+            with breaker.guard(HOST):
+                raise RuntimeError
+        assert breaker.states() == {HOST: CircuitState.CLOSED}
+
+    def test_hosts_are_independent(self, clock: _Clock) -> None:
+        breaker = TNSECircuitBreaker(failure_threshold=1)
+        _fail(breaker)
+        with breaker.guard("https://other.test") as call:
+            call.failed = False
+        assert breaker.states() == {
+            HOST: CircuitState.OPEN,
+            "https://other.test": CircuitState.CLOSED,
+        }
+
+
+@pytest_asyncio.fixture
+async def failing_server() -> AsyncIterator[tuple[list[int], str]]:
+    """Start a local server answering 503 to every request."""
+    calls: list[int] = []
+
+    async def handle(request: web.Request) -> web.Response:
+        calls.append(1)
+        return web.Response(status=503, text="unavailable")
+
+    app = web.Application()
+    app.router.add_route("*", "/api/v1/{path:.*}", handle)
+    async with TestServer(app) as test_server:
+        yield calls, str(test_server.make_url("")).rstrip("/")
+
+
+class TestCircuitBreakerIntegration:
+    async def test_open_circuit_stops_requests(
+        self, failing_server: tuple[list[int], str]
+    ) -> None:
+        calls, base_url = failing_server
+        breaker = TNSECircuitBreaker(failure_threshold=2)
+        async with aiohttp.ClientSession() as session:
+            auth = SimpleTNSEAuth(
+                session,
+                region=REGION,
+                access_token=ACCESS_TOKEN,
+                base_url=base_url,
+                retry_policy=RetryPolicy(base_delay=0.001, max_delay=0.001),
+                circuit_breaker=breaker,
+            )
+            with pytest.raises(TNSEApiError):
+                await auth.request("GET", "test")
+            # The circuit opened after the second attempt, the retry fails fast
+            assert len(calls) == 2
+            assert breaker.states() == {base_url: CircuitState.OPEN}
+
+            with pytest.raises(TNSECircuitOpenError):
+                await auth.request("GET", "test")
+            assert len(calls) == 2
@@ -0,0 +1,259 @@
+"""Tests for aiotnse cache module."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from aioresponses import CallbackResult, aioresponses
+
+from aiotnse import SimpleTNSEAuth, TNSEApi, TNSEApiError, TNSEResponseCache
+from aiotnse.helpers import path_template
+from tests.common import ACCOUNT, API_URL, COUNTER_ID, HEADERS, REGION, ROW_ID
+from tests.conftest import load_fixture
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    """Patch monotonic time used by the cache."""
+    now = [1000.0]
+    monkeypatch.setattr("aiotnse.cache.time.monotonic", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def cache() -> TNSEResponseCache:
+    """Create a response cache with default TTLs."""
+    return TNSEResponseCache()
+
+
+@pytest.fixture
+def cached_api(auth: SimpleTNSEAuth, cache: TNSEResponseCache) -> TNSEApi:
+    """Create a TNSEApi instance with a response cache."""
+    return TNSEApi(auth, cache=cache)
+
+
+class TestPathTemplate:
+    def test_numeric_segments(self) -> None:
+        assert path_template("accounts/100001") == "accounts/{id}"
+        assert path_template(f"counters/{COUNTER_ID}/readings") == (
+            "counters/{id}/readings"
+        )
+        assert path_template("payments/new-balance") == "payments/new-balance"
+
+
+class TestTNSEResponseCache:
+    def test_get_set(self, cache: TNSEResponseCache) -> None:
+        cache.set("rostov", "counters", {"account": ACCOUNT}, [1])
+        assert cache.get("rostov", "counters", {"account": ACCOUNT}) == [1]
+        assert cache.get("penza", "counters", {"account": ACCOUNT}) is None
+        assert cache.get("rostov", "counters", {"account": "1"}) is None
+
+    def test_uncached_endpoint(self, cache: TNSEResponseCache) -> None:
+        cache.set("rostov", "invoices/get-file", {"account": ACCOUNT}, {"file": ""})
+        assert len(cache) == 0
+
+    def test_ttl_expiry(self, clock: list[float]) -> None:
+        cache = TNSEResponseCache(ttls={"counters": 10})
+        cache.set("rostov", "counters", {"account": ACCOUNT}, [1])
+        clock[0] += 9
+        assert cache.get("rostov", "counters", {"account": ACCOUNT}) == [1]
+        clock[0] += 1
+        assert cache.get("rostov", "counters", {"account": ACCOUNT}, "miss") == "miss"
+        assert len(cache) == 0
+        assert cache.size == 0
+
+    def test_lru_eviction(self) -> None:
+        cache = TNSEResponseCache(max_entries=2)
+        cache.set("rostov", "counters", {"account": "1"}, [1])
+        cache.set("rostov", "counters", {"account": "2"}, [2])
+        assert cache.get("rostov", "counters", {"account": "1"}) == [1]
+        cache.set("rostov", "counters", {"account": "3"}, [3])
+
+        assert cache.get("rostov", "counters", {"account": "2"}) is None
+        assert cache.get("rostov", "counters", {"account": "1"}) == [1]
+        assert cache.get("rostov", "counters", {"account": "3"}) == [3]
+
+    def test_max_size(self) -> None:
+        payload = load_fixture("history_response.json")["data"]
+        cache = TNSEResponseCache(max_size=1)
+        cache.set("rostov", "history", {"account": ACCOUNT}, payload)
+        assert len(cache) == 0
+
+        cache = TNSEResponseCache()
+        cache.set("rostov", "history", {"account": ACCOUNT}, payload)
+        size = cache.size
+        assert size > 0
+        cache = TNSEResponseCache(max_size=int(size * 1.5))
+        cache.set("rostov", "history", {"account": "1"}, payload)
+        cache.set("rostov", "history", {"account": "2"}, payload)
+        assert len(cache) == 1
+        assert cache.get("rostov", "history", {"account": "2"}) == payload
+
+    def test_invalidate_account(self, cache: TNSEResponseCache) -> None:
+        cache.set("rostov", "counters", {"account": "1"}, [1])
+        cache.set("rostov", "payments/new-balance", {"account": "1"}, {})
+        cache.set("rostov", "counters", {"account": "2"}, [2])
+
+        assert cache.invalidate(account="1") == 2
+        assert cache.get("rostov", "counters", {"account": "2"}) == [2]
+
+    def test_invalidate_endpoints(self, cache: TNSEResponseCache) -> None:
+        cache.set("rostov", "counters", {"account": "1"}, [1])
+        cache.set("rostov", "information", {"account": "1"}, [])
+
+        assert cache.invalidate(account="1", endpoints=["counters"]) == 1
+        assert cache.get("rostov", "information", {"account": "1"}) == []
+
+    def test_stale_generation_not_stored(self, cache: TNSEResponseCache) -> None:
+        generation = cache.generation("1")
+        other = cache.generation("2")
+        cache.invalidate(account="1", endpoints=["counters"])
+        cache.set(
+            "rostov", "counters", {"account": "1"}, ["OLD"], generation=generation
+        )
+        cache.set("rostov", "counters", {"account": "2"}, [2], generation=other)
+
+        assert cache.get("rostov", "counters", {"account": "1"}) is None
+        assert cache.get("rostov", "counters", {"account": "2"}) == [2]
+
+    def test_scope(self, cache: TNSEResponseCache) -> None:
+        cache.set("rostov", "accounts", None, [1], scope="user1")
+        assert cache.get("rostov", "accounts", None, scope="user1") == [1]
+        assert cache.get("rostov", "accounts", None, scope="user2") is None
+        assert cache.get("rostov", "accounts") is None
+
+    def test_clear(self, cache: TNSEResponseCache) -> None:
+        cache.set("rostov", "accounts", None, [])
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.size == 0
+
+
+class TestTNSEApiCache:
+    async def test_repeated_call_served_from_cache(
+        self, cached_api: TNSEApi, session_mock: aioresponses
+    ) -> None:
+        session_mock.get(
+            f"{API_URL}/counters?account={ACCOUNT}",
+            payload=load_fixture("counters_response.json"),
+            headers=HEADERS,
+        )
+        first = await cached_api.async_get_counters(ACCOUNT)
+        second = await cached_api.async_get_counters(ACCOUNT)
+
+        assert first is second
+        assert len(session_mock.requests) == 1
+
+    async def test_not_shared_between_users(
+        self,
+        auth: SimpleTNSEAuth,
+        cached_api: TNSEApi,
+        cache: TNSEResponseCache,
+        session_mock: aioresponses,
+    ) -> None:
+        other = SimpleTNSEAuth(
+            session=auth._session, region=REGION, access_token="other_access_token"
+        )
+        other_api = TNSEApi(other, cache=cache)
+        session_mock.get(
+            f"{API_URL}/accounts",
+            payload=load_fixture("accounts_response.json"),
+            headers=HEADERS,
+            repeat=True,
+        )
+        await cached_api.async_get_accounts()
+        await other_api.async_get_accounts()
+        await other_api.async_get_accounts()
+
+        assert sum(map(len, session_mock.requests.values())) == 2
+        assert len(cache) == 2
+
+    async def test_errors_not_cached(
+        self, cached_api: TNSEApi, cache: TNSEResponseCache, session_mock: aioresponses
+    ) -> None:
+        session_mock.get(f"{API_URL}/accounts", status=500)
+        with pytest.raises(TNSEApiError):
+            await cached_api.async_get_accounts()
+        assert len(cache) == 0
+
+    async def test_send_readings_invalidates(
+        self,
+        auth: SimpleTNSEAuth,
+        cached_api: TNSEApi,
+        cache: TNSEResponseCache,
+        session_mock: aioresponses,
+    ) -> None:
+        session_mock.get(
+            f"{API_URL}/counters?account={ACCOUNT}",
+            payload=load_fixture("counters_response.json"),
+            headers=HEADERS,
+        )
+        session_mock.get(
+            f"{API_URL}/information?account={ACCOUNT}",
+            payload=load_fixture("information_response.json"),
+            headers=HEADERS,
+        )
+        session_mock.post(
+            f"{API_URL}/counters/send-readings",
+            payload=load_fixture("send_readings_response.json"),
+            headers=HEADERS,
+        )
+        await cached_api.async_get_counters(ACCOUNT)
+        await cached_api.async_get_information(ACCOUNT)
+        await cached_api.async_send_readings(ACCOUNT, ROW_ID, ["2690", "1023"])
+
+        params = {"account": ACCOUNT}
+        assert cache.get("rostov", "counters", params, scope=auth) is None
+        assert cache.get("rostov", "information", params, scope=auth) == []
+
+    async def test_send_readings_invalidates_debt_info(
+        self,
+        auth: SimpleTNSEAuth,
+        cached_api: TNSEApi,
+        cache: TNSEResponseCache,
+        session_mock: aioresponses,
+    ) -> None:
+        session_mock.get(
+            f"{API_URL}/main-page/debt/info",
+            payload=load_fixture("main_page_debt_response.json"),
+            headers=HEADERS,
+        )
+        session_mock.post(
+            f"{API_URL}/counters/send-readings",
+            payload=load_fixture("send_readings_response.json"),
+            headers=HEADERS,
+        )
+        await cached_api.async_get_main_page_debt_info()
+        await cached_api.async_send_readings(ACCOUNT, ROW_ID, ["2690", "1023"])
+
+        assert cache.get("rostov", "main-page/debt/info", scope=auth) is None
+
+    async def test_read_during_send_readings_not_cached(
+        self,
+        auth: SimpleTNSEAuth,
+        cached_api: TNSEApi,
+        cache: TNSEResponseCache,
+        session_mock: aioresponses,
+    ) -> None:
+        """Data fetched before readings were sent is not written back."""
+        sent = asyncio.Event()
+
+        async def respond(url: object, **kwargs: object) -> CallbackResult:
+            await sent.wait()
+            return CallbackResult(
+                payload={"result": True, "data": ["OLD"]}, headers=HEADERS
+            )
+
+        session_mock.get(f"{API_URL}/counters?account={ACCOUNT}", callback=respond)
+        session_mock.post(
+            f"{API_URL}/counters/send-readings",
+            payload=load_fixture("send_readings_response.json"),
+            headers=HEADERS,
+        )
+        read = asyncio.create_task(cached_api.async_get_counters(ACCOUNT))
+        await asyncio.sleep(0)
+        await cached_api.async_send_readings(ACCOUNT, ROW_ID, ["2690", "1023"])
+        sent.set()
+
+        assert await read == ["OLD"]
+        assert cache.get("rostov", "counters", {"account": ACCOUNT}, scope=auth) is None
@@ -0,0 +1,137 @@
+"""Tests for aiotnse columnar module."""
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from aiotnse.columnar import readings_to_arrays  # noqa: E402
+from tests.common import COUNTER_ID  # noqa: E402
+from tests.conftest import load_fixture  # noqa: E402
+
+
+def _record(day: str, day_value: Any, night_value: Any) -> dict[str, Any]:
+    """Build a readings history record of a two-zone counter."""
+    return {
+        "date": day,
+        "readings": [
+            {"title": "День ПУ 1", "value": day_value},
+            {"title": "Ночь ПУ 1", "value": night_value},
+        ],
+    }
+
+
+class TestReadingsToArrays:
+    def test_fixture(self) -> None:
+        arrays = readings_to_arrays(
+            {COUNTER_ID: load_fixture("counter_readings_response.json")["data"]}
+        )
+        assert len(arrays) == 4
+        assert arrays.counter_ids == (COUNTER_ID,)
+        assert arrays.zone_names == ("День", "Ночь")
+        # Sorted by counter, zone and date
+        assert arrays.zones.tolist() == [0, 0, 1, 1]
+        assert arrays.dates.tolist()[0].isoformat() == "2025-12-24"
+        assert arrays.values.tolist() == [4980.0, 5100.0, 2140.0, 2200.0]
+        assert arrays.values.dtype == np.float64
+        assert arrays.dates.dtype == np.dtype("datetime64[D]")
+
+    def test_many_counters(self) -> None:
+        arrays = readings_to_arrays(
+            {
+                "a": [_record("24.01.26", "100", "50")],
+                "b": [_record("24.01.26", "200", "")],
+            }
+        )
+        assert arrays.counter_ids == ("a", "b")
+        assert arrays.counters.tolist() == [0, 0, 1, 1]
+        assert np.isnan(arrays.values[3])
+
+    def test_invalid_dates_skipped(self) -> None:
+        arrays = readings_to_arrays(
+            {
+                "a": [
+                    _record("24.01.26", "100", "50"),
+                    _record("", "150", "70"),
+                    _record("31.02.26", "200", "90"),
+                    _record("24.02.26", "300", "100"),
+                ]
+            }
+        )
+        assert len(arrays) == 4
+        assert not np.isnat(arrays.dates).any()
+        result = arrays.consumption("M")
+        assert result.counters.tolist() == [0, 0]
+        assert [str(period) for period in result.periods] == ["2026-02", "2026-02"]
+        assert result.consumption.tolist() == [200.0, 50.0]
+
+    def test_empty(self) -> None:
+        arrays = readings_to_arrays({})
+        assert len(arrays) == 0
+        assert len(arrays.deltas()) == 0
+        assert len(arrays.consumption().consumption) == 0
+        assert len(arrays.anomalies()) == 0
+
+
+class TestAnalytics:
+    @pytest.fixture
+    def arrays(self) -> Any:
+        return readings_to_arrays(
+            {
+                "a": [
+                    _record("24.03.26", "1300", "500"),
+                    _record("24.01.26", "1000", "400"),
+                    _record("24.02.26", "1100", "450"),
+                ],
+                "b": [
+                    _record("10.01.26", "10", "10"),
+                    _record("20.01.26", "20", "15"),
+                    _record("10.02.26", "40", "25"),
+                ],
+            }
+        )
+
+    def test_deltas(self, arrays: Any) -> None:
+        deltas = arrays.deltas()
+        assert np.isnan(deltas[arrays.dates == np.datetime64("2026-01-24")]).all()
+        assert deltas[:3].tolist()[1:] == [100.0, 200.0]
+
+    def test_consumption_per_month(self, arrays: Any) -> None:
+        result = arrays.consumption("M")
+        rows = {
+            (
+                result.counter_ids[counter],
+                result.zone_names[zone],
+                str(period),
+            ): total
+            for counter, zone, period, total in zip(
+                result.counters, result.zones, result.periods, result.consumption
+            )
+        }
+        assert rows == {
+            ("a", "День", "2026-02"): 100.0,
+            ("a", "День", "2026-03"): 200.0,
+            ("a", "Ночь", "2026-02"): 50.0,
+            ("a", "Ночь", "2026-03"): 50.0,
+            ("b", "День", "2026-01"): 10.0,
+            ("b", "День", "2026-02"): 20.0,
+            ("b", "Ночь", "2026-01"): 5.0,
+            ("b", "Ночь", "2026-02"): 10.0,
+        }
+
+    def test_anomalies(self) -> None:
+        history = [
+            _record(f"01.{month:02d}.25", 1000 + month * 100, 0)
+            for month in range(1, 13)
+        ]
+        history[5] = _record("01.06.25", 3000, 0)  # spike, then rollback
+        history[11] = _record("01.12.25", 1500, 0)  # rollback
+        arrays = readings_to_arrays({"a": history})
+        flagged = arrays.dates[arrays.anomalies() & (arrays.zones == 0)]
+        assert [str(day) for day in flagged] == [
+            "2025-06-01",
+            "2025-07-01",
+            "2025-12-01",
+        ]
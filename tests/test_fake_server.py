@@ -0,0 +1,150 @@
+"""End-to-end tests against the local fake TNS-Energo server."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from io import BytesIO
+
+import aiohttp
+import pytest
+import pytest_asyncio
+
+from aiotnse import (
+    RetryPolicy,
+    SimpleTNSEAuth,
+    TNSEApi,
+    TNSEApiError,
+    TNSEAuthError,
+    async_get_regions,
+)
+from tests.common import EMAIL, PASSWORD, REGION
+from tests.fake_server import FakeTNSEServer
+
+
+@pytest_asyncio.fixture
+async def server() -> AsyncIterator[FakeTNSEServer]:
+    """Start a fake server."""
+    async with FakeTNSEServer(accounts=3, invoice_size=10_000) as server:
+        yield server
+
+
+@pytest_asyncio.fixture
+async def session() -> AsyncIterator[aiohttp.ClientSession]:
+    """Create a real client session."""
+    async with aiohttp.ClientSession() as session:
+        yield session
+
+
+def _auth(
+    session: aiohttp.ClientSession, server: FakeTNSEServer, **kwargs: object
+) -> SimpleTNSEAuth:
+    """Create auth pointing at the fake server."""
+    return SimpleTNSEAuth(
+        session,
+        region=REGION,
+        email=EMAIL,
+        password=PASSWORD,
+        base_url=server.url,
+        **kwargs,  # type: ignore[arg-type]
+    )
+
+
+class TestFakeServer:
+    async def test_account_walk(
+        self, server: FakeTNSEServer, session: aiohttp.ClientSession
+    ) -> None:
+        auth = _auth(session, server)
+        api = TNSEApi(auth)
+        await auth.async_login()
+
+        accounts = await api.async_get_accounts()
+        assert [a["number"] for a in accounts] == [
+            "610000000001",
+            "610000000002",
+            "610000000003",
+        ]
+        snapshot = await api.async_get_account_snapshot(accounts[1]["number"])
+        assert snapshot.complete
+        assert snapshot.counters[0]["counterId"] == "10000002"
+        readings = snapshot.readings["10000002"]
+        assert len(readings) == 24
+        assert readings[0]["readings"][0]["value"] > readings[1]["readings"][0]["value"]
+
+        file = BytesIO()
+        assert await api.async_download_invoice_file(
+            accounts[0]["number"], "01.01.2026", file
+        ) == 10_000
+        assert file.getvalue().startswith(b"%PDF")
+
+        assert await async_get_regions(session, base_url=server.url)
+        assert server.requests["POST user/auth"] == 1
+
+    async def test_wrong_credentials(
+        self, server: FakeTNSEServer, session: aiohttp.ClientSession
+    ) -> None:
+        auth = _auth(session, server)
+        auth._password = "wrong"
+        with pytest.raises(TNSEAuthError, match="Неверный логин или пароль"):
+            await auth.async_login()
+
+    async def test_token_expiry(
+        self, server: FakeTNSEServer, session: aiohttp.ClientSession
+    ) -> None:
+        auth = _auth(session, server)
+        api = TNSEApi(auth)
+        await auth.async_login()
+
+        server.expire_access_tokens()
+        assert await api.async_get_user_info()
+        assert server.requests["GET user"] == 2
+        assert server.requests["POST user/refresh-token"] == 1
+
+        server.expire_access_tokens()
+        server.expire_refresh_tokens()
+        assert await api.async_get_user_info()
+        assert server.requests["POST user/auth"] == 2
+
+        async with session.post(f"{server.url}/_fake/expire-access-tokens") as resp:
+            assert resp.status == 200
+        assert await api.async_get_user_info()
+        # The rejected refresh before the second login counts too
+        assert server.requests["POST user/refresh-token"] == 3
+
+    async def test_short_token_ttl(
+        self, server: FakeTNSEServer, session: aiohttp.ClientSession
+    ) -> None:
+        server.access_token_ttl = 1
+        auth = _auth(session, server)
+        await auth.async_login()
+        await asyncio.sleep(1.1)
+        assert await TNSEApi(auth).async_get_accounts()
+        assert server.requests["POST user/refresh-token"] == 1
+
+    async def test_error_injection(
+        self, server: FakeTNSEServer, session: aiohttp.ClientSession
+    ) -> None:
+        policy = RetryPolicy(max_attempts=3, base_delay=0)
+        auth = _auth(session, server, retry_policy=policy)
+        api = TNSEApi(auth)
+        await auth.async_login()
+
+        server.fail_next("accounts", status=503, count=2)
+        assert await api.async_get_accounts()
+        assert server.requests["GET accounts"] == 3
+
+        # POST requests are not retried
+        server.fail_next("counters/send-readings", status=500)
+        with pytest.raises(TNSEApiError) as exc_info:
+            await api.async_send_readings("610000000001", "2000001", ["1", "2"])
+        assert exc_info.value.status == 500
+        assert server.requests["POST counters/send-readings"] == 1
+
+    async def test_throttling(self, session: aiohttp.ClientSession) -> None:
+        async with FakeTNSEServer(rate_limit=1, burst=2) as server:
+            auth = _auth(session, server)
+            await auth.async_login()
+            api = TNSEApi(auth)
+            await api.async_get_accounts()
+            with pytest.raises(TNSEApiError) as exc_info:
+                await api.async_get_accounts()
+        assert exc_info.value.status == 403
@@ -0,0 +1,163 @@
+"""Tests for aiotnse fleet module."""
+from __future__ import annotations
+
+import asyncio
+
+from aioresponses import aioresponses
+
+from aiotnse import FleetResult, TNSECredentials, TNSEFleet
+from tests.common import (
+    ACCESS_TOKEN,
+    ACCOUNT,
+    API_URL,
+    COUNTER_ID,
+    EMAIL,
+    HEADERS,
+    PASSWORD,
+    REGION,
+)
+from tests.conftest import load_fixture, token_payload
+
+
+def _mock_user(session_mock: aioresponses) -> None:
+    """Register responses for the full walk of one user with two accounts."""
+    session_mock.post(
+        f"{API_URL}/user/auth",
+        payload=token_payload(ACCESS_TOKEN, login=True),
+        headers=HEADERS,
+    )
+    session_mock.get(
+        f"{API_URL}/accounts",
+        payload=load_fixture("accounts_response.json"),
+        headers=HEADERS,
+    )
+    for account in (ACCOUNT, "610000000002"):
+        for path, fixture in (
+            ("information", "information_response.json"),
+            ("payments/new-balance", "balance_response.json"),
+            ("counters", "counters_response.json"),
+            (f"counters/{COUNTER_ID}/readings", "counter_readings_response.json"),
+        ):
+            session_mock.get(
+                f"{API_URL}/{path}?account={account}",
+                payload=load_fixture(fixture),
+                headers=HEADERS,
+            )
+
+
+class TestTNSEFleet:
+    async def test_walk_users(self, session_mock: aioresponses) -> None:
+        _mock_user(session_mock)
+        session_mock.post(
+            f"{API_URL}/user/auth",
+            payload=load_fixture("auth_error_response.json"),
+            headers=HEADERS,
+        )
+        credentials = [
+            TNSECredentials(EMAIL, PASSWORD, REGION),
+            TNSECredentials("other@example.com", "wrong", REGION),
+        ]
+        async with TNSEFleet(credentials, max_concurrency=1) as fleet:
+            results = [result async for result in fleet.async_iter_results()]
+            assert len(fleet._sessions) == 1
+
+        assert fleet._sessions == {}
+        by_email = {result.credentials.email: result for result in results}
+        ok = by_email[EMAIL]
+        assert ok.complete
+        assert [s.account for s in ok.snapshots] == [ACCOUNT, "610000000002"]
+        assert ok.snapshots[0].readings[COUNTER_ID]
+        failed = by_email["other@example.com"]
+        assert not failed.complete
+        assert "Неверный логин или пароль" in str(failed.error)
+
+    async def test_results_streamed_in_completion_order(self) -> None:
+        delays = {"slow@example.com": 0.1, "fast@example.com": 0}
+
+        class DelayedFleet(TNSEFleet):
+            async def _async_walk(self, credentials: TNSECredentials) -> FleetResult:
+                await asyncio.sleep(delays[credentials.email])
+                return FleetResult(credentials)
+
+        credentials = [TNSECredentials(email, PASSWORD, REGION) for email in delays]
+        async with DelayedFleet(credentials) as fleet:
+            emails = [r.credentials.email async for r in fleet.async_iter_results()]
+
+        assert emails == ["fast@example.com", "slow@example.com"]
+
+    async def test_concurrency_limits(self) -> None:
+        running: dict[str, int] = {"total": 0, "rostov": 0, "penza": 0}
+        peak = dict(running)
+
+        class CountingFleet(TNSEFleet):
+            async def _async_walk(self, credentials: TNSECredentials) -> FleetResult:
+                for key in ("total", credentials.region):
+                    running[key] += 1
+                    peak[key] = max(peak[key], running[key])
+                await asyncio.sleep(0.01)
+                for key in ("total", credentials.region):
+                    running[key] -= 1
+                return FleetResult(credentials)
+
+        credentials = [
+            TNSECredentials(f"user{i}@example.com", PASSWORD, region)
+            for i in range(6)
+            for region in ("rostov", "penza")
+        ]
+        async with CountingFleet(
+            credentials, max_concurrency=3, max_region_concurrency=2
+        ) as fleet:
+            results = [r async for r in fleet.async_iter_results()]
+
+        assert len(results) == 12
+        assert peak["total"] == 3
+        assert peak["rostov"] <= 2
+        assert peak["penza"] <= 2
+
+    async def test_unexpected_error_kept_in_result(self) -> None:
+        class BrokenFleet(TNSEFleet):
+            async def _async_walk(self, credentials: TNSECredentials) -> FleetResult:
+                if credentials.email == "broken@example.com":
+                    raise KeyError("number")
+                await asyncio.sleep(0.01)
+                return FleetResult(credentials)
+
+        credentials = [
+            TNSECredentials(email, PASSWORD, REGION)
+            for email in ("broken@example.com", "ok@example.com")
+        ]
+        async with BrokenFleet(credentials) as fleet:
+            results = [r async for r in fleet.async_iter_results()]
+
+        by_email = {result.credentials.email: result for result in results}
+        assert isinstance(by_email["broken@example.com"].error, KeyError)
+        assert by_email["ok@example.com"].complete
+
+    async def test_early_exit_cancels_pending(self) -> None:
+        cancelled: list[str] = []
+
+        class SlowFleet(TNSEFleet):
+            async def _async_walk(self, credentials: TNSECredentials) -> FleetResult:
+                if credentials.email != "fast@example.com":
+                    try:
+                        await asyncio.sleep(10)
+                    except asyncio.CancelledError:
+                        cancelled.append(credentials.email)
+                        raise
+                return FleetResult(credentials)
+
+        credentials = [
+            TNSECredentials(email, PASSWORD, REGION)
+            for email in ("fast@example.com", "slow@example.com")
+        ]
+        async with SlowFleet(credentials) as fleet:
+            iterator = fleet.async_iter_results()
+            async for result in iterator:
+                assert result.credentials.email == "fast@example.com"
+                break
+            await iterator.aclose()
+
+        assert cancelled == ["slow@example.com"]
+
+    def test_credentials_repr_hides_password(self) -> None:
+        assert PASSWORD not in repr(TNSECredentials(EMAIL, PASSWORD, REGION))
@@ -1,9 +1,17 @@
 """Tests for aiotnse helpers module."""
 from __future__ import annotations
 
+import json
 from base64 import b64encode
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import Any
 
+import aiohttp
+import pytest
+import pytest_asyncio
 from aiohttp import hdrs
+from aioresponses import aioresponses
 
 from aiotnse.const import (
     DEFAULT_API_HASH,
@@ -11,11 +19,23 @@ from aiotnse.const import (
     DEFAULT_USER_AGENT,
     DEVICE_ID_HEADER,
 )
+from aiotnse.exceptions import TNSEApiError
 from aiotnse.helpers import (
+    LogBody,
+    async_read_json,
     build_request_headers,
+    format_log_body,
     get_base_url,
+    get_request_headers,
     is_valid_account,
+    jwt_expiry,
+    parse_api_response,
+    parse_http_date,
 )
+from tests.common import API_URL
+from tests.conftest import FIXTURES_DIR, make_jwt
+
+URL = f"{API_URL}/test"
 
 
 class TestIsValidAccount:
@@ -52,8 +72,148 @@ class TestBuildRequestHeaders:
         assert headers[DEVICE_ID_HEADER] == "AP3A.240905.015"
 
 
+class TestGetRequestHeaders:
+    def test_matches_built_headers(self) -> None:
+        headers = get_request_headers("rostov", "AP3A.240905.015")
+        assert dict(headers) == build_request_headers("rostov", "AP3A.240905.015")
+
+    def test_cached_per_region(self) -> None:
+        rostov = get_request_headers("rostov", "AP3A.240905.015")
+        assert get_request_headers("rostov", "AP3A.240905.015") is rostov
+        assert get_request_headers("penza", "AP3A.240905.015") is not rostov
+
+    def test_read_only(self) -> None:
+        headers = get_request_headers("rostov", "AP3A.240905.015")
+        with pytest.raises(TypeError):
+            headers[DEVICE_ID_HEADER] = "other"  # type: ignore[index]
+
+
 class TestGetBaseUrl:
     def test_various_regions(self) -> None:
         assert get_base_url("rostov") == "https://mobile-api-rostov.tns-e.ru"
         assert get_base_url("penza") == "https://mobile-api-penza.tns-e.ru"
         assert get_base_url("nn") == "https://mobile-api-nn.tns-e.ru"
+
+
+@pytest_asyncio.fixture
+async def session() -> AsyncIterator[aiohttp.ClientSession]:
+    """Create a client session."""
+    async with aiohttp.ClientSession() as client_session:
+        yield client_session
+
+
+async def _read(
+    session: aiohttp.ClientSession, body: bytes, content_type: str, **kwargs: Any
+) -> Any:
+    """Mock a response and read its JSON."""
+    with aioresponses() as mock:
+        mock.get(URL, body=body, content_type=content_type)
+        async with session.get(URL) as resp:
+            return await async_read_json(resp, **kwargs)
+
+
+class TestAsyncReadJson:
+    @pytest.mark.parametrize(
+        "path", sorted(FIXTURES_DIR.glob("*.json")), ids=lambda path: path.name
+    )
+    async def test_matches_stdlib(
+        self, session: aiohttp.ClientSession, path: Path
+    ) -> None:
+        body = path.read_bytes()
+        data = await _read(session, body, "application/json")
+        assert data == json.loads(body)
+
+    async def test_empty_body(self, session: aiohttp.ClientSession) -> None:
+        assert await _read(session, b"  ", "application/json") is None
+
+    async def test_unexpected_content_type(
+        self, session: aiohttp.ClientSession
+    ) -> None:
+        with pytest.raises(aiohttp.ContentTypeError):
+            await _read(session, b"{}", "text/html")
+
+    async def test_vendor_content_type(self, session: aiohttp.ClientSession) -> None:
+        assert await _read(session, b"[1]", "application/problem+json") == [1]
+
+    @pytest.mark.parametrize(
+        ("charset", "encoding"), [("windows-1251", "cp1251"), ("x-unknown", "utf-8")]
+    )
+    async def test_charset(
+        self, session: aiohttp.ClientSession, charset: str, encoding: str
+    ) -> None:
+        body = '{"name": "Иванов"}'.encode(encoding)
+        content_type = f"application/json; charset={charset}"
+        assert await _read(session, body, content_type) == {"name": "Иванов"}
+
+    async def test_custom_loads(self, session: aiohttp.ClientSession) -> None:
+        calls: list[bytes] = []
+
+        def loads(data: bytes) -> Any:
+            calls.append(data)
+            return json.loads(data)
+
+        assert await _read(session, b'{"a": 1}', "application/json", loads=loads)
+        assert calls == [b'{"a": 1}']
+
+
+class TestParseApiResponse:
+    async def test_invalid_json(self, session: aiohttp.ClientSession) -> None:
+        with aioresponses() as mock:
+            mock.get(URL, body=b"{not json", content_type="application/json")
+            async with session.get(URL) as resp:
+                with pytest.raises(TNSEApiError) as exc_info:
+                    await parse_api_response(resp)
+        assert exc_info.value.status == 200
+        assert isinstance(exc_info.value.__cause__, ValueError)
+
+
+class TestFormatLogBody:
+    def test_redacts_secrets(self) -> None:
+        body = {
+            "result": True,
+            "data": {"accessToken": "secret", "items": [{"Password": "pw"}]},
+        }
+        assert format_log_body(body) == (
+            "{'result': True, 'data': {'accessToken': '***', "
+            "'items': [{'Password': '***'}]}}"
+        )
+
+    def test_truncates(self) -> None:
+        text = format_log_body({"file": "A" * 10_000}, limit=50)
+        assert text == "{'file': '" + "A" * 40 + "... (truncated)"
+
+    def test_stops_early(self) -> None:
+        def items() -> Any:
+            yield from range(10)
+            raise AssertionError("formatted past the limit")
+
+        class Lazy(list):  # type: ignore[type-arg]
+            def __iter__(self) -> Any:
+                return items()
+
+        assert format_log_body(Lazy(), limit=5).endswith("... (truncated)")
+
+    def test_lazy(self) -> None:
+        body = LogBody({"refreshToken": "secret"})
+        assert str(body) == repr(body) == "{'refreshToken': '***'}"
+
+
+class TestJwtExpiry:
+    def test_exp_claim(self) -> None:
+        assert jwt_expiry(make_jwt(1_800_000_000)) == 1_800_000_000.0
+
+    @pytest.mark.parametrize(
+        "token",
+        ["opaque-token", "a.!!!.c", "a.bnVsbA.c", make_jwt("soon"), make_jwt(True)],
+    )
+    def test_invalid(self, token: str) -> None:
+        assert jwt_expiry(token) is None
+
+
+class TestParseHttpDate:
+    def test_valid(self) -> None:
+        assert parse_http_date("Sun, 06 Nov 1994 08:49:37 GMT") == 784111777.0
+
+    @pytest.mark.parametrize("value", [None, "", "yesterday"])
+    def test_invalid(self, value: str | None) -> None:
+        assert parse_http_date(value) is None
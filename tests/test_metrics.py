@@ -0,0 +1,156 @@
+"""Tests for aiotnse metrics module."""
+from __future__ import annotations
+
+import math
+
+import pytest
+from aioresponses import aioresponses
+
+from aiotnse import RequestEvent, SimpleTNSEAuth, TNSEApiError, TNSEMetrics
+from tests.common import ACCOUNT, API_URL, COUNTER_ID, HEADERS, REGION
+from tests.conftest import load_fixture, token_payload
+
+
+def _event(duration: float, status: int | None = 200, **kwargs: object) -> RequestEvent:
+    """Create a request event."""
+    return RequestEvent(
+        kind="api",
+        method="GET",
+        endpoint=kwargs.pop("endpoint", "counters"),  # type: ignore[arg-type]
+        region=kwargs.pop("region", REGION),  # type: ignore[arg-type]
+        status=status,
+        duration=duration,
+        **kwargs,  # type: ignore[arg-type]
+    )
+
+
+class TestTNSEMetrics:
+    def test_histogram(self) -> None:
+        metrics = TNSEMetrics(buckets=(0.1, 1.0))
+        for duration in (0.05, 0.5, 0.5, 5.0):
+            metrics(_event(duration, response_size=100))
+        metrics(_event(0.2, status=503, error=TNSEApiError("down")))
+
+        histogram = metrics.get("counters")
+        assert histogram.buckets == [1, 3, 1]
+        assert histogram.count == 5
+        assert histogram.total == pytest.approx(6.25)
+        assert histogram.errors == 1
+        assert histogram.statuses == {"200": 4, "503": 1}
+        assert histogram.response_bytes == 400
+
+    def test_quantile(self) -> None:
+        metrics = TNSEMetrics(buckets=(1.0, 2.0))
+        for duration in (0.5, 1.5, 1.5, 1.5):
+            metrics(_event(duration))
+        histogram = metrics.get("counters")
+        assert histogram.quantile(0.25) == pytest.approx(1.0)
+        assert histogram.quantile(0.5) == pytest.approx(1 + 1 / 3)
+        assert math.isnan(metrics.get("unknown").quantile(0.5))
+
+    def test_get_filters(self) -> None:
+        metrics = TNSEMetrics()
+        metrics(_event(0.1))
+        metrics(_event(0.1, region="penza"))
+        metrics(_event(0.1, endpoint="history"))
+        assert metrics.get("counters").count == 2
+        assert metrics.get("counters", region="penza").count == 1
+        assert len(metrics.histograms()) == 3
+        metrics.reset()
+        assert metrics.histograms() == {}
+
+    def test_render_prometheus(self) -> None:
+        metrics = TNSEMetrics(buckets=(0.1, 1.0))
+        metrics(_event(0.05, response_size=10))
+        metrics(_event(0.5, status=None, error=TimeoutError()))
+        text = metrics.render_prometheus()
+
+        labels = f'method="GET",endpoint="counters",region="{REGION}"'
+        assert "# TYPE tnse_request_duration_seconds histogram" in text
+        assert f'tnse_request_duration_seconds_bucket{{{labels},le="0.1"}} 1' in text
+        assert f'tnse_request_duration_seconds_bucket{{{labels},le="1"}} 2' in text
+        assert f'tnse_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+        assert f"tnse_request_duration_seconds_count{{{labels}}} 2" in text
+        assert f'tnse_requests_total{{{labels},status="error"}} 1' in text
+        assert f"tnse_response_bytes_total{{{labels}}} 10" in text
+
+
+class TestRequestHooks:
+    async def test_api_and_auth_events(
+        self, auth: SimpleTNSEAuth, session_mock: aioresponses
+    ) -> None:
+        events: list[RequestEvent] = []
+        remove = auth.add_request_hook(events.append)
+        session_mock.post(
+            f"{API_URL}/user/refresh-token",
+            payload=token_payload("new_token"),
+            headers=HEADERS,
+        )
+        session_mock.get(
+            f"{API_URL}/counters/{COUNTER_ID}/readings?account={ACCOUNT}",
+            payload=load_fixture("counter_readings_response.json"),
+            headers=HEADERS,
+        )
+        await auth.async_refresh_token()
+        await auth.request(
+            "GET", f"counters/{COUNTER_ID}/readings", params={"account": ACCOUNT}
+        )
+
+        assert [(e.kind, e.endpoint, e.status) for e in events] == [
+            ("auth", "user/refresh-token", 200),
+            ("api", "counters/{id}/readings", 200),
+        ]
+        assert all(e.region == REGION and e.duration >= 0 for e in events)
+
+        remove()
+        session_mock.get(f"{API_URL}/user", payload={"result": True, "data": {}})
+        await auth.request("GET", "user")
+        assert len(events) == 2
+
+    async def test_stream_request_events(
+        self, auth: SimpleTNSEAuth, session_mock: aioresponses
+    ) -> None:
+        events: list[RequestEvent] = []
+        auth.add_request_hook(events.append)
+        url = f"{API_URL}/invoices/get-file?account={ACCOUNT}&date=01.01.2026"
+        session_mock.get(url, status=401)
+        session_mock.post(
+            f"{API_URL}/user/refresh-token",
+            payload=token_payload("new_token"),
+            headers=HEADERS,
+        )
+        session_mock.get(url, body=b"%PDF", headers=HEADERS)
+        params = {"account": ACCOUNT, "date": "01.01.2026"}
+        async with auth.stream_request(
+            "GET", "invoices/get-file", params=params
+        ) as resp:
+            await resp.read()
+
+        assert [(e.kind, e.endpoint, e.status, e.ok) for e in events] == [
+            ("api", "invoices/get-file", 401, False),
+            ("auth", "user/refresh-token", 200, True),
+            ("api", "invoices/get-file", 200, True),
+        ]
+
+    async def test_failed_request_event(
+        self, auth: SimpleTNSEAuth, session_mock: aioresponses
+    ) -> None:
+        metrics = TNSEMetrics()
+        auth.add_request_hook(metrics)
+        session_mock.get(f"{API_URL}/user", status=503)
+        with pytest.raises(TNSEApiError):
+            await auth.request("GET", "user")
+
+        histogram = metrics.get("user")
+        assert histogram.errors == 1
+        assert histogram.statuses == {"503": 1}
+
+    async def test_hook_error_does_not_fail_request(
+        self, auth: SimpleTNSEAuth, session_mock: aioresponses
+    ) -> None:
+        def broken(event: RequestEvent) -> None:
+            raise RuntimeError("broken hook")
+
+        auth.add_request_hook(broken)
+        session_mock.get(f"{API_URL}/user", payload={"result": True, "data": {}})
+        assert await auth.request("GET", "user") == {}
@@ -0,0 +1,103 @@
+"""Tests for aiotnse models module."""
+from __future__ import annotations
+
+import dataclasses
+from datetime import date
+
+import pytest
+
+from aiotnse import (
+    Account,
+    Balance,
+    Counter,
+    HistoryItem,
+    ReadingRecord,
+)
+from aiotnse.models import parse_date, parse_number
+from tests.common import ACCOUNT, ACCOUNT_ID, COUNTER_ID, ROW_ID
+from tests.conftest import load_fixture
+
+
+class TestParsers:
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        [
+            ("24.01.26", date(2026, 1, 24)),
+            ("01.01.2040", date(2040, 1, 1)),
+            ("", None),
+            (None, None),
+            ("31.02.26", None),
+        ],
+    )
+    def test_parse_date(self, value: str | None, expected: date | None) -> None:
+        assert parse_date(value) == expected
+
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        [
+            ("3500", 3500.0),
+            ("1 500,5", 1500.5),
+            (120, 120.0),
+            (1500.5, 1500.5),
+            ("", None),
+            (None, None),
+            (True, None),
+        ],
+    )
+    def test_parse_number(self, value: object, expected: float | None) -> None:
+        assert parse_number(value) == expected
+
+
+class TestModels:
+    def test_accounts(self) -> None:
+        accounts = Account.from_list(load_fixture("accounts_response.json")["data"])
+        assert accounts[0] == Account(
+            id=ACCOUNT_ID,
+            number=ACCOUNT,
+            address="г Ростов-на-Дону,ул Примерная,д.1",
+            initial_year=2020,
+        )
+
+    def test_balance(self) -> None:
+        balance = Balance.from_dict(load_fixture("balance_response.json")["data"])
+        assert balance.sum_to_pay == 1500.5
+        assert balance.closed_month == date(2026, 2, 1)
+
+    def test_counters(self) -> None:
+        (counter,) = Counter.from_list(load_fixture("counters_response.json")["data"])
+        assert counter.counter_id == COUNTER_ID
+        assert counter.row_id == ROW_ID
+        assert counter.checking_date == date(2040, 1, 1)
+        assert [(r.name, r.value) for r in counter.last_readings] == [
+            ("День", 3500.0),
+            ("Ночь", 1500.0),
+        ]
+        assert counter.last_readings[0].date == date(2026, 1, 24)
+
+    def test_readings(self) -> None:
+        records = ReadingRecord.from_list(
+            load_fixture("counter_readings_response.json")["data"]
+        )
+        assert records[0].date == date(2026, 1, 24)
+        assert records[0].readings[0].value == 5100.0
+        assert records[0].readings[0].consumption == 120.0
+
+    def test_history(self) -> None:
+        items = HistoryItem.from_list(
+            load_fixture("history_response.json")["data"]["items"]
+        )
+        assert items[0].indications[0].value == 5105.0
+        assert items[1].amount == 2000.0
+        assert items[1].date == date(2026, 2, 8)
+
+    def test_invoices(self) -> None:
+        (invoice,) = HistoryItem.from_list(
+            load_fixture("invoices_response.json")["data"]
+        )
+        assert invoice.date == date(2026, 1, 1)
+
+    def test_slotted_and_frozen(self) -> None:
+        account = Account(id=1, number=ACCOUNT)
+        assert not hasattr(account, "__dict__")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            account.number = "1"  # type: ignore[misc]
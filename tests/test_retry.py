@@ -0,0 +1,205 @@
+"""Tests for aiotnse retry module."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+
+import aiohttp
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from aiotnse import RetryBudget, RetryPolicy, SimpleTNSEAuth, TNSEApiError
+from tests.common import ACCESS_TOKEN, REGION
+
+OK = {"result": True, "statusCode": 200, "data": {"ok": True}}
+
+
+class FlakyServer:
+    """Local server failing the first ``failures`` requests of each path."""
+
+    def __init__(self) -> None:
+        self.failures = 0
+        self.failure_status = 503
+        self.delay = 0.0
+        self.calls = 0
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.calls += 1
+        if self.calls <= self.failures:
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            return web.Response(status=self.failure_status, text="unavailable")
+        return web.json_response(OK)
+
+
+@pytest_asyncio.fixture
+async def server() -> AsyncIterator[tuple[FlakyServer, str]]:
+    """Start a local flaky API server."""
+    flaky = FlakyServer()
+    app = web.Application()
+    app.router.add_route("*", "/api/v1/{path:.*}", flaky.handle)
+    async with TestServer(app) as test_server:
+        yield flaky, str(test_server.make_url("")).rstrip("/")
+
+
+def _policy(**kwargs: object) -> RetryPolicy:
+    """Create a retry policy without real backoff delays."""
+    return RetryPolicy(base_delay=0.001, max_delay=0.001, **kwargs)  # type: ignore[arg-type]
+
+
+class TestRetryPolicy:
+    def test_backoff_full_jitter_capped(self) -> None:
+        policy = RetryPolicy(base_delay=1, max_delay=4)
+        delays = [policy.backoff(attempt) for attempt in range(10) for _ in range(20)]
+        assert all(0 <= delay <= 4 for delay in delays)
+        assert max(policy.backoff(0) for _ in range(50)) <= 1
+
+    def test_only_idempotent_methods(self) -> None:
+        policy = RetryPolicy()
+        err = aiohttp.ClientConnectionError()
+        assert policy.is_retryable("GET", err)
+        assert not policy.is_retryable("POST", err)
+
+    def test_retryable_errors(self) -> None:
+        policy = RetryPolicy()
+        assert policy.is_retryable("GET", TimeoutError())
+        assert policy.is_retryable("GET", TNSEApiError("x", status=503))
+        assert not policy.is_retryable("GET", TNSEApiError("x", status=400))
+        assert not policy.is_retryable("GET", TNSEApiError("x"))
+
+    def test_budget(self) -> None:
+        budget = RetryBudget(ratio=0.5, max_tokens=1)
+        assert budget.try_withdraw()
+        assert not budget.try_withdraw()
+        budget.record_request()
+        assert not budget.try_withdraw()
+        budget.record_request()
+        assert budget.try_withdraw()
+
+
+class TestRequestRetry:
+    async def test_retries_transient_status(
+        self, server: tuple[FlakyServer, str]
+    ) -> None:
+        flaky, base_url = server
+        flaky.failures = 2
+        async with aiohttp.ClientSession() as session:
+            auth = SimpleTNSEAuth(
+                session,
+                region=REGION,
+                access_token=ACCESS_TOKEN,
+                base_url=base_url,
+                retry_policy=_policy(),
+            )
+            data = await auth.request("GET", "counters")
+
+        assert data == {"ok": True}
+        assert flaky.calls == 3
+
+    async def test_gives_up_after_max_attempts(
+        self, server: tuple[FlakyServer, str]
+    ) -> None:
+        flaky, base_url = server
+        flaky.failures = 5
+        async with aiohttp.ClientSession() as session:
+            auth = SimpleTNSEAuth(
+                session,
+                region=REGION,
+                access_token=ACCESS_TOKEN,
+                base_url=base_url,
+                retry_policy=_policy(max_attempts=2),
+            )
+            with pytest.raises(TNSEApiError, match="503") as exc_info:
+                await auth.request("GET", "counters")
+
+        assert exc_info.value.status == 503
+        assert flaky.calls == 2
+
+    async def test_post_not_retried(self, server: tuple[FlakyServer, str]) -> None:
+        flaky, base_url = server
+        flaky.failures = 1
+        async with aiohttp.ClientSession() as session:
+            auth = SimpleTNSEAuth(
+                session,
+                region=REGION,
+                access_token=ACCESS_TOKEN,
+                base_url=base_url,
+                retry_policy=_policy(),
+            )
+            with pytest.raises(TNSEApiError, match="503"):
+                await auth.request("POST", "counters/send-readings", json={})
+
+        assert flaky.calls == 1
+
+    async def test_client_errors_not_retried(
+        self, server: tuple[FlakyServer, str]
+    ) -> None:
+        flaky, base_url = server
+        flaky.failures = 1
+        flaky.failure_status = 400
+        async with aiohttp.ClientSession() as session:
+            auth = SimpleTNSEAuth(
+                session,
+                region=REGION,
+                access_token=ACCESS_TOKEN,
+                base_url=base_url,
+                retry_policy=_policy(),
+            )
+            with pytest.raises(TNSEApiError, match="400"):
+                await auth.request("GET", "counters")
+
+        assert flaky.calls == 1
+
+    async def test_retries_timeouts(self, server: tuple[FlakyServer, str]) -> None:
+        flaky, base_url = server
+        flaky.failures = 1
+        flaky.delay = 1
+        timeout = aiohttp.ClientTimeout(sock_read=0.05)
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            auth = SimpleTNSEAuth(
+                session,
+                region=REGION,
+                access_token=ACCESS_TOKEN,
+                base_url=base_url,
+                retry_policy=_policy(),
+            )
+            data = await auth.request("GET", "counters")
+
+        assert data == {"ok": True}
+        assert flaky.calls == 2
+
+    async def test_budget_limits_retries(
+        self, server: tuple[FlakyServer, str]
+    ) -> None:
+        flaky, base_url = server
+        flaky.failures = 100
+        policy = _policy(budget=RetryBudget(ratio=0.1, max_tokens=2))
+        async with aiohttp.ClientSession() as session:
+            auth = SimpleTNSEAuth(
+                session,
+                region=REGION,
+                access_token=ACCESS_TOKEN,
+                base_url=base_url,
+                retry_policy=policy,
+            )
+            for _ in range(10):
+                with pytest.raises(TNSEApiError):
+                    await auth.request("GET", "counters")
+
+        # 10 requests plus the 2 banked retries; the 0.1 deposited per
+        # following request never adds up to another full retry
+        assert flaky.calls == 10 + 2
+
+    async def test_no_policy_no_retry(self, server: tuple[FlakyServer, str]) -> None:
+        flaky, base_url = server
+        flaky.failures = 1
+        async with aiohttp.ClientSession() as session:
+            auth = SimpleTNSEAuth(
+                session, region=REGION, access_token=ACCESS_TOKEN, base_url=base_url
+            )
+            with pytest.raises(TNSEApiError, match="503"):
+                await auth.request("GET", "counters")
+
+        assert flaky.calls == 1
@@ -0,0 +1,65 @@
+"""Tests for aiotnse session module."""
+from __future__ import annotations
+
+import aiohttp
+from aioresponses import aioresponses
+
+from aiotnse import async_warm_up, create_session
+from aiotnse.const import DEFAULT_APP_VERSION
+from aiotnse.session import get_ssl_context
+from tests.conftest import load_fixture
+
+VERSION_URL = "https://mobile-api-{region}.tns-e.ru/api/v1/app/version?version={version}"
+
+
+def _version_url(region: str) -> str:
+    """Build app version URL of a region."""
+    return VERSION_URL.format(region=region, version=DEFAULT_APP_VERSION)
+
+
+class TestCreateSession:
+    async def test_connector_settings(self) -> None:
+        async with create_session(limit=50, limit_per_host=4) as session:
+            connector = session.connector
+            assert isinstance(connector, aiohttp.TCPConnector)
+            assert connector.limit == 50
+            assert connector.limit_per_host == 4
+            assert connector.use_dns_cache
+
+    def test_shared_ssl_context(self) -> None:
+        assert get_ssl_context() is get_ssl_context()
+
+    async def test_session_kwargs(self) -> None:
+        async with create_session(headers={"X-Test": "1"}) as session:
+            assert session.headers["X-Test"] == "1"
+
+
+class TestWarmUp:
+    async def test_warm_up_regions(self) -> None:
+        with aioresponses() as mock:
+            for region in ("rostov", "penza"):
+                mock.get(
+                    _version_url(region),
+                    payload=load_fixture("app_version_response.json"),
+                    repeat=True,
+                )
+            async with aiohttp.ClientSession() as session:
+                errors = await async_warm_up(
+                    session, ["rostov", "penza", "rostov"], connections=2
+                )
+
+        assert errors == {"rostov": None, "penza": None}
+        assert sum(len(calls) for calls in mock.requests.values()) == 4
+
+    async def test_warm_up_failure_reported(self) -> None:
+        with aioresponses() as mock:
+            mock.get(
+                _version_url("rostov"),
+                payload=load_fixture("app_version_response.json"),
+            )
+            mock.get(_version_url("penza"), status=503)
+            async with aiohttp.ClientSession() as session:
+                errors = await async_warm_up(session, ["rostov", "penza"])
+
+        assert errors["rostov"] is None
+        assert isinstance(errors["penza"], Exception)
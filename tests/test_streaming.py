@@ -0,0 +1,176 @@
+"""Tests for aiotnse streaming module."""
+from __future__ import annotations
+
+import io
+import json
+import os
+from base64 import b64encode
+from pathlib import Path
+
+import pytest
+from aioresponses import aioresponses
+
+from aiotnse import TNSEApi, TNSEApiError
+from aiotnse.streaming import Base64FieldDecoder
+from tests.common import ACCOUNT, API_URL, HEADERS
+from tests.conftest import load_fixture, token_payload
+
+PDF = b"%PDF-1.5\n" + os.urandom(100_000)
+URL = f"{API_URL}/invoices/get-file?account={ACCOUNT}&date=01.01.2026"
+
+
+def _document(content: bytes, *, escape_slashes: bool = False) -> bytes:
+    """Build an invoice file response."""
+    encoded = b64encode(content).decode()
+    body = json.dumps(
+        {"result": True, "statusCode": 200, "data": {"file": encoded}}
+    )
+    if escape_slashes:
+        body = body.replace("/", "\\/")
+    return body.encode()
+
+
+def _decode(document: bytes, chunk_size: int) -> bytes:
+    """Feed a document to the decoder in chunks."""
+    decoder = Base64FieldDecoder("file")
+    decoded = b"".join(
+        decoder.feed(document[i : i + chunk_size])
+        for i in range(0, len(document), chunk_size)
+    )
+    decoder.close()
+    assert decoder.found
+    assert json.loads(decoder.envelope)["data"] == {"file": ""}
+    return decoded
+
+
+class TestBase64FieldDecoder:
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 7, 64, 65536])
+    def test_chunked(self, chunk_size: int) -> None:
+        content = PDF[:3000]
+        assert _decode(_document(content), chunk_size) == content
+
+    @pytest.mark.parametrize("chunk_size", [1, 3, 1024])
+    def test_escaped_slashes(self, chunk_size: int) -> None:
+        content = bytes(range(256)) * 10
+        document = _document(content, escape_slashes=True)
+        assert b"\\/" in document
+        assert _decode(document, chunk_size) == content
+
+    def test_unterminated(self) -> None:
+        decoder = Base64FieldDecoder("file")
+        decoder.feed(b'{"data": {"file": "JVBE')
+        with pytest.raises(ValueError):
+            decoder.close()
+
+    def test_invalid_base64(self) -> None:
+        decoder = Base64FieldDecoder("file")
+        with pytest.raises(ValueError):
+            decoder.feed(b'{"data": {"file": "JV*E"}}')
+
+
+class TestDownloadInvoiceFile:
+    async def test_to_path(
+        self, api: TNSEApi, session_mock: aioresponses, tmp_path: Path
+    ) -> None:
+        session_mock.get(URL, body=_document(PDF), headers=HEADERS)
+        size = await api.async_download_invoice_file(
+            ACCOUNT, "01.01.2026", tmp_path / "invoice.pdf"
+        )
+        assert size == len(PDF)
+        assert (tmp_path / "invoice.pdf").read_bytes() == PDF
+
+    @pytest.mark.parametrize(
+        "response",
+        [
+            {"status": 500, "body": "Internal Server Error"},
+            # Fails halfway through the base64 value
+            {"body": _document(PDF)[:50_000] + b"!", "headers": HEADERS},
+        ],
+    )
+    async def test_failure_keeps_existing_file(
+        self,
+        api: TNSEApi,
+        session_mock: aioresponses,
+        tmp_path: Path,
+        response: dict[str, object],
+    ) -> None:
+        path = tmp_path / "invoice.pdf"
+        path.write_bytes(b"old invoice")
+        session_mock.get(URL, **response)  # type: ignore[arg-type]
+        with pytest.raises(TNSEApiError):
+            await api.async_download_invoice_file(ACCOUNT, "01.01.2026", path)
+        assert path.read_bytes() == b"old invoice"
+        assert os.listdir(tmp_path) == ["invoice.pdf"]
+
+    async def test_to_async_writer(
+        self, api: TNSEApi, session_mock: aioresponses
+    ) -> None:
+        class Writer:
+            def __init__(self) -> None:
+                self.chunks: list[bytes] = []
+
+            async def write(self, data: bytes) -> None:
+                self.chunks.append(data)
+
+        session_mock.get(URL, body=_document(PDF), headers=HEADERS)
+        writer = Writer()
+        await api.async_download_invoice_file(ACCOUNT, "01.01.2026", writer)
+        assert b"".join(writer.chunks) == PDF
+
+    async def test_fixture(self, api: TNSEApi, session_mock: aioresponses) -> None:
+        payload = load_fixture("invoice_file_response.json")
+        session_mock.get(URL, payload=payload, headers=HEADERS)
+        buffer = io.BytesIO()
+        await api.async_download_invoice_file(ACCOUNT, "01.01.2026", buffer)
+        assert buffer.getvalue().startswith(b"%PDF")
+
+    async def test_replays_after_refresh(
+        self, api: TNSEApi, session_mock: aioresponses
+    ) -> None:
+        session_mock.get(URL, status=401)
+        session_mock.post(
+            f"{API_URL}/user/refresh-token",
+            payload=token_payload("test_access_token_refreshed"),
+            headers=HEADERS,
+        )
+        session_mock.get(URL, body=_document(PDF), headers=HEADERS)
+        buffer = io.BytesIO()
+        await api.async_download_invoice_file(ACCOUNT, "01.01.2026", buffer)
+        assert buffer.getvalue() == PDF
+
+    async def test_api_error(self, api: TNSEApi, session_mock: aioresponses) -> None:
+        session_mock.get(
+            URL,
+            payload=load_fixture("auth_error_response.json"),
+            headers=HEADERS,
+            status=400,
+        )
+        with pytest.raises(TNSEApiError) as exc_info:
+            await api.async_download_invoice_file(
+                ACCOUNT, "01.01.2026", io.BytesIO()
+            )
+        assert exc_info.value.status == 400
+
+    async def test_result_false(
+        self, api: TNSEApi, session_mock: aioresponses
+    ) -> None:
+        session_mock.get(
+            URL,
+            payload={"result": False, "error": {"description": "Нет квитанции"}},
+            headers=HEADERS,
+        )
+        with pytest.raises(TNSEApiError, match="Нет квитанции"):
+            await api.async_download_invoice_file(
+                ACCOUNT, "01.01.2026", io.BytesIO()
+            )
+
+    async def test_missing_field(
+        self, api: TNSEApi, session_mock: aioresponses
+    ) -> None:
+        session_mock.get(
+            URL, payload={"result": True, "data": {}}, headers=HEADERS
+        )
+        with pytest.raises(TNSEApiError, match="not found"):
+            await api.async_download_invoice_file(
+                ACCOUNT, "01.01.2026", io.BytesIO()
+            )
@@ -0,0 +1,133 @@
+"""Tests for aiotnse throttle module."""
+from __future__ import annotations
+
+import asyncio
+import time
+
+import aiohttp
+import pytest
+from aioresponses import aioresponses
+
+from aiotnse import SimpleTNSEAuth, TNSEApiError, TNSERateLimiter, async_get_regions
+from aiotnse.throttle import AdaptiveConcurrencyLimit, RateLimitSlot, TokenBucket
+from tests.common import ACCESS_TOKEN, API_URL, HEADERS, REGION
+from tests.conftest import load_fixture
+
+
+class TestTokenBucket:
+    async def test_burst_then_rate(self) -> None:
+        bucket = TokenBucket(rate=50, burst=2)
+        start = time.monotonic()
+        for _ in range(2):
+            await bucket.async_acquire()
+        assert time.monotonic() - start < 0.02
+
+        for _ in range(3):
+            await bucket.async_acquire()
+        assert time.monotonic() - start >= 0.05
+
+
+class TestAdaptiveConcurrencyLimit:
+    async def test_additive_increase(self) -> None:
+        limit = AdaptiveConcurrencyLimit(8)
+        limit.limit = 2.0
+        for _ in range(2):
+            await limit.async_acquire()
+            await limit.async_release(RateLimitSlot(time.monotonic()))
+        assert limit.limit == pytest.approx(2.9, abs=0.1)
+
+    async def test_multiplicative_decrease_once_per_round(self) -> None:
+        limit = AdaptiveConcurrencyLimit(8)
+        slots = [RateLimitSlot(time.monotonic(), throttled=True) for _ in range(3)]
+        for slot in slots:
+            await limit.async_acquire()
+        for slot in slots:
+            await limit.async_release(slot)
+        assert limit.limit == 4
+        assert limit.in_flight == 0
+
+        await limit.async_acquire()
+        await limit.async_release(RateLimitSlot(time.monotonic(), throttled=True))
+        assert limit.limit == 2
+
+    async def test_slow_response_decreases(self) -> None:
+        limit = AdaptiveConcurrencyLimit(8, latency_threshold=1)
+        await limit.async_acquire()
+        await limit.async_release(RateLimitSlot(time.monotonic() - 2))
+        assert limit.limit == 4
+
+    async def test_min_limit(self) -> None:
+        limit = AdaptiveConcurrencyLimit(2, min_limit=1)
+        for _ in range(3):
+            await limit.async_acquire()
+            await limit.async_release(RateLimitSlot(time.monotonic(), throttled=True))
+        assert limit.limit == 1
+
+    async def test_caps_in_flight(self) -> None:
+        limit = AdaptiveConcurrencyLimit(2)
+        peak = 0
+
+        async def work() -> None:
+            nonlocal peak
+            await limit.async_acquire()
+            peak = max(peak, limit.in_flight)
+            await asyncio.sleep(0.01)
+            await limit.async_release(RateLimitSlot(time.monotonic()))
+
+        await asyncio.gather(*(work() for _ in range(6)))
+        assert peak == 2
+
+
+class TestTNSERateLimiter:
+    async def test_throttled_response_shrinks_region_limit(
+        self, session_mock: aioresponses
+    ) -> None:
+        limiter = TNSERateLimiter(max_concurrency=8)
+        session_mock.get(f"{API_URL}/some-endpoint", status=429)
+        async with aiohttp.ClientSession() as session:
+            auth = SimpleTNSEAuth(
+                session,
+                region=REGION,
+                access_token=ACCESS_TOKEN,
+                rate_limiter=limiter,
+            )
+            with pytest.raises(TNSEApiError, match="429"):
+                await auth.request("GET", "some-endpoint")
+
+        assert limiter.concurrency_limits() == {REGION: 4}
+
+    async def test_html_403_is_throttling(self, session_mock: aioresponses) -> None:
+        limiter = TNSERateLimiter(max_concurrency=8)
+        session_mock.get(
+            f"{API_URL}/contacts/regions",
+            status=403,
+            body="<html><body>403 Forbidden</body></html>",
+            content_type="text/html",
+        )
+        async with aiohttp.ClientSession() as session:
+            with pytest.raises(TNSEApiError, match="403"):
+                await async_get_regions(session, rate_limiter=limiter)
+
+        assert limiter.concurrency_limits() == {REGION: 4}
+
+    async def test_connection_error_shrinks_limit(
+        self, session_mock: aioresponses
+    ) -> None:
+        limiter = TNSERateLimiter(max_concurrency=8)
+        async with aiohttp.ClientSession() as session:
+            with pytest.raises(aiohttp.ClientConnectionError):
+                await async_get_regions(session, rate_limiter=limiter)
+
+        assert limiter.concurrency_limits() == {REGION: 4}
+
+    async def test_success_keeps_limit(self, session_mock: aioresponses) -> None:
+        limiter = TNSERateLimiter(max_concurrency=8)
+        session_mock.get(
+            f"{API_URL}/contacts/regions",
+            payload=load_fixture("regions_response.json"),
+            headers=HEADERS,
+        )
+        async with aiohttp.ClientSession() as session:
+            await async_get_regions(session, rate_limiter=limiter)
+
+        assert limiter.concurrency_limits() == {REGION: 8}
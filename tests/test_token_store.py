@@ -0,0 +1,213 @@
+"""Tests for aiotnse token_store module."""
+from __future__ import annotations
+
+import asyncio
+import os
+import stat
+import sys
+import time
+from collections.abc import AsyncIterator, Callable
+from pathlib import Path
+
+import aiohttp
+import pytest
+import pytest_asyncio
+
+from aiotnse import (
+    AbstractTokenStore,
+    JSONFileTokenStore,
+    SimpleTNSEAuth,
+    SQLiteTokenStore,
+    TNSEApi,
+)
+from tests.common import EMAIL, PASSWORD, REGION
+from tests.fake_server import FakeTNSEServer
+
+TOKENS = {
+    "access_token": "access",
+    "refresh_token": "refresh",
+    "access_token_expires": "2099-01-01T00:00:00",
+    "refresh_token_expires": None,
+}
+
+# Worker process logging in through a shared token store
+WORKER = """
+import asyncio, sys
+import aiohttp
+from aiotnse import JSONFileTokenStore, SimpleTNSEAuth, SQLiteTokenStore, TNSEApi
+
+async def main(kind, path, url, email, password):
+    store = (JSONFileTokenStore if kind == "json" else SQLiteTokenStore)(path)
+    async with aiohttp.ClientSession() as session:
+        auth = SimpleTNSEAuth(
+            session, region="rostov", email=email, password=password,
+            base_url=url, token_store=store,
+        )
+        await TNSEApi(auth).async_get_user_info()
+
+asyncio.run(main(*sys.argv[1:]))
+"""
+
+StoreFactory = Callable[..., AbstractTokenStore]
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def store_factory(request: pytest.FixtureRequest, tmp_path: Path) -> StoreFactory:
+    """Return a factory of stores of one backend sharing a path."""
+    if request.param == "json":
+        return lambda **kwargs: JSONFileTokenStore(tmp_path / "tokens.json", **kwargs)
+    return lambda **kwargs: SQLiteTokenStore(tmp_path / "tokens.db", **kwargs)
+
+
+@pytest_asyncio.fixture
+async def server() -> AsyncIterator[FakeTNSEServer]:
+    """Start a fake server."""
+    async with FakeTNSEServer(latency=0.01) as server:
+        yield server
+
+
+def _auth(
+    session: aiohttp.ClientSession,
+    server: FakeTNSEServer,
+    store: AbstractTokenStore,
+) -> SimpleTNSEAuth:
+    """Create auth sharing a token store."""
+    return SimpleTNSEAuth(
+        session,
+        region=REGION,
+        email=EMAIL,
+        password=PASSWORD,
+        base_url=server.url,
+        token_store=store,
+    )
+
+
+class TestTokenStores:
+    async def test_save_load_delete(self, store_factory: StoreFactory) -> None:
+        store = store_factory()
+        assert await store.async_load("rostov/user") is None
+        await store.async_save("rostov/user", TOKENS)
+        await store.async_save("penza/user", TOKENS | {"access_token": "other"})
+        assert await store_factory().async_load("rostov/user") == TOKENS
+
+        await store.async_delete("rostov/user")
+        assert await store.async_load("rostov/user") is None
+        assert (await store.async_load("penza/user"))["access_token"] == "other"
+
+    async def test_lock_is_exclusive(self, store_factory: StoreFactory) -> None:
+        first = store_factory()
+        second = store_factory(lock_timeout=0.2, poll_interval=0.01)
+        async with first.lock("rostov/user"):
+            with pytest.raises(TimeoutError):
+                async with second.lock("rostov/user"):
+                    pass
+            async with second.lock("penza/user"):
+                pass
+        async with second.lock("rostov/user"):
+            pass
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="POSIX permissions")
+    async def test_json_file_private(self, tmp_path: Path) -> None:
+        path = tmp_path / "tokens.json"
+        await JSONFileTokenStore(path).async_save("key", TOKENS)
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="POSIX permissions")
+    async def test_sqlite_private(self, tmp_path: Path) -> None:
+        path = tmp_path / "tokens.db"
+        store = SQLiteTokenStore(path)
+        await store.async_save("key", TOKENS)
+        store.close()
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+    async def test_json_corrupt_file(self, tmp_path: Path) -> None:
+        path = tmp_path / "tokens.json"
+        path.write_text("{not json", encoding="utf-8")
+        store = JSONFileTokenStore(path)
+        assert await store.async_load("key") is None
+        await store.async_save("key", TOKENS)
+        assert await store.async_load("key") == TOKENS
+
+    async def test_sqlite_stale_lease(self, tmp_path: Path) -> None:
+        store = SQLiteTokenStore(tmp_path / "tokens.db", lock_timeout=0.2)
+        store._execute(
+            "INSERT INTO token_locks (key, owner, expires) VALUES (?, ?, ?)",
+            ("key", "crashed", time.time() - 1),
+        )
+        async with store.lock("key"):
+            pass
+        store.close()
+
+
+class TestSharedLogin:
+    async def test_one_login_for_many_auths(
+        self, server: FakeTNSEServer, store_factory: StoreFactory
+    ) -> None:
+        async with aiohttp.ClientSession() as session:
+            auths = [_auth(session, server, store_factory()) for _ in range(5)]
+            await asyncio.gather(
+                *(TNSEApi(auth).async_get_user_info() for auth in auths)
+            )
+            assert server.requests["POST user/auth"] == 1
+            assert len({auth.access_token for auth in auths}) == 1
+
+            # A revoked token is renewed by one of them only
+            server.expire_access_tokens()
+            await asyncio.gather(
+                *(TNSEApi(auth).async_get_user_info() for auth in auths)
+            )
+            assert server.requests["POST user/refresh-token"] == 1
+            assert server.requests["POST user/auth"] == 1
+
+            await auths[0].async_logout()
+            assert await store_factory().async_load(f"{REGION}/{EMAIL}") is None
+
+    async def test_refresh_with_stored_refresh_token(
+        self, store_factory: StoreFactory
+    ) -> None:
+        """A new auth refreshes an expired stored access token, no login."""
+        async with (
+            FakeTNSEServer(access_token_ttl=1) as server,
+            aiohttp.ClientSession() as session,
+        ):
+            await TNSEApi(_auth(session, server, store_factory())).async_get_user_info()
+            # The stored access token expires within the expiry margin
+            auth = _auth(session, server, store_factory())
+            await TNSEApi(auth).async_get_user_info()
+
+        assert server.requests["POST user/auth"] == 1
+        assert server.requests["POST user/refresh-token"] == 1
+
+    async def test_one_login_for_many_processes(
+        self,
+        server: FakeTNSEServer,
+        store_factory: StoreFactory,
+        tmp_path: Path,
+    ) -> None:
+        kind = "json" if isinstance(store_factory(), JSONFileTokenStore) else "sqlite"
+        path = tmp_path / ("tokens.json" if kind == "json" else "tokens.db")
+        workers = [
+            await asyncio.create_subprocess_exec(
+                sys.executable,
+                "-c",
+                WORKER,
+                kind,
+                str(path),
+                server.url,
+                EMAIL,
+                PASSWORD,
+            )
+            for _ in range(3)
+        ]
+        assert [await worker.wait() for worker in workers] == [0, 0, 0]
+        assert server.requests["POST user/auth"] == 1
+        assert server.requests["GET user"] == 3
+
+    def test_key_required_without_email(self, tmp_path: Path) -> None:
+        with pytest.raises(ValueError, match="token_store_key"):
+            SimpleTNSEAuth(
+                None,  # type: ignore[arg-type]
+                region=REGION,
+                access_token="token",
+                token_store=JSONFileTokenStore(tmp_path / "tokens.json"),
+            )
@@ -0,0 +1,117 @@
+"""Tests for aiotnse tracing module."""
+from __future__ import annotations
+
+import pytest
+from aioresponses import aioresponses
+
+from aiotnse import SimpleTNSEAuth, TNSEApiError, tracing
+from tests.common import API_URL, COUNTER_ID, HEADERS, REGION
+from tests.conftest import load_fixture, token_payload
+
+try:
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+        InMemorySpanExporter,
+    )
+    from opentelemetry.trace import SpanKind, StatusCode
+except ImportError:
+    TracerProvider = None  # type: ignore[assignment,misc]
+
+requires_sdk = pytest.mark.skipif(
+    TracerProvider is None, reason="opentelemetry-sdk is not installed"
+)
+
+
+@pytest.fixture
+def exporter(monkeypatch: pytest.MonkeyPatch) -> InMemorySpanExporter:
+    """Record spans of aiotnse in memory."""
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    monkeypatch.setattr(tracing, "_tracer", provider.get_tracer(tracing.TRACER_NAME))
+    return exporter
+
+
+@requires_sdk
+class TestTracing:
+    async def test_request_spans(
+        self,
+        auth: SimpleTNSEAuth,
+        session_mock: aioresponses,
+        exporter: InMemorySpanExporter,
+    ) -> None:
+        session_mock.get(
+            f"{API_URL}/counters/{COUNTER_ID}/readings",
+            payload=load_fixture("counter_readings_response.json"),
+            headers=HEADERS,
+        )
+        await auth.request("GET", f"counters/{COUNTER_ID}/readings")
+
+        spans = {span.name: span for span in exporter.get_finished_spans()}
+        assert set(spans) == {"tnse.request", "tnse.http", "tnse.json_decode"}
+        request, http = spans["tnse.request"], spans["tnse.http"]
+        assert request.attributes["tnse.region"] == REGION
+        assert request.attributes["tnse.endpoint"] == "counters/{id}/readings"
+        assert request.attributes["tnse.method"] == "GET"
+        assert http.kind is SpanKind.CLIENT
+        assert http.attributes["http.response.status_code"] == 200
+        assert http.attributes["tnse.attempt"] == 0
+        assert http.parent.span_id == request.context.span_id
+        assert spans["tnse.json_decode"].parent.span_id == http.context.span_id
+
+    async def test_token_refresh_spans(
+        self,
+        auth: SimpleTNSEAuth,
+        session_mock: aioresponses,
+        exporter: InMemorySpanExporter,
+    ) -> None:
+        auth._access_token = None
+        session_mock.post(
+            f"{API_URL}/user/refresh-token",
+            payload=token_payload("new_token"),
+            headers=HEADERS,
+        )
+        session_mock.get(f"{API_URL}/user", payload={"result": True, "data": {}})
+        await auth.request("GET", "user")
+
+        spans = {span.name: span for span in exporter.get_finished_spans()}
+        assert {
+            "tnse.get_access_token",
+            "tnse.token_lock_wait",
+            "tnse.refresh_token",
+        } <= set(spans)
+        get_token = spans["tnse.get_access_token"]
+        assert get_token.parent.span_id == spans["tnse.request"].context.span_id
+        assert spans["tnse.token_lock_wait"].parent.span_id == (
+            get_token.context.span_id
+        )
+        assert spans["tnse.refresh_token"].parent.span_id == (
+            get_token.context.span_id
+        )
+
+    async def test_error_span(
+        self,
+        auth: SimpleTNSEAuth,
+        session_mock: aioresponses,
+        exporter: InMemorySpanExporter,
+    ) -> None:
+        session_mock.get(f"{API_URL}/user", status=503)
+        with pytest.raises(TNSEApiError):
+            await auth.request("GET", "user")
+
+        spans = {span.name: span for span in exporter.get_finished_spans()}
+        assert spans["tnse.http"].attributes["http.response.status_code"] == 503
+        assert spans["tnse.request"].status.status_code is StatusCode.ERROR
+
+
+class TestNoOpTracing:
+    async def test_without_opentelemetry(
+        self,
+        auth: SimpleTNSEAuth,
+        session_mock: aioresponses,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.setattr(tracing, "_tracer", None)
+        session_mock.get(f"{API_URL}/user", payload={"result": True, "data": {}})
+        assert await auth.request("GET", "user") == {}